@@ -0,0 +1,326 @@
+"""Micro-benchmarks for editorial hot paths.
+
+Usage::
+
+    python -m benchmarks.micro_bench                       # run and save under the current commit
+    python -m benchmarks.micro_bench --filter tone         # only matching cases
+    python -m benchmarks.micro_bench --against HEAD~1      # run both commits and compare
+    python -m benchmarks.micro_bench --compare OLD NEW     # compare two saved runs
+
+Each case is calibrated pytest-benchmark style: the loop count is grown until
+one round takes at least ``--min-round`` seconds, then ``--rounds`` rounds are
+timed and reported as ops/sec with min/median/stddev. Allocation peak and
+retained memory per call come from a separate tracemalloc pass so they do not
+skew the timings. Saved runs live in ``.benchmarks/micro/<name>.json``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.corpus import generate_corpus, make_html
+
+ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = ROOT / ".benchmarks" / "micro"
+
+Setup = Callable[[List[Dict[str, Any]]], Tuple[Callable[[], Any], int]]
+CASES: Dict[str, Setup] = {}
+
+
+def case(name: str) -> Callable[[Setup], Setup]:
+    """Register a setup function returning (callable, items processed per call)."""
+
+    def decorator(setup: Setup) -> Setup:
+        CASES[name] = setup
+        return setup
+
+    return decorator
+
+
+# Cases -----------------------------------------------------------------------
+
+
+@case("story_analyzer.analyze")
+def _analyze(corpus: List[Dict[str, Any]]) -> Tuple[Callable[[], Any], int]:
+    from src.editorial.story_analyzer import StoryAnalyzer
+
+    analyzer = StoryAnalyzer()
+    stories = corpus[:50]
+    return (lambda: analyzer.analyze(stories)), len(stories)
+
+
+@case("story_analyzer._summarize_for_wow")
+def _summarize(corpus: List[Dict[str, Any]]) -> Tuple[Callable[[], Any], int]:
+    from src.editorial.story_analyzer import StoryAnalyzer
+
+    analyzer = StoryAnalyzer()
+    inputs = []
+    for story in corpus[:50]:
+        text = f"{story['summary']} {story['full_text']}"
+        inputs.append((story["title"], text, analyzer._extract_keywords(text), analyzer._wow.compute(text)))
+
+    def run() -> None:
+        for title, text, keywords, wow in inputs:
+            analyzer._summarize_for_wow(title=title, text=text, keywords=keywords, wow_terms=wow)
+
+    return run, len(inputs)
+
+
+@case("script_generator._compose_package")
+def _compose(corpus: List[Dict[str, Any]]) -> Tuple[Callable[[], Any], int]:
+    from src.editorial.script_daily import ScriptGenerator
+
+    try:
+        generator = ScriptGenerator(seed=7)
+    except TypeError:  # commits before seeded generators
+        generator = ScriptGenerator()
+    analyzed = generator.analyzer.analyze(corpus[:8])
+    return (lambda: generator._compose_package(analyzed)), 1
+
+
+@case("tone_enhancer._apply_rules")
+def _tone(corpus: List[Dict[str, Any]]) -> Tuple[Callable[[], Any], int]:
+    from src.editorial.tone_enhancer import ToneEnhancer
+
+    enhancer = ToneEnhancer(enable_llm=False)
+    # A daily script is roughly 400-600 words of summaries stitched together
+    script = "\n\n".join(story["summary"] for story in corpus[:12])
+    return (lambda: enhancer._apply_rules(script)), 1
+
+
+@case("text_utils.clean_text")
+def _clean(corpus: List[Dict[str, Any]]) -> Tuple[Callable[[], Any], int]:
+    import random
+
+    from src.editorial.text_utils import clean_text
+
+    rng = random.Random(11)
+    documents = [make_html(rng, story["summary"]) for story in corpus[:100]]
+
+    def run() -> None:
+        for document in documents:
+            clean_text(document)
+
+    return run, len(documents)
+
+
+@case("content_normalizer.canonical_url")
+def _canonical(corpus: List[Dict[str, Any]]) -> Tuple[Callable[[], Any], int]:
+    from src.utils.content_normalizer import canonical_url
+
+    urls = [story["url"] for story in corpus]
+
+    def run() -> None:
+        for url in urls:
+            canonical_url(url)
+
+    return run, len(urls)
+
+
+# Measurement -------------------------------------------------------------------
+
+
+def measure(func: Callable[[], Any], *, rounds: int = 7, min_round: float = 0.05) -> Dict[str, Any]:
+    """Calibrate a loop count, then time ``rounds`` rounds; seconds are per call."""
+    func()  # warm caches and lazy imports
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_round or loops >= 1_000_000:
+            break
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(min_round / elapsed) + 1))
+
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        timings.append((time.perf_counter() - started) / loops)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        result = func()
+        current, peak = tracemalloc.get_traced_memory()
+        del result
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(timings)
+    return {
+        "loops": loops,
+        "rounds": rounds,
+        "min_s": min(timings),
+        "median_s": median,
+        "stddev_s": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "ops_per_s": 1.0 / median if median > 0 else float("inf"),
+        "peak_alloc_kib": round((peak - before) / 1024, 1),
+        "retained_kib": round((current - before) / 1024, 1),
+    }
+
+
+def run_cases(corpus_size: int = 500, name_filter: Optional[str] = None, **options: Any) -> Dict[str, Any]:
+    corpus = generate_corpus(corpus_size)
+    results: Dict[str, Any] = {}
+    for name, setup in CASES.items():
+        if name_filter and name_filter not in name:
+            continue
+        try:
+            func, items = setup(corpus)
+            stats = measure(func, **options)
+        except Exception as exc:
+            # Older commits may lack a function or take different arguments; skip the case, not the run
+            results[name] = {"skipped": f"{type(exc).__name__}: {exc}"}
+            continue
+        stats["items"] = items
+        stats["items_per_s"] = stats["ops_per_s"] * items
+        results[name] = stats
+    return {
+        "commit": _describe_commit(Path.cwd()),
+        "python": platform.python_version(),
+        "corpus": corpus_size,
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+def _describe_commit(root: Path) -> str:
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{sha}-dirty" if dirty else sha
+
+
+# Reporting -----------------------------------------------------------------------
+
+
+def format_results(report: Dict[str, Any]) -> str:
+    lines = [f"commit {report['commit']}  corpus {report['corpus']} stories  python {report['python']}",
+             f"{'case':<40}{'ops/s':>12}{'median':>12}{'stddev':>10}{'items/s':>12}{'peak KiB':>11}"]
+    for name, stats in report["results"].items():
+        if "skipped" in stats:
+            lines.append(f"{name:<40}  skipped: {stats['skipped']}")
+            continue
+        lines.append(
+            f"{name:<40}{stats['ops_per_s']:>12.1f}{_fmt_time(stats['median_s']):>12}"
+            f"{100 * stats['stddev_s'] / stats['median_s'] if stats['median_s'] else 0:>9.1f}%"
+            f"{stats['items_per_s']:>12.0f}{stats['peak_alloc_kib']:>11.1f}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(old: Dict[str, Any], new: Dict[str, Any], threshold: float = 0.05) -> str:
+    """Per-case ops/sec and allocation change from old to new."""
+    lines = [f"{old['commit']} -> {new['commit']}",
+             f"{'case':<40}{'old ops/s':>12}{'new ops/s':>12}{'change':>10}{'peak KiB':>18}"]
+    for name in sorted(set(old["results"]) | set(new["results"])):
+        before, after = old["results"].get(name, {}), new["results"].get(name, {})
+        if "ops_per_s" not in before or "ops_per_s" not in after:
+            lines.append(f"{name:<40}  only in {'new' if 'ops_per_s' in after else 'old'}")
+            continue
+        change = after["ops_per_s"] / before["ops_per_s"] - 1
+        marker = "faster" if change > threshold else "SLOWER" if change < -threshold else ""
+        memory = f"{before['peak_alloc_kib']:.0f} -> {after['peak_alloc_kib']:.0f}"
+        lines.append(
+            f"{name:<40}{before['ops_per_s']:>12.1f}{after['ops_per_s']:>12.1f}{100 * change:>+9.1f}%{memory:>18}  {marker}"
+        )
+    return "\n".join(lines)
+
+
+def _fmt_time(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.1f}us"
+
+
+def _load(name_or_path: str) -> Dict[str, Any]:
+    path = Path(name_or_path)
+    if not path.exists():
+        path = RESULTS_DIR / f"{name_or_path}.json"
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _save(report: Dict[str, Any], name: Optional[str] = None) -> Path:
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RESULTS_DIR / f"{name or report['commit']}.json"
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return path
+
+
+def _run_against(rev: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run this harness against another commit checked out in a temporary worktree."""
+    with tempfile.TemporaryDirectory(prefix="micro-bench-") as tmp:
+        worktree = Path(tmp) / "tree"
+        subprocess.run(["git", "worktree", "add", "--detach", str(worktree), rev], cwd=ROOT, check=True, capture_output=True)
+        try:
+            output = Path(tmp) / "report.json"
+            command = [sys.executable, "-m", "benchmarks.micro_bench", "--src-root", str(worktree),
+                       "--corpus", str(args.corpus), "--rounds", str(args.rounds), "--min-round", str(args.min_round),
+                       "--output", str(output), "--no-save"]
+            if args.filter:
+                command += ["--filter", args.filter]
+            subprocess.run(command, cwd=ROOT, check=True)
+            return json.loads(output.read_text(encoding="utf-8"))
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", str(worktree)], cwd=ROOT, capture_output=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Editorial micro-benchmarks")
+    parser.add_argument("--filter", help="Only run cases whose name contains this")
+    parser.add_argument("--corpus", type=int, default=500, help="Synthetic stories to generate")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--min-round", type=float, default=0.05, help="Minimum seconds per timed round")
+    parser.add_argument("--save", metavar="NAME", help="Save under this name (default: current commit)")
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--output", help="Also write the JSON report here")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two saved runs and exit")
+    parser.add_argument("--against", metavar="REV", help="Benchmark REV in a git worktree and compare with this tree")
+    parser.add_argument("--src-root", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        print(format_comparison(_load(args.compare[0]), _load(args.compare[1])))
+        return 0
+
+    if args.src_root:
+        sys.path.insert(0, args.src_root)
+        os.chdir(args.src_root)
+    # Benchmarks never call out to an LLM
+    from src.config import settings
+
+    settings.OPENAI_API_KEY = None
+
+    report = run_cases(args.corpus, args.filter, rounds=args.rounds, min_round=args.min_round)
+    print(format_results(report))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if not args.no_save:
+        print(f"\nSaved {_save(report, args.save)}")
+    if args.against:
+        print()
+        print(format_comparison(_run_against(args.against, args), report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
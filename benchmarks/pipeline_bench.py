@@ -0,0 +1,246 @@
+"""End-to-end research and script graph benchmark against recorded fixtures.
+
+Usage::
+
+    python -m benchmarks.pipeline_bench --scales 10,100,1000,5000 --repeat 3
+    python -m benchmarks.pipeline_bench --check            # fail on regressions
+    python -m benchmarks.pipeline_bench --update-baseline  # accept current numbers
+
+Every external call (RSS, article pages, Google Sheets, YouTube Data API and
+OpenAI) goes over HTTP to a local ReplayServer, so runs are offline and
+repeatable. Per-node numbers come from the PipelineDiagnostics spans.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from benchmarks.replay_server import ReplayServer
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_SCALES = [10, 100, 1000]
+
+# The Sources range read by SimpleSheetsManager is Sources!A2:H200.
+MAX_SHEET_SOURCES = 199
+ITEMS_PER_SOURCE = 10
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def corpus_shape(stories: int) -> Dict[str, int]:
+    sources = min(MAX_SHEET_SOURCES, max(1, math.ceil(stories / ITEMS_PER_SOURCE)))
+    return {"sources": sources, "items_per_source": math.ceil(stories / sources)}
+
+
+def _configure_environment(server: ReplayServer, workdir: Path) -> None:
+    """Point every external client at the replay server (before importing src)."""
+    os.environ["OPENAI_API_KEY"] = "replay"
+    os.environ["OPENAI_BASE_URL"] = f"{server.url}/v1"
+    os.environ["YOUTUBE_API_KEY"] = "replay"
+    os.environ["LANGGRAPH_CHECKPOINT_DIR"] = str(workdir / "checkpoints")
+    os.environ.setdefault("ANALOGY_MODEL", "replay")
+
+    from googleapiclient import discovery
+
+    from src.ingest import simple_sheets_manager
+
+    replay_build = functools.partial(
+        discovery.build, client_options={"api_endpoint": f"{server.url}/"}, cache_discovery=False
+    )
+    # youtube_trending resolves discovery.build lazily, so patch the module itself
+    discovery.build = replay_build
+
+    def _connect(self: Any) -> None:
+        self.service = replay_build("sheets", "v4", developerKey="replay")
+        self.status = simple_sheets_manager.SheetFetchResult(simple_sheets_manager.ManagerStatus.CONNECTED, "replay")
+
+    simple_sheets_manager.SimpleSheetsManager._connect = _connect
+
+
+async def _run_graphs(scale: int, run_id: str, script_stories: int) -> Dict[str, Any]:
+    from src.graphs.research_graph import build_research_graph
+    from src.graphs.script_graph import build_script_graph
+    from src.graphs.state import ResearchState, ScriptState
+
+    shape = corpus_shape(scale)
+    research_state = ResearchState(
+        metadata={"max_items_per_source": shape["items_per_source"], "selection_limit": script_stories}
+    )
+    started = time.perf_counter()
+    research = await build_research_graph().ainvoke(
+        research_state, config={"configurable": {"thread_id": f"research-{run_id}"}}
+    )
+    research_ms = (time.perf_counter() - started) * 1000
+
+    script_state = ScriptState(selected_stories=research["selected_stories"])
+    started = time.perf_counter()
+    script = await build_script_graph().ainvoke(script_state, config={"configurable": {"thread_id": f"script-{run_id}"}})
+    script_ms = (time.perf_counter() - started) * 1000
+
+    return {
+        "stories": len(research["raw_stories"]),
+        "research": {"total_ms": research_ms, "spans": research["diagnostics"].spans},
+        "script": {"total_ms": script_ms, "spans": script["diagnostics"].spans},
+    }
+
+
+def _summarize(runs: List[Dict[str, Any]], memory_run: Optional[Dict[str, Any]], graph: str) -> Dict[str, Any]:
+    nodes: Dict[str, Dict[str, List[float]]] = {}
+    for run in runs:
+        for item in run[graph]["spans"]:
+            bucket = nodes.setdefault(item["name"], {"wall": [], "cpu": [], "items": []})
+            bucket["wall"].append(item["wall_ms"])
+            bucket["cpu"].append(item["cpu_ms"])
+            if item.get("items") is not None:
+                bucket["items"].append(item["items"])
+    peaks: Dict[str, float] = {}
+    if memory_run is not None:
+        for item in memory_run[graph]["spans"]:
+            peaks[item["name"]] = max(peaks.get(item["name"], 0.0), item.get("peak_alloc_kb", 0.0))
+
+    summary: Dict[str, Any] = {}
+    for name, bucket in nodes.items():
+        p50 = percentile(bucket["wall"], 50)
+        items = max(bucket["items"]) if bucket["items"] else None
+        summary[name] = {
+            "calls": len(bucket["wall"]) // max(1, len(runs)),
+            "wall_ms_p50": round(p50, 3),
+            "wall_ms_p95": round(percentile(bucket["wall"], 95), 3),
+            "wall_ms_max": round(max(bucket["wall"]), 3),
+            "cpu_ms_p50": round(percentile(bucket["cpu"], 50), 3),
+            "items": items,
+            "items_per_s": round(items / (p50 / 1000), 1) if items and p50 > 0 else None,
+            "peak_alloc_kb": peaks.get(name),
+        }
+    totals = [run[graph]["total_ms"] for run in runs]
+    summary["_total"] = {
+        "wall_ms_p50": round(percentile(totals, 50), 3),
+        "wall_ms_p95": round(percentile(totals, 95), 3),
+        "wall_ms_max": round(max(totals), 3),
+    }
+    return summary
+
+
+def run_benchmark(scales: Iterable[int], repeat: int = 3, script_stories: int = 6, memory: bool = True) -> Dict[str, Any]:
+    """Run both graphs at each scale and return the report dict."""
+    report: Dict[str, Any] = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "scales": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="pipeline-bench-") as workdir, ReplayServer(sources=1, items_per_source=1) as server:
+        _configure_environment(server, Path(workdir))
+        for scale in scales:
+            server.rescale(**corpus_shape(scale))
+            server.requests.clear()
+            # Warm-up run: imports, template loading and feed rendering stay out of the numbers
+            asyncio.run(_run_graphs(scale, f"{scale}-warmup", script_stories))
+            runs = [asyncio.run(_run_graphs(scale, f"{scale}-{idx}", script_stories)) for idx in range(repeat)]
+            memory_run = None
+            if memory:
+                tracemalloc.start()
+                try:
+                    memory_run = asyncio.run(_run_graphs(scale, f"{scale}-memory", script_stories))
+                finally:
+                    tracemalloc.stop()
+            report["scales"][str(scale)] = {
+                "stories": runs[0]["stories"],
+                "requests": dict(server.requests),
+                "research": _summarize(runs, memory_run, "research"),
+                "script": _summarize(runs, memory_run, "script"),
+            }
+    return report
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.5, min_ms: float = 5.0) -> List[str]:
+    """Regressions of p50 wall time or peak memory against the baseline."""
+    regressions = []
+    for scale, graphs in report["scales"].items():
+        for graph in ("research", "script"):
+            for node, stats in graphs[graph].items():
+                base = baseline.get("scales", {}).get(scale, {}).get(graph, {}).get(node)
+                if not base:
+                    continue
+                now, then = stats["wall_ms_p50"], base.get("wall_ms_p50")
+                if then is not None and now > then * (1 + tolerance) and now - then > min_ms:
+                    regressions.append(f"{scale} {graph}.{node}: p50 {then:.1f} -> {now:.1f} ms")
+                now_kb, then_kb = stats.get("peak_alloc_kb"), base.get("peak_alloc_kb")
+                if now_kb and then_kb and now_kb > then_kb * (1 + tolerance) and now_kb - then_kb > 256:
+                    regressions.append(f"{scale} {graph}.{node}: peak {then_kb:.0f} -> {now_kb:.0f} KiB")
+    return regressions
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = []
+    header = f"{'node':<28}{'items':>8}{'p50 ms':>11}{'p95 ms':>11}{'cpu ms':>10}{'items/s':>11}{'peak KiB':>11}"
+    for scale, graphs in report["scales"].items():
+        lines.append(f"\n== {scale} stories requested, {graphs['stories']} fetched; requests {graphs['requests']}")
+        for graph in ("research", "script"):
+            lines.append(f"-- {graph}\n{header}")
+            for node, stats in graphs[graph].items():
+                cpu = f"{stats['cpu_ms_p50']:.1f}" if "cpu_ms_p50" in stats else ""
+                lines.append(
+                    f"{node:<28}{stats.get('items') or '':>8}{stats['wall_ms_p50']:>11.1f}{stats['wall_ms_p95']:>11.1f}"
+                    f"{cpu:>10}{stats.get('items_per_s') or '':>11}{stats.get('peak_alloc_kb') or '':>11}"
+                )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline research/script graph benchmark")
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES), help="Comma-separated story counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--script-stories", type=int, default=6, help="Stories passed on to the script graph")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--check", action="store_true", help="Exit 1 when a node regresses against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown ratio (0.5 = +50%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    scales = [int(value) for value in args.scales.split(",") if value.strip()]
+    report = run_benchmark(scales, repeat=args.repeat, script_stories=args.script_stories, memory=not args.no_memory)
+    print(format_report(report))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"\nBaseline updated: {baseline_path}")
+        return 0
+    if baseline_path.exists():
+        regressions = compare(report, json.loads(baseline_path.read_text(encoding="utf-8")), args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:\n  " + "\n  ".join(regressions))
+            return 1 if args.check else 0
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
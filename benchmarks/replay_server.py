@@ -0,0 +1,231 @@
+"""Local HTTP stand-in that replays recorded feeds, pages, Sheets, YouTube and LLM responses."""
+
+from __future__ import annotations
+
+import copy
+import email.utils
+import json
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+class ReplayServer:
+    """Serve a scaled copy of the recorded fixtures on 127.0.0.1.
+
+    The Sources sheet is expanded to ``sources`` rows, each pointing at a
+    local feed built from the recorded feeds with ``items_per_source`` unique
+    items, so the research graph sees ``sources * items_per_source`` stories.
+    """
+
+    def __init__(
+        self,
+        *,
+        sources: int,
+        items_per_source: int,
+        fixtures_dir: Path = FIXTURES_DIR,
+        latency: float = 0.0,
+    ) -> None:
+        self.sources = sources
+        self.items_per_source = items_per_source
+        self.latency = latency
+        self.requests: Counter = Counter()
+        self._feeds = [ET.parse(path) for path in sorted((fixtures_dir / "feeds").glob("*.xml"))]
+        self._article = (fixtures_dir / "articles" / "article.html").read_bytes()
+        self._sheets = json.loads((fixtures_dir / "sheets.json").read_text(encoding="utf-8"))
+        self._youtube = json.loads((fixtures_dir / "youtube.json").read_text(encoding="utf-8"))
+        self._llm = json.loads((fixtures_dir / "llm.json").read_text(encoding="utf-8"))
+        self._feed_cache: Dict[int, bytes] = {}
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._time_shift = self._compute_time_shift()
+
+    def rescale(self, *, sources: int, items_per_source: int) -> None:
+        """Change the replayed corpus size without restarting the server."""
+        with self._lock:
+            self.sources = sources
+            self.items_per_source = items_per_source
+            self._feed_cache.clear()
+
+    # Lifecycle ---------------------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        assert self._httpd is not None, "server not started"
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ReplayServer":
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802 - stdlib hook
+                server._dispatch(self, "GET")
+
+            def do_POST(self) -> None:  # noqa: N802 - stdlib hook
+                server._dispatch(self, "POST")
+
+            def log_message(self, *args: Any) -> None:
+                return
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="replay-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    # Routing -----------------------------------------------------------------
+
+    def _dispatch(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        parsed = urlparse(handler.path)
+        path = parsed.path
+        body = b""
+        if method == "POST":
+            body = handler.rfile.read(int(handler.headers.get("Content-Length") or 0))
+        if self.latency:
+            time.sleep(self.latency)
+
+        routes = [
+            (r"^/feeds/(\d+)\.xml$", self._feed),
+            (r"^/articles/", self._article_page),
+            (r"^/v4/spreadsheets/[^/]+/values/(.+)$", self._sheet_values),
+            (r"^/youtube/v3/search$", self._youtube_search),
+            (r"^/youtube/v3/videos$", self._youtube_videos),
+            (r"^/v1/chat/completions$", self._chat_completion),
+        ]
+        for pattern, route in routes:
+            match = re.match(pattern, path)
+            if match:
+                self.requests[route.__name__.lstrip("_")] += 1
+                status, content_type, payload = route(match, parse_qs(parsed.query), body)
+                break
+        else:
+            status, content_type, payload = 404, "text/plain", b"not recorded"
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    # Feeds and pages -----------------------------------------------------------
+
+    def _compute_time_shift(self) -> float:
+        """Seconds to add to recorded dates so the newest item is an hour old."""
+        stamps = [
+            email.utils.parsedate_to_datetime(node.text).timestamp()
+            for tree in self._feeds
+            for node in tree.iter("pubDate")
+            if node.text
+        ]
+        return (time.time() - 3600 - max(stamps)) if stamps else 0.0
+
+    def _recorded_items(self, template: ET.ElementTree) -> List[ET.Element]:
+        return list(template.getroot().find("channel").iter("item"))
+
+    def _feed(self, match: re.Match, query: Dict[str, List[str]], body: bytes) -> Tuple[int, str, bytes]:
+        index = int(match.group(1))
+        with self._lock:
+            cached = self._feed_cache.get(index)
+        if cached is None:
+            cached = self._build_feed(index)
+            with self._lock:
+                self._feed_cache[index] = cached
+        return 200, "application/rss+xml", cached
+
+    def _build_feed(self, index: int) -> bytes:
+        template = self._feeds[index % len(self._feeds)]
+        root = copy.deepcopy(template.getroot())
+        channel = root.find("channel")
+        recorded = self._recorded_items(template)
+        for item in list(channel.iter("item")):
+            channel.remove(item)
+        for position in range(self.items_per_source):
+            item = copy.deepcopy(recorded[position % len(recorded)])
+            suffix = f"{index}-{position}"
+            title = item.find("title")
+            # Round-robin copies get distinct titles and links so dedupe keeps them
+            if position >= len(recorded) or index >= len(self._feeds):
+                title.text = f"{title.text} (report {suffix})"
+            for tag in ("link", "guid"):
+                node = item.find(tag)
+                if node is not None:
+                    node.text = f"{self.url}/articles/{suffix}?src={unquote(node.text or '')}"
+            date = item.find("pubDate")
+            if date is not None and date.text:
+                shifted = email.utils.parsedate_to_datetime(date.text).timestamp() + self._time_shift - position * 600
+                date.text = email.utils.formatdate(shifted, usegmt=True)
+            channel.append(item)
+        return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+    def _article_page(self, match: re.Match, query: Dict[str, List[str]], body: bytes) -> Tuple[int, str, bytes]:
+        return 200, "text/html; charset=utf-8", self._article
+
+    # Google APIs ---------------------------------------------------------------
+
+    def _sheet_values(self, match: re.Match, query: Dict[str, List[str]], body: bytes) -> Tuple[int, str, bytes]:
+        range_name = unquote(match.group(1))
+        tab = range_name.split("!", 1)[0]
+        rows = self._sheets.get(tab, [])
+        if tab == "Sources":
+            rows = [
+                [f"{row[0]} #{idx}", f"{self.url}/feeds/{idx}.xml", *row[2:]]
+                for idx, row in ((idx, rows[idx % len(rows)]) for idx in range(self.sources))
+            ]
+        payload = {"range": range_name, "majorDimension": "ROWS", "values": rows}
+        return 200, "application/json", json.dumps(payload).encode()
+
+    def _youtube_search(self, match: re.Match, query: Dict[str, List[str]], body: bytes) -> Tuple[int, str, bytes]:
+        return 200, "application/json", json.dumps(self._youtube["search"]).encode()
+
+    def _youtube_videos(self, match: re.Match, query: Dict[str, List[str]], body: bytes) -> Tuple[int, str, bytes]:
+        return 200, "application/json", json.dumps(self._youtube["videos"]).encode()
+
+    # OpenAI ----------------------------------------------------------------------
+
+    def _chat_completion(self, match: re.Match, query: Dict[str, List[str]], body: bytes) -> Tuple[int, str, bytes]:
+        request = json.loads(body or b"{}")
+        prompt = " ".join(str(message.get("content", "")) for message in request.get("messages", []))
+        if '"boosts"' in prompt:
+            content = self._llm["trending"]
+        elif "analog" in prompt.lower():
+            content = self._llm["analogy"]
+        else:
+            content = self._llm["default"]
+        payload = {
+            "id": "chatcmpl-replay",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "replay"),
+            "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+            ],
+            "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": len(content.split()), "total_tokens": 0},
+        }
+        return 200, "application/json", json.dumps(payload).encode()
+
+
+__all__ = ["FIXTURES_DIR", "ReplayServer"]
@@ -1,6 +1,15 @@
 """Langflow integration support utilities."""
 
-from .builder import build_graph_from_file, build_graph_from_config
+from .builder import build_graph_from_file, build_graph_from_config, build_graph_from_json, clear_graph_cache
 from .schema import PipelineConfig
+from .watcher import GraphRevision, PipelineConfigWatcher
 
-__all__ = ["build_graph_from_file", "build_graph_from_config", "PipelineConfig"]
+__all__ = [
+    "build_graph_from_file",
+    "build_graph_from_config",
+    "build_graph_from_json",
+    "clear_graph_cache",
+    "GraphRevision",
+    "PipelineConfig",
+    "PipelineConfigWatcher",
+]
@@ -2,16 +2,21 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Dict, Callable, Any
-from functools import partial
+import asyncio
+import hashlib
 import inspect
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Callable, Any, Optional, Tuple
 
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 
+from src.config import settings
 from src.graphs.checkpoints import get_default_checkpointer
 
-from .component_registry import resolve_component, resolve_state
+from .component_registry import PipelineComponent, resolve_component, resolve_state
 from .schema import PipelineConfig, NodeConfig
 
 
@@ -34,23 +39,77 @@ def _wrap_callable(func: Callable, params: Dict[str, Any]) -> Callable:
     return _sync_wrapper
 
 
-def build_graph_from_config(config: PipelineConfig) -> StateGraph:
-    """Build and compile a StateGraph from a PipelineConfig."""
+class LazyCallable:
+    """Graph node or router that imports its component on first execution."""
+
+    def __init__(self, component: PipelineComponent, params: Optional[Dict[str, Any]] = None) -> None:
+        self.component = component
+        self.params = dict(params or {})
+        self._target: Optional[Callable] = None
+        self._accepts_config = False
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._target is not None
+
+    def resolve(self) -> Callable:
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    func = self.component.load()
+                    self._accepts_config = not self.params and "config" in inspect.signature(func).parameters
+                    self._target = _wrap_callable(func, self.params)
+        return self._target
+
+    def _call(self, state: Any, config: Any) -> Any:
+        target = self.resolve()
+        return target(state, config=config) if self._accepts_config else target(state)
+
+    def invoke(self, state: Any, config: Any = None) -> Any:
+        result = self._call(state, config)
+        if inspect.iscoroutine(result):
+            result.close()
+            raise RuntimeError(f"Component '{self.component.dotted_path}' is async; run the graph with ainvoke")
+        return result
+
+    async def ainvoke(self, state: Any, config: Any = None) -> Any:
+        target = self.resolve()
+        if inspect.iscoroutinefunction(target):
+            return await self._call(state, config)
+        # Sync components run off the event loop, as LangGraph does for plain functions
+        return await asyncio.to_thread(self._call, state, config)
+
+    def as_runnable(self, name: str) -> RunnableLambda:
+        return RunnableLambda(self.invoke, afunc=self.ainvoke, name=name)
+
+
+def build_graph_from_config(config: PipelineConfig, *, lazy: bool = True) -> StateGraph:
+    """Build and compile a StateGraph from a PipelineConfig.
+
+    With ``lazy`` (the default) component modules are imported the first time
+    their node or router runs instead of while the graph is built.
+    """
 
     state_cls = resolve_state(config.pipeline.state)
     graph = StateGraph(state_cls)
 
     for node in config.nodes:
         component = resolve_component(node.component)
-        callable_obj = component.load()
-        graph.add_node(node.id, _wrap_callable(callable_obj, node.params))
+        if lazy:
+            graph.add_node(node.id, LazyCallable(component, node.params).as_runnable(node.id))
+        else:
+            graph.add_node(node.id, _wrap_callable(component.load(), node.params))
 
     for edge in config.edges:
         graph.add_edge(edge.source, edge.target)
 
     for conditional in config.conditional_edges:
         router_component = resolve_component(conditional.router)
-        router_callable = router_component.load()
+        if lazy:
+            router_callable = LazyCallable(router_component).as_runnable(conditional.router)
+        else:
+            router_callable = router_component.load()
         graph.add_conditional_edges(
             conditional.source,
             router_callable,
@@ -66,11 +125,97 @@ def build_graph_from_config(config: PipelineConfig) -> StateGraph:
     return compiled
 
 
-def build_graph_from_file(config_path: Path | str) -> StateGraph:
-    """Load a PipelineConfig from disk and compile the graph."""
-
-    path = Path(config_path)
+# Validated configs and compiled graphs by content digest, least recently used
+# first; file stats by path so an unchanged file is not even re-read.
+MAX_CACHED_GRAPHS = 8
+_CONFIG_CACHE: "OrderedDict[str, PipelineConfig | ValueError]" = OrderedDict()
+_GRAPH_CACHE: "OrderedDict[Tuple[str, Optional[str]], Any]" = OrderedDict()
+_FILE_STATS: Dict[Path, Tuple[int, int, str]] = {}
+_CACHE_LOCK = threading.RLock()
+
+
+def config_digest(raw: bytes | str) -> str:
+    if isinstance(raw, str):
+        raw = raw.encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _remember(cache: OrderedDict, key: Any, value: Any) -> None:
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > MAX_CACHED_GRAPHS:
+        cache.popitem(last=False)
+
+
+def load_pipeline_config(raw: bytes | str, *, digest: Optional[str] = None) -> PipelineConfig:
+    """Validate a config document once per content hash; invalid documents re-raise their error."""
+
+    digest = digest or config_digest(raw)
+    with _CACHE_LOCK:
+        cached = _CONFIG_CACHE.get(digest)
+        if cached is None:
+            try:
+                cached = PipelineConfig.model_validate_json(raw)
+            except ValueError as exc:
+                cached = exc
+            _remember(_CONFIG_CACHE, digest, cached)
+        else:
+            _CONFIG_CACHE.move_to_end(digest)
+    if isinstance(cached, ValueError):
+        raise cached
+    return cached
+
+
+def build_graph_from_json(raw: bytes | str, *, digest: Optional[str] = None) -> StateGraph:
+    """Compile a config document, reusing the graph compiled for identical content."""
+
+    digest = digest or config_digest(raw)
+    key = (digest, settings.LANGGRAPH_CHECKPOINT_DIR)
+    with _CACHE_LOCK:
+        compiled = _GRAPH_CACHE.get(key)
+        if compiled is None:
+            compiled = build_graph_from_config(load_pipeline_config(raw, digest=digest))
+        _remember(_GRAPH_CACHE, key, compiled)
+        return compiled
+
+
+def _file_digest(path: Path) -> Tuple[str, Optional[bytes]]:
+    """Digest of the file, reading it only when mtime or size changed."""
+    stat = path.stat()
+    cached = _FILE_STATS.get(path)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2], None
+    raw = path.read_bytes()
+    digest = config_digest(raw)
+    _FILE_STATS[path] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest, raw
+
+
+def build_graph_from_file(config_path: Path | str, *, use_cache: bool = True) -> StateGraph:
+    """Load a PipelineConfig from disk and compile the graph.
+
+    Compiled graphs are cached by the file's content hash, so repeated calls
+    (studio reloads, tests) only pay for a stat until the file changes.
+    """
+
+    path = Path(config_path).resolve()
     if not path.exists():
         raise FileNotFoundError(f"Pipeline config not found at {path}")
-    config = PipelineConfig.model_validate_json(path.read_text())
-    return build_graph_from_config(config)
+    if not use_cache:
+        return build_graph_from_config(PipelineConfig.model_validate_json(path.read_text()))
+
+    with _CACHE_LOCK:
+        digest, raw = _file_digest(path)
+        if raw is None:
+            compiled = _GRAPH_CACHE.get((digest, settings.LANGGRAPH_CHECKPOINT_DIR))
+            if compiled is not None:
+                return compiled
+            raw = path.read_bytes()
+        return build_graph_from_json(raw, digest=digest)
+
+
+def clear_graph_cache() -> None:
+    with _CACHE_LOCK:
+        _CONFIG_CACHE.clear()
+        _GRAPH_CACHE.clear()
+        _FILE_STATS.clear()
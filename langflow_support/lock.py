@@ -9,6 +9,8 @@ from pathlib import Path
 from contextlib import contextmanager
 
 LOCK_PATH = Path("langflow/.edit.lock")
+# A sync finishes in seconds; a lock older than this was most likely left behind by a crash
+STALE_LOCK_SECONDS = 600.0
 
 
 def _lock_contents() -> str:
@@ -18,6 +20,27 @@ def _lock_contents() -> str:
     return f"host={hostname}\npid={pid}\ntimestamp={timestamp}\n"
 
 
+def lock_is_stale(path: Path = LOCK_PATH, max_age: float = STALE_LOCK_SECONDS) -> bool:
+    """True when the lock outlived ``max_age`` or its holder on this host has exited."""
+
+    try:
+        age = time.time() - path.stat().st_mtime
+        details = dict(line.split("=", 1) for line in path.read_text().splitlines() if "=" in line)
+    except FileNotFoundError:
+        return False
+    if age > max_age:
+        return True
+    pid = details.get("pid", "")
+    if details.get("host") == socket.gethostname() and pid.isdigit():
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:  # alive, owned by another user
+            return False
+    return False
+
+
 @contextmanager
 def langflow_lock(timeout: float = 0.0):
     """Context manager acquiring the Langflow edit lock."""
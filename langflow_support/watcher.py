@@ -0,0 +1,188 @@
+"""Hot reload of the Langflow pipeline config for long-running services.
+
+``PipelineConfigWatcher`` polls the config file and, when its content changes,
+validates and compiles it into a new ``GraphRevision``. The swap is a single
+reference assignment: runs keep the revision they started with, so in-flight
+runs finish on the old graph while new runs pick up the new one. An invalid
+config is reported and the previous revision stays current. Reloads wait while
+``sync_langflow_changes.py`` holds the edit lock; a stale lock is reported in
+``last_error`` and ``status()``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from src.utils.metrics import counter, gauge
+
+from . import lock as edit_lock
+from .builder import build_graph_from_json, config_digest, load_pipeline_config
+from .schema import PipelineConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 2.0
+
+CONFIG_RELOADS = counter("pipeline_config_reloads_total", "Pipeline config reload attempts", ("outcome",))
+CONFIG_VERSION = gauge("pipeline_config_version", "Revision number of the active pipeline config")
+
+
+@dataclass(frozen=True)
+class GraphRevision:
+    """A compiled graph together with the config it was built from."""
+
+    version: int
+    digest: str
+    config: PipelineConfig
+    graph: Any
+    loaded_at: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "digest": self.digest,
+            "pipeline": self.config.pipeline.name,
+            "nodes": len(self.config.nodes),
+            "loaded_at": self.loaded_at,
+        }
+
+
+class PipelineConfigWatcher:
+    """Keep a compiled graph in step with a pipeline config file."""
+
+    def __init__(
+        self,
+        config_path: Path | str,
+        *,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        lock_path: Path | str | None = None,
+        stale_lock_seconds: float = edit_lock.STALE_LOCK_SECONDS,
+    ) -> None:
+        self.config_path = Path(config_path).resolve()
+        # ``langflow_lock`` writes ``LOCK_PATH`` relative to the working directory; resolve it the same way
+        self.lock_path = Path(lock_path or edit_lock.LOCK_PATH).resolve()
+        self.stale_lock_seconds = stale_lock_seconds
+        self.poll_interval = poll_interval
+        self.last_error: Optional[str] = None
+        self.last_checked: Optional[float] = None
+        self.lock_since: Optional[float] = None
+        self._lock_error: Optional[str] = None
+        self._revision: Optional[GraphRevision] = None
+        self._stat: Optional[Tuple[int, int, int]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def current(self) -> GraphRevision:
+        """The active revision; the first call loads the config and raises if it is invalid."""
+        revision = self._revision
+        if revision is None:
+            self.check()
+            revision = self._revision
+            if revision is None:
+                raise RuntimeError(f"Pipeline config {self.config_path} could not be loaded: {self.last_error}")
+        return revision
+
+    def check(self) -> bool:
+        """Reload if the file changed since the last check; True when a new revision was swapped in."""
+        with self._lock:
+            self.last_checked = time.time()
+            if self._edit_locked():
+                return False  # a sync is rewriting the file; look again once it is done
+            try:
+                stat = self.config_path.stat()
+            except FileNotFoundError:
+                self.last_error = f"Pipeline config not found at {self.config_path}"
+                return False
+            key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            if key == self._stat:
+                return False
+            raw = self.config_path.read_bytes()
+            digest = config_digest(raw)
+            self._stat = key
+            if self._revision is not None and digest == self._revision.digest:
+                return False
+            try:
+                config = load_pipeline_config(raw, digest=digest)
+                graph = build_graph_from_json(raw, digest=digest)
+            except Exception as exc:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                CONFIG_RELOADS.inc(outcome="invalid")
+                logger.warning("Keeping pipeline config revision %s: %s", self._version, self.last_error)
+                return False
+            self._revision = GraphRevision(
+                version=self._version + 1, digest=digest, config=config, graph=graph, loaded_at=time.time()
+            )
+            self.last_error = None
+            CONFIG_RELOADS.inc(outcome="ok")
+            CONFIG_VERSION.set(self._revision.version)
+            logger.info("Loaded pipeline config revision %s (%s)", self._revision.version, digest[:12])
+            return True
+
+    def _edit_locked(self) -> bool:
+        """Track the edit lock; a stale one is reported in ``last_error`` but still waited on."""
+        try:
+            self.lock_since = self.lock_path.stat().st_mtime
+        except FileNotFoundError:
+            self.lock_since = None
+            if self._lock_error is not None and self.last_error == self._lock_error:
+                self.last_error = None
+            self._lock_error = None
+            return False
+        if self._lock_error is None and edit_lock.lock_is_stale(self.lock_path, self.stale_lock_seconds):
+            self._lock_error = (
+                f"Edit lock {self.lock_path} looks stale (held since {_timestamp(self.lock_since)}); "
+                "remove it if no sync is running"
+            )
+            self.last_error = self._lock_error
+            logger.warning(self._lock_error)
+        return True
+
+    @property
+    def _version(self) -> int:
+        return self._revision.version if self._revision else 0
+
+    def start(self) -> None:
+        """Check now and then every ``poll_interval`` seconds in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, name="pipeline-config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _poll(self) -> None:
+        while True:
+            try:
+                self.check()
+            except Exception:  # pragma: no cover - keep watching after unexpected IO errors
+                logger.exception("Pipeline config check failed")
+            if self._stop.wait(self.poll_interval):
+                return
+
+    def status(self) -> Dict[str, Any]:
+        revision = self._revision
+        since = self.lock_since
+        return {
+            "config_path": str(self.config_path),
+            "revision": revision.to_dict() if revision else None,
+            "last_error": self.last_error,
+            "last_checked": self.last_checked,
+            "waiting": f"waiting on edit lock since {_timestamp(since)}" if since is not None else None,
+            "watching": self._thread is not None and self._thread.is_alive(),
+        }
+
+
+def _timestamp(value: float) -> str:
+    return datetime.fromtimestamp(value).isoformat(timespec="seconds")
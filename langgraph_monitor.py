@@ -1,26 +1,166 @@
 #!/usr/bin/env python3
 """Simple web interface for monitoring LangGraph pipeline execution."""
 
-import json
 import asyncio
+import json
+import os
+import uuid
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
-from src.unified_langgraph_pipeline import run_pipeline
-from src.graphs.checkpoints import FileCheckpointSaver
+from langflow_support import PipelineConfigWatcher
+from src.unified_langgraph_pipeline import default_profile_dir, run_pipeline
+from src.unified_visual_pipeline import CONFIG_PATH, run_visual_pipeline
+from src.graphs.events import EventHub, RunEventLog
+from src.graphs.jobs import FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueueFull, JobRunner
+from src.utils.metrics import CONTENT_TYPE, REGISTRY, gauge
+from src.utils.profiling import RunProfiler
+
+# Pipeline runs executing at once, runs allowed to wait, and processes for story enrichment
+MONITOR_WORKERS = int(os.getenv("MONITOR_WORKERS", "2"))
+MONITOR_MAX_PENDING = int(os.getenv("MONITOR_MAX_PENDING", "16"))
+MONITOR_ENRICH_PROCESSES = int(os.getenv("MONITOR_ENRICH_PROCESSES", "2"))
+# Seconds between SSE keep-alive comments so proxies do not drop idle streams
+SSE_HEARTBEAT = float(os.getenv("MONITOR_SSE_HEARTBEAT", "15"))
+# Seconds between checks of the Langflow pipeline config used by "visual" runs
+CONFIG_POLL_INTERVAL = float(os.getenv("MONITOR_CONFIG_POLL", "2"))
+
+hub = EventHub()
+config_watcher = PipelineConfigWatcher(CONFIG_PATH, poll_interval=CONFIG_POLL_INTERVAL)
+MONITOR_JOBS = gauge("pipeline_monitor_jobs", "Monitor jobs by status", ("status",))
+
+
+async def execute_pipeline(*, thread_id: str, **params: Any) -> Dict[str, Any]:
+    """Run one job; failures before the run is tracked still close its event log."""
+    events = hub.open(thread_id)
+    try:
+        return await _execute_workflow(thread_id=thread_id, events=events, **params)
+    except Exception as exc:
+        # e.g. an invalid config or profiler setup: track_run never opened the run
+        if not events.closed:
+            events.publish("run_failed", error=f"{type(exc).__name__}: {exc}")
+            events.close()
+        raise
+
+
+async def _execute_workflow(
+    *,
+    thread_id: str,
+    events: RunEventLog,
+    enrich_executor: Optional[Executor] = None,
+    hours_filter: Optional[int] = 24,
+    selection_limit: int = 6,
+    max_attempts: int = 2,
+    candidates: int = 1,
+    workflow: str = "unified",
+    profile: bool = False,
+    profile_nodes: Optional[List[str]] = None,
+    profile_mode: str = "cprofile",
+) -> Dict[str, Any]:
+    """Run research + script for one job and return the JSON summary."""
+    profiler = None
+    if profile or profile_nodes:
+        profiler = RunProfiler(default_profile_dir(thread_id), nodes=profile_nodes, mode=profile_mode)
+    if workflow == "visual":
+        return await execute_visual_pipeline(
+            thread_id=thread_id,
+            events=events,
+            enrich_executor=enrich_executor,
+            hours_filter=hours_filter,
+            selection_limit=selection_limit,
+            max_attempts=max_attempts,
+            candidates=candidates,
+            profiler=profiler,
+        )
+    research_state, script_state = await run_pipeline(
+        hours_filter=hours_filter,
+        selection_limit=selection_limit,
+        max_attempts=max_attempts,
+        thread_id=thread_id,
+        candidates=candidates,
+        enrich_executor=enrich_executor,
+        events=events,
+        profiler=profiler,
+    )
+    return {
+        "success": True,
+        "thread_id": thread_id,
+        "profile_url": f"/runs/{thread_id}/profile" if profiler else None,
+        "research": {
+            "stories_found": len(research_state.raw_stories),
+            "stories_selected": len(research_state.selected_stories),
+            "diagnostics": research_state.diagnostics.events
+        },
+        "script": {
+            "generated": script_state.final_script is not None,
+            "validation_score": script_state.final_script.validation.score if script_state.final_script else 0,
+            "manual_review": script_state.manual_review,
+            "attempts": script_state.attempts
+        }
+    }
+
+
+async def execute_visual_pipeline(*, thread_id: str, events: RunEventLog, **params: Any) -> Dict[str, Any]:
+    """Run the Langflow-configured graph; the run keeps the config revision it started with."""
+    revision = config_watcher.current()
+    events.publish("config_revision", **revision.to_dict())
+    state = await run_visual_pipeline(revision.graph, thread_id=thread_id, events=events, **params)
+    return {
+        "success": True,
+        "thread_id": thread_id,
+        "workflow": "visual",
+        "config": revision.to_dict(),
+        "profile_url": f"/runs/{thread_id}/profile" if params.get("profiler") else None,
+        "research": {
+            "stories_found": len(state.raw_stories),
+            "stories_selected": len(state.selected_stories),
+            "diagnostics": state.diagnostics.events
+        },
+        "script": {
+            "generated": state.final_script is not None,
+            "validation_score": state.final_script.validation.score if state.final_script else 0,
+            "manual_review": state.manual_review,
+            "attempts": state.attempts
+        }
+    }
+
+
+runner = JobRunner(
+    execute_pipeline,
+    max_workers=MONITOR_WORKERS,
+    max_pending=MONITOR_MAX_PENDING,
+    enrich_processes=MONITOR_ENRICH_PROCESSES,
+)
 
-app = FastAPI(title="LangGraph Pipeline Monitor")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    config_watcher.start()
+    yield
+    config_watcher.stop()
+    runner.shutdown(wait=False)
+
+
+app = FastAPI(title="LangGraph Pipeline Monitor", lifespan=lifespan)
 
 class PipelineRequest(BaseModel):
     hours_filter: Optional[int] = 24
     selection_limit: int = 6
     max_attempts: int = 2
     thread_id: Optional[str] = None
+    candidates: int = 1
+    workflow: Literal["unified", "visual"] = "unified"
+    # Opt-in CPU/allocation profiling; results at /runs/{thread_id}/profile
+    profile: bool = False
+    profile_nodes: Optional[List[str]] = None
+    profile_mode: Literal["cprofile", "sample"] = "cprofile"
 
 class PipelineStatus(BaseModel):
     status: str
@@ -29,6 +169,7 @@ class PipelineStatus(BaseModel):
     script_complete: bool
     errors: List[str]
     timestamp: str
+    last_event: Optional[Dict[str, Any]] = None
 
 @app.get("/", response_class=HTMLResponse)
 async def home():
@@ -75,7 +216,49 @@ async def home():
                     })
                 });
 
+                const job = await response.json();
+                if (!response.ok) {
+                    status.innerHTML = '<div class="status error">' + (job.detail || response.status) + '</div>';
+                    return;
+                }
+                status.innerHTML = '<div class="status running">Job ' + job.job_id + ' queued</div>';
+                followRun(job);
+            }
+
+            function followRun(job) {
+                const status = document.getElementById('status');
+                const lines = [];
+                const source = new EventSource(job.events_url);
+                const show = (event) => {
+                    const data = JSON.parse(event.data);
+                    let line = data.kind + (data.graph ? ' ' + data.graph : '') + (data.node ? '.' + data.node : '');
+                    if (data.kind === 'node_finish') {
+                        line += ' ' + data.wall_ms.toFixed(1) + ' ms' + (data.items != null ? ', ' + data.items + ' items' : '');
+                    }
+                    lines.push(line);
+                    status.innerHTML = '<div class="status running"><pre>' + lines.join('\\n') + '</pre></div>';
+                };
+                ['queued', 'run_start', 'graph_start', 'node_start', 'node_finish', 'graph_finish'].forEach(
+                    (kind) => source.addEventListener(kind, show)
+                );
+                ['run_finish', 'run_failed', 'rejected'].forEach((kind) => source.addEventListener(kind, (event) => {
+                    show(event);
+                    source.close();
+                    pollJob(job.job_id);
+                }));
+            }
+
+            async function pollJob(jobId) {
+                const response = await fetch('/jobs/' + jobId + '/result');
                 const data = await response.json();
+                const status = document.getElementById('status');
+                if (response.status === 202) {
+                    status.innerHTML = '<div class="status running">Job ' + jobId + ' ' + data.status + '</div>';
+                    setTimeout(() => pollJob(jobId), 3000);
+                    return;
+                }
+                const cssClass = data.status === 'succeeded' ? 'complete' : 'error';
+                status.innerHTML = '<div class="status ' + cssClass + '">Job ' + jobId + ' ' + data.status + '</div>';
                 document.getElementById('result').innerHTML =
                     '<pre>' + JSON.stringify(data, null, 2) + '</pre>';
             }
@@ -102,38 +285,118 @@ async def home():
     """
     return html
 
-@app.post("/run")
+@app.post("/run", status_code=202)
 async def run_pipeline_endpoint(request: PipelineRequest):
-    """Execute the LangGraph pipeline."""
+    """Queue a pipeline run and return its job id immediately."""
+    params = request.model_dump(exclude={"thread_id"})
+    thread_id = request.thread_id or str(uuid.uuid4())
+    if request.profile or request.profile_nodes:
+        try:
+            default_profile_dir(thread_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    events = hub.open(thread_id)
+    events.publish("queued", params=params)
     try:
-        research_state, script_state = await run_pipeline(
-            hours_filter=request.hours_filter,
-            selection_limit=request.selection_limit,
-            max_attempts=request.max_attempts,
-            thread_id=request.thread_id
-        )
+        job = runner.submit(params, thread_id=thread_id)
+    except JobQueueFull as e:
+        events.publish("rejected", error=str(e))
+        events.close()
+        raise HTTPException(status_code=429, detail=str(e))
+    return {
+        **job.to_dict(),
+        "status_url": f"/jobs/{job.id}",
+        "result_url": f"/jobs/{job.id}/result",
+        "events_url": f"/runs/{thread_id}/events",
+    }
 
-        return {
-            "success": True,
-            "thread_id": research_state.request_id,
-            "research": {
-                "stories_found": len(research_state.raw_stories),
-                "stories_selected": len(research_state.selected_stories),
-                "diagnostics": research_state.diagnostics.events
-            },
-            "script": {
-                "generated": script_state.final_script is not None,
-                "validation_score": script_state.final_script.validation.score if script_state.final_script else 0,
-                "manual_review": script_state.manual_review,
-                "attempts": script_state.attempts
-            }
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@app.get("/runs/{thread_id}/events")
+async def run_events(thread_id: str, last_event_id: Optional[int] = Header(None)):
+    """Server-sent events with per-node progress, replaying the run's buffer first."""
+    events = hub.get(thread_id)
+    if events is None:
+        raise HTTPException(status_code=404, detail=f"Unknown run {thread_id}")
+
+    async def stream():
+        async for event in events.follow(after=last_event_id or 0, heartbeat=SSE_HEARTBEAT):
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"id: {event['seq']}\nevent: {event['kind']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/runs/{thread_id}/profile")
+async def run_profile(thread_id: str, format: Literal["json", "text"] = "json"):
+    """Per-node profile summary of a run started with ``profile``."""
+    try:
+        profile_dir = default_profile_dir(thread_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail=f"No profile for run {thread_id}")
+    target = profile_dir / ("summary.txt" if format == "text" else "summary.json")
+    if not target.exists():
+        raise HTTPException(status_code=404, detail=f"No profile for run {thread_id}")
+    if format == "text":
+        return PlainTextResponse(target.read_text(encoding="utf-8"))
+    return JSONResponse(json.loads(target.read_text(encoding="utf-8")))
+
+@app.get("/jobs")
+async def list_jobs():
+    """Known jobs, newest first."""
+    return [job.to_dict() for job in runner.jobs()]
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status of one job."""
+    job = runner.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    return job.to_dict()
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """Result of a finished job; 202 while it is still queued or running."""
+    job = runner.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    if job.status == SUCCEEDED:
+        return job.to_dict(include_result=True)
+    if job.status == FAILED:
+        return JSONResponse(status_code=500, content=job.to_dict())
+    return JSONResponse(status_code=202, content=job.to_dict())
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics for this process."""
+    statuses = [job.status for job in runner.jobs()]
+    for status in (QUEUED, RUNNING, SUCCEEDED, FAILED):
+        MONITOR_JOBS.set(statuses.count(status), status=status)
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
 
 @app.get("/status")
 async def get_status():
-    """Get current pipeline status from checkpoints."""
+    """Status of the latest run, from its event log or else from checkpoints."""
+    events = hub.latest()
+    if events is not None:
+        last = events.last()
+        finished = {event["graph"] for event in events.since() if event["kind"] == "graph_finish"}
+        status = {"run_finish": "complete", "run_failed": "error", "rejected": "error", "queued": "queued"}.get(
+            last["kind"] if last else "", "running"
+        )
+        return PipelineStatus(
+            status=status,
+            thread_id=events.run_id,
+            research_complete=bool({"research", "visual"} & finished),
+            script_complete=bool({"script", "visual"} & finished),
+            errors=[event["error"] for event in events.since() if event.get("error")],
+            timestamp=datetime.fromtimestamp(last["ts"] if last else 0).isoformat(),
+            last_event=last,
+        )
+
     checkpoint_dir = Path(".langgraph/checkpoints")
 
     # Find most recent checkpoint
@@ -168,6 +431,20 @@ async def get_status():
         timestamp=datetime.now().isoformat()
     )
 
+@app.get("/config")
+async def get_config():
+    """Active Langflow pipeline config revision used by "visual" runs."""
+    return config_watcher.status()
+
+@app.post("/config/reload")
+async def reload_config():
+    """Check the pipeline config now instead of waiting for the next poll."""
+    reloaded = await asyncio.to_thread(config_watcher.check)
+    status = config_watcher.status()
+    if not reloaded and status["last_error"]:
+        return JSONResponse(status_code=422, content={"reloaded": False, **status})
+    return {"reloaded": reloaded, **status}
+
 @app.get("/checkpoints/{workflow}")
 async def list_checkpoints(workflow: str):
     """List all checkpoints for a workflow."""
@@ -14,6 +14,7 @@ class Settings:
     SLACK_SIGNING_SECRET: str | None = os.getenv("SLACK_SIGNING_SECRET")
     SLACK_CHANNEL_ID: str | None = os.getenv("SLACK_CHANNEL_ID")
     OPENAI_API_KEY: str | None = os.getenv("OPENAI_API_KEY")
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
     ELEVENLABS_API_KEY: str | None = os.getenv("ELEVENLABS_API_KEY")
     ELEVENLABS_VOICE_ID: str | None = os.getenv("ELEVENLABS_VOICE_ID")
     YOUTUBE_CLIENT_SECRETS: str | None = os.getenv("YOUTUBE_CLIENT_SECRETS")
@@ -2,18 +2,52 @@ from __future__ import annotations
 
 import json
 import random
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 TEMPLATE_PATH = Path(__file__).resolve().parents[2] / "templates" / "cta_patterns.json"
 
+_RISK_PREFERENCES: Dict[str, FrozenSet[str]] = {
+    "threat": frozenset({"risk_readiness", "policy_watch", "resilience", "ethics_signal"}),
+    "opportunity": frozenset({"allocation_decision", "experiment_velocity", "competitive_response", "data_strategy"}),
+    "monitor": frozenset({"customer_obligation", "data_strategy", "talent_gap"}),
+}
+
+
+@lru_cache(maxsize=None)
+def _load_library(path: Path) -> Tuple[Tuple[Dict[str, str], ...], Dict[str, FrozenSet[int]]]:
+    """Index CTA patterns once per path into risk level -> pattern-id sets.
+
+    Patterns join a risk level either through the built-in preference table or
+    by listing the level in their own ``tags``.
+    """
+    with open(path, "r", encoding="utf-8") as handle:
+        patterns = tuple(json.load(handle))
+
+    risk_index: Dict[str, set[int]] = {level: set() for level in _RISK_PREFERENCES}
+    for pattern_id, pattern in enumerate(patterns):
+        for level, preferred_ids in _RISK_PREFERENCES.items():
+            if pattern.get("id") in preferred_ids:
+                risk_index[level].add(pattern_id)
+        for tag in pattern.get("tags") or []:
+            risk_index.setdefault(str(tag), set()).add(pattern_id)
+    return patterns, {level: frozenset(ids) for level, ids in risk_index.items()}
+
 
 class CTAGenerator:
     """Generate context-aware CTA questions from pattern library."""
 
-    def __init__(self) -> None:
-        with open(TEMPLATE_PATH, "r", encoding="utf-8") as handle:
-            self._patterns = json.load(handle)
+    def __init__(self, *, seed: Optional[int] = None, path: Path = TEMPLATE_PATH) -> None:
+        self._patterns, self._risk_index = _load_library(Path(path))
+        self._all_ids = frozenset(range(len(self._patterns)))
+        self._intent_index: Dict[str, FrozenSet[int]] = {}
+        # Sorted candidate ids per (intent, risk level), computed on first use
+        self._choices: Dict[Tuple[Optional[str], Optional[str]], Tuple[int, ...]] = {}
+        self._rng = random.Random(seed)
+
+    def reseed(self, seed: Optional[int]) -> None:
+        self._rng.seed(seed)
 
     def generate(
         self,
@@ -22,12 +56,6 @@ class CTAGenerator:
         intent: str | None = None,
         context: Optional[Dict[str, str]] = None,
     ) -> Dict[str, str]:
-        choices: List[Dict[str, str]] = list(self._patterns)
-        if intent:
-            filtered = [p for p in choices if intent in p.get("id", "")]
-            if filtered:
-                choices = filtered
-
         risk_level = "monitor"
         insight = ""
         action = ""
@@ -35,20 +63,8 @@ class CTAGenerator:
             risk_level = context.get("risk_level", "monitor")
             insight = context.get("highlight", "")
             action = context.get("action", "")
-            if risk_level == "threat":
-                preferred_ids = {"risk_readiness", "policy_watch", "resilience", "ethics_signal"}
-            elif risk_level == "opportunity":
-                preferred_ids = {"allocation_decision", "experiment_velocity", "competitive_response", "data_strategy"}
-            else:
-                preferred_ids = {"customer_obligation", "data_strategy", "talent_gap"}
-            filtered = [p for p in choices if p.get("id") in preferred_ids]
-            if filtered:
-                choices = filtered
-
-        if not choices:
-            choices = list(self._patterns)
-
-        pattern = random.choice(choices)
+
+        pattern = self._patterns[self._rng.choice(self._choice_ids(intent, risk_level if context else None))]
         topic_phrase = topic.strip()
         question_template = pattern.get("pattern", "{{topic}}")
         question = self._fill_pattern(question_template, topic_phrase, insight)
@@ -56,6 +72,35 @@ class CTAGenerator:
         rendered = self._finalize_question(question, follow_up)
         return {"id": pattern.get("id", "custom"), "question": rendered}
 
+    def _choice_ids(self, intent: Optional[str], risk_level: Optional[str]) -> Tuple[int, ...]:
+        key = (intent, risk_level)
+        cached = self._choices.get(key)
+        if cached is None:
+            choices = self._all_ids
+            if intent:
+                filtered = self._intent_ids(intent)
+                if filtered:
+                    choices = filtered
+            if risk_level is not None:
+                preferred = self._risk_index.get(risk_level)
+                if preferred is None:
+                    preferred = self._risk_index.get("monitor", frozenset())
+                filtered = choices & preferred
+                if filtered:
+                    choices = filtered
+            cached = tuple(sorted(choices or self._all_ids))
+            self._choices[key] = cached
+        return cached
+
+    def _intent_ids(self, intent: str) -> FrozenSet[int]:
+        cached = self._intent_index.get(intent)
+        if cached is None:
+            cached = frozenset(
+                pattern_id for pattern_id, pattern in enumerate(self._patterns) if intent in pattern.get("id", "")
+            )
+            self._intent_index[intent] = cached
+        return cached
+
     def _fill_pattern(self, template: str, topic: str, insight: str) -> str:
         question = template.replace("{{topic}}", topic)
         if "{{insight}}" in question:
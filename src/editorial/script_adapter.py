@@ -2,17 +2,24 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List
+import copy
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Optional
 
 from src.editorial.script_daily import ScriptGenerator
+from src.editorial.story_analyzer import StoryAnalyzer
 from src.editorial.structure_validator import StructureValidator
 from src.models import SegmentDraft, ScriptDraft, ValidationReport
 
 
-def _ensure_dicts(stories: Iterable[Any]) -> List[Dict[str, Any]]:
-    payload: List[Dict[str, Any]] = []
+def _ensure_dicts(stories: Iterable[Any]) -> List[Mapping[str, Any]]:
+    # Editorial code only reads stories, so dicts and StoryRecords pass through
+    # untouched; only pydantic models need converting.
+    payload: List[Mapping[str, Any]] = []
     for story in stories:
-        if hasattr(story, "model_dump"):
+        if isinstance(story, Mapping):
+            payload.append(story)
+        elif hasattr(story, "model_dump"):
             payload.append(story.model_dump())
         else:
             payload.append(dict(story))
@@ -23,6 +30,8 @@ def _build_segments(structure: Dict[str, Any], pacing: Dict[str, Any]) -> List[S
     segments: List[SegmentDraft] = []
     raw_segments = structure.get("segments", [])
     duration_estimates = pacing.get("segment_estimates", []) if isinstance(pacing, dict) else []
+    act2 = (structure.get("acts") or {}).get("act2") or {}
+    rendered_blocks = [item.get("rendered") for item in act2.get("segments", []) if isinstance(item, dict)]
     for idx, segment in enumerate(raw_segments):
         duration = float(duration_estimates[idx]) if idx < len(duration_estimates) else float(segment.get("estimated_duration", 0.0))
         word_count = int(segment.get("word_count", 0))
@@ -39,7 +48,7 @@ def _build_segments(structure: Dict[str, Any], pacing: Dict[str, Any]) -> List[S
                 segment_type=segment.get("segment_type", "news"),
                 topic_phrase=segment.get("topic_phrase"),
                 impact_profile=dict(segment.get("impact_profile", {})),
-                voiceover=segment.get("rendered"),
+                voiceover=segment.get("rendered") or (rendered_blocks[idx] if idx < len(rendered_blocks) else None),
                 duration_seconds=duration,
                 word_count=word_count,
                 metadata={k: v for k, v in segment.items() if k not in {"headline", "what", "so_what", "now_what", "analogy", "wow_factor", "transition", "keywords", "segment_type", "topic_phrase", "impact_profile", "rendered", "estimated_duration", "word_count"}},
@@ -48,10 +57,13 @@ def _build_segments(structure: Dict[str, Any], pacing: Dict[str, Any]) -> List[S
     return segments
 
 
-def generate_script_draft(stories: Iterable[Any]) -> ScriptDraft:
-    generator = ScriptGenerator()
-    raw_payload = _ensure_dicts(stories)
-    legacy = generator.generate_script(raw_payload)
+def analyze_stories(stories: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Run StoryAnalyzer once so later attempts can reuse the result."""
+    return StoryAnalyzer().analyze(_ensure_dicts(stories))
+
+
+def legacy_to_draft(legacy: Dict[str, Any]) -> ScriptDraft:
+    """Typed draft for a ScriptGenerator package; the inverse of ``draft_to_legacy``."""
     metadata = legacy.get("metadata", {})
     structure = metadata.get("structure", {})
     pacing = metadata.get("pacing", {})
@@ -80,6 +92,66 @@ def generate_script_draft(stories: Iterable[Any]) -> ScriptDraft:
     return draft
 
 
+def generate_script_draft(
+    stories: Iterable[Any],
+    *,
+    candidates: int = 1,
+    seed: Optional[int] = None,
+    analyzed: Optional[List[Dict[str, Any]]] = None,
+) -> ScriptDraft:
+    generator = ScriptGenerator(seed=seed)
+    raw_payload = _ensure_dicts(stories) if analyzed is None else []
+    legacy = generator.generate_script(raw_payload, candidates=candidates, analyzed=analyzed)
+    return legacy_to_draft(legacy)
+
+
+def regenerate_script_draft(
+    draft: ScriptDraft,
+    analyzed: List[Dict[str, Any]],
+    *,
+    missing: Optional[List[str]] = None,
+    seed: Optional[int] = None,
+) -> ScriptDraft:
+    """Regenerate only the parts of ``draft`` its validation report flagged."""
+    generator = ScriptGenerator(seed=seed)
+    flagged = list(missing if missing is not None else draft.validation.missing)
+    legacy = generator.regenerate_script(analyzed, draft_to_package(draft), flagged)
+    return legacy_to_draft(legacy)
+
+
+def draft_to_package(draft: ScriptDraft) -> Dict[str, Any]:
+    """Rebuild the ScriptGenerator package (rendered segments included) from a draft."""
+    segments: List[Dict[str, Any]] = []
+    for segment in draft.segments:
+        segments.append({
+            **segment.metadata,
+            "headline": segment.headline,
+            "what": segment.what,
+            "so_what": segment.so_what,
+            "now_what": segment.now_what,
+            "analogy": segment.analogy,
+            "wow_factor": segment.wow_factor,
+            "transition": segment.transition,
+            "keywords": list(segment.keywords),
+            "segment_type": segment.segment_type,
+            "topic_phrase": segment.topic_phrase,
+            "impact_profile": dict(segment.impact_profile),
+            "estimated_duration": segment.duration_seconds,
+            "word_count": segment.word_count,
+            "rendered": segment.voiceover or "",
+        })
+    acts = copy.deepcopy(draft.acts)
+    acts.setdefault("act2", {})["segments"] = segments
+    return {
+        "acts": acts,
+        "segments": segments,
+        "headline_blitz": list(draft.headline_blitz),
+        "bridge_sentence": draft.bridge_sentence or "",
+        "cta": dict(draft.cta),
+        "pacing": dict(draft.pacing),
+    }
+
+
 def draft_to_legacy(draft: ScriptDraft) -> Dict[str, Any]:
     lower_thirds = [segment.headline for segment in draft.segments]
     broll_keywords = []
@@ -102,5 +174,6 @@ def draft_to_legacy(draft: ScriptDraft) -> Dict[str, Any]:
                 "acts": draft.acts,
             },
             "pacing": draft.pacing,
+            "voiceover_units": draft.metadata.get("voiceover_units", []),
         },
     }
@@ -2,11 +2,17 @@ from __future__ import annotations
 
 import json
 import os
+import random
 import re
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..config import settings
+from ..utils.metrics import track_llm_call
+from ..utils.tracing import span
 from .story_analyzer import StoryAnalyzer
 from .structure_validator import StructureValidator
 from .tone_enhancer import ToneEnhancer
@@ -14,14 +20,31 @@ from .transition_generator import TransitionGenerator
 from .cta_generator import CTAGenerator
 
 TEMPLATE_DIR = Path(__file__).resolve().parents[2] / "templates"
-MAIN_TEMPLATE = (TEMPLATE_DIR / "futurist_briefing_main.txt").read_text(encoding="utf-8")
+MAIN_TEMPLATE_PATH = TEMPLATE_DIR / "futurist_briefing_main.txt"
+# Placeholder splitting the rendered main template into intro and outro voiceover units
+_SEGMENT_BLOCKS = "\x00segment_blocks\x00"
 SEGMENT_DIR = TEMPLATE_DIR / "segment_templates"
-SEGMENT_TEMPLATES = {
-    "news": (SEGMENT_DIR / "news.txt").read_text(encoding="utf-8"),
-    "funding": (SEGMENT_DIR / "funding.txt").read_text(encoding="utf-8"),
-    "research": (SEGMENT_DIR / "research.txt").read_text(encoding="utf-8"),
-    "policy": (SEGMENT_DIR / "policy.txt").read_text(encoding="utf-8"),
-}
+SEGMENT_TYPES = ("news", "funding", "research", "policy")
+
+
+@lru_cache(maxsize=None)
+def load_template(path: Path) -> str:
+    """Read a template on first use and keep it for the life of the process."""
+    return path.read_text(encoding="utf-8")
+
+
+def segment_template(segment_type: Optional[str]) -> str:
+    """Template for a segment type, falling back to the news template."""
+    return load_template(SEGMENT_DIR / f"{segment_type if segment_type in SEGMENT_TYPES else 'news'}.txt")
+
+
+def __getattr__(name: str) -> Any:
+    # MAIN_TEMPLATE / SEGMENT_TEMPLATES used to be read eagerly at import
+    if name == "MAIN_TEMPLATE":
+        return load_template(MAIN_TEMPLATE_PATH)
+    if name == "SEGMENT_TEMPLATES":
+        return {segment_type: segment_template(segment_type) for segment_type in SEGMENT_TYPES}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 _TITLE_SUBJECT_BLOCKLIST = {
     "A",
@@ -106,6 +129,11 @@ def _render_template(template: str, values: Dict[str, str]) -> str:
     return result
 
 
+def _stable_hash(text: str) -> int:
+    """Process-independent hash so seeded runs render identical scripts."""
+    return zlib.crc32(text.encode("utf-8"))
+
+
 def _first_sentence(text: str, fallback: str) -> str:
     if not text:
         return fallback
@@ -127,18 +155,38 @@ def _determine_segment_type(story: Dict[str, Any]) -> str:
 class ScriptGenerator:
     """Generate futurist daily scripts from analyzed stories."""
 
-    def __init__(self) -> None:
+    def __init__(self, *, seed: Optional[int] = None) -> None:
+        self.seed = seed
         self.analyzer = StoryAnalyzer()
         self.validator = StructureValidator()
-        self.transitions = TransitionGenerator()
-        self.cta = CTAGenerator()
+        self.transitions = TransitionGenerator(seed=seed)
+        self.cta = CTAGenerator(seed=seed)
         self.tone = ToneEnhancer(enable_llm=os.getenv("TONE_ENHANCER_LLM", "false").lower() == "true")
+        self._rng = random.Random(seed)
+
+    def generate_script(
+        self,
+        stories: List[Dict[str, Any]],
+        *,
+        candidates: int = 1,
+        max_workers: Optional[int] = None,
+        analyzed: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """Compose, validate and render a script package.
 
-    def generate_script(self, stories: List[Dict[str, Any]]) -> Dict[str, Any]:
-        analyzed = self.analyzer.analyze(stories or [])
+        With ``candidates > 1`` the packages are composed concurrently with
+        distinct seeds and the best validator score wins; the others are
+        reported under ``metadata["runner_ups"]``. Pass ``analyzed`` to reuse
+        a previous ``StoryAnalyzer.analyze`` result.
+        """
+        if analyzed is None:
+            analyzed = self.analyzer.analyze(stories or [])
         if not analyzed:
             return self._fallback_response()
 
+        if candidates > 1:
+            return self._generate_best_of(analyzed, candidates, max_workers=max_workers)
+
         package = None
         result = None
         for _ in range(2):
@@ -150,21 +198,84 @@ class ScriptGenerator:
             package = self._fallback_package(analyzed)
             result = self.validator.validate(package)
 
-        script_text = _render_template(MAIN_TEMPLATE, {
+        return self._render_output(package, result)
+
+    def _generate_best_of(
+        self,
+        analyzed: List[Dict[str, Any]],
+        count: int,
+        *,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        base_seed = self.seed if self.seed is not None else random.randrange(2**32)
+        seeds = [base_seed + offset for offset in range(count)]
+
+        def compose(seed: int) -> Tuple[int, Dict[str, Any], Any]:
+            worker = ScriptGenerator(seed=seed)
+            package = worker._compose_package(analyzed)
+            return seed, package, self.validator.validate(package)
+
+        with ThreadPoolExecutor(max_workers=max_workers or count) as pool:
+            scored = list(pool.map(compose, seeds))
+
+        # Passing candidates first, then score; earlier seeds win ties.
+        ranking = sorted(range(len(scored)), key=lambda idx: (not scored[idx][2].passed, -scored[idx][2].score, idx))
+        best_seed, package, result = scored[ranking[0]]
+        runner_ups = [scored[idx] for idx in ranking[1:]]
+        if not result.passed:
+            fallback = self._fallback_package(analyzed)
+            fallback_result = self.validator.validate(fallback)
+            if fallback_result.passed or fallback_result.score > result.score:
+                runner_ups.insert(0, (best_seed, package, result))
+                best_seed, package, result = None, fallback, fallback_result
+
+        output = self._render_output(package, result)
+        output["metadata"]["seed"] = best_seed
+        output["metadata"]["runner_ups"] = [
+            {
+                "seed": seed,
+                "validator": {"passed": report.passed, "score": report.score, "missing": report.missing},
+                "structure": self._structure_summary(candidate),
+                "pacing": candidate.get("pacing", {}),
+            }
+            for seed, candidate, report in runner_ups
+        ]
+        return output
+
+    def _render_output(self, package: Dict[str, Any], result: Any) -> Dict[str, Any]:
+        script_text = _render_template(load_template(MAIN_TEMPLATE_PATH), {
             "opening_hook": package["acts"]["act1"]["hook"] + "\n",
             "headline_blitz": "\n".join(f"• {h}" for h in package["headline_blitz"]),
             "bridge_sentence": package["bridge_sentence"] + "\n",
-            "segment_blocks": "\n\n".join(segment["rendered"] for segment in package["segments"]),
+            "segment_blocks": _SEGMENT_BLOCKS,
             "closing_reflection": package["acts"]["act3"]["closing"],
             "cta_prompt": package["cta"]["question"],
             "sign_off": package["acts"]["act3"].get("sign_off", "Stay sharp — JunaidQ AI News"),
         })
+        intro, outro = script_text.split(_SEGMENT_BLOCKS, 1)
+        units = [
+            ("intro", intro),
+            *((f"segment_{idx}", segment["rendered"]) for idx, segment in enumerate(package["segments"])),
+            ("outro", outro),
+        ]
 
-        tone_result = self.tone.enhance(script_text)
-        package["acts"]["act2"]["body"] = tone_result["text"]
+        # Tone is applied per voiceover unit so TTS can synthesize exactly the approved text
+        # segment by segment; the script is those units joined by blank lines.
+        if self.tone.enable_llm:
+            with ThreadPoolExecutor(max_workers=len(units)) as pool:
+                toned = list(pool.map(lambda unit: self.tone.enhance(unit[1]), units))
+        else:
+            toned = [self.tone.enhance(text) for _, text in units]
+        voiceover_units = [
+            {"name": name, "text": tone_result["text"]}
+            for (name, _), tone_result in zip(units, toned)
+            if tone_result["text"]
+        ]
+        vo_script = "\n\n".join(unit["text"] for unit in voiceover_units)
+        package["acts"]["act2"]["body"] = vo_script
 
         output = {
-            "vo_script": tone_result["text"],
+            "vo_script": vo_script,
             "lower_thirds": [segment["headline"] for segment in package["segments"]],
             "broll_keywords": self._aggregate_keywords(package["segments"]),
             "chapters": [],
@@ -174,19 +285,23 @@ class ScriptGenerator:
                     "score": result.score,
                     "missing": result.missing,
                 },
-                "structure": {
-                    "acts": package["acts"],
-                    "segments": [{k: v for k, v in segment.items() if k != "rendered"} for segment in package["segments"]],
-                    "headline_blitz": package["headline_blitz"],
-                    "bridge_sentence": package["bridge_sentence"],
-                    "cta": package["cta"],
-                },
+                "structure": self._structure_summary(package),
                 "pacing": package.get("pacing", {}),
-                "tone": {"llm_used": tone_result["llm_used"]},
+                "tone": {"llm_used": any(tone_result["llm_used"] for tone_result in toned)},
+                "voiceover_units": voiceover_units,
             },
         }
         return output
 
+    def _structure_summary(self, package: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "acts": package["acts"],
+            "segments": [{k: v for k, v in segment.items() if k != "rendered"} for segment in package["segments"]],
+            "headline_blitz": package["headline_blitz"],
+            "bridge_sentence": package["bridge_sentence"],
+            "cta": package["cta"],
+        }
+
     def _compose_package(self, analyzed: List[Dict[str, Any]]) -> Dict[str, Any]:
         top_stories = analyzed[:3]
         headline_blitz = self.analyzer.headline_blitz(analyzed, limit=4)
@@ -196,108 +311,240 @@ class ScriptGenerator:
         used_analogies: set[str] = set()
         used_transitions: set[str] = set()
         for idx, story in enumerate(top_stories):
-            analysis = story["analysis"]
-            segment_type = _determine_segment_type(story)
-            template = SEGMENT_TEMPLATES.get(segment_type, SEGMENT_TEMPLATES["news"])
-            keywords = analysis.get("keywords", [])
-            highlight = self._select_highlight(story)
-            topic_phrase = self._topic_label(story, highlight)
-            impact_profile = self._impact_profile(analysis)
-            so_what_text, now_what_text = self._compose_impact_statements(story, highlight, topic_phrase, impact_profile)
-            wow_factor = analysis.get("wow_highlight") or self._compose_wow_from_highlight(
-                highlight,
-                analysis.get("summary_support"),
-                topic_phrase,
+            segments.append(
+                self._compose_segment(idx, story, len(top_stories), used_analogies, used_transitions)
             )
-            analogy_text = self._craft_analogy(story, highlight, used_analogies)
-            wow_score = float(analysis.get("wow_score", 0.0) or 0.0)
-            wow_tag = "wow_surge" if wow_score >= 0.65 else ("wow_warm" if wow_score >= 0.35 else "wow_calm")
-            risk_level = impact_profile["risk_level"]
-            action_tag = {
-                "threat": "action_defensive",
-                "opportunity": "action_offensive",
-                "monitor": "action_monitor",
-            }.get(risk_level, "action_monitor")
-            segment_position_tag = "segment_final" if idx == len(top_stories) - 1 else f"segment_{idx}"
-            transition_tag_candidates = [
-                segment_type,
-                segment_position_tag,
-                impact_profile["tone"],
-                risk_level,
-                wow_tag,
-                action_tag,
-                "closing" if idx == len(top_stories) - 1 else "momentum",
-            ]
-            transition_phrase = self.transitions.pick(transition_tag_candidates, used=used_transitions)
-            used_transitions.add(transition_phrase)
-            rendered = _render_template(template, {
-                "headline": story.get("title", ""),
-                "what": highlight,
-                "so_what": so_what_text,
-                "now_what": now_what_text,
-                "analogy": analogy_text,
-                "wow_factor": wow_factor,
-                "transition": transition_phrase,
-            })
-            segment_words = len(rendered.split())
-            segment_duration = round(segment_words / 155 * 60, 1) if segment_words else 0.0
-            segments.append({
-                "headline": story.get("title", ""),
-                "what": highlight,
-                "so_what": so_what_text,
-                "now_what": now_what_text,
-                "analogy": analogy_text,
-                "wow_factor": wow_factor,
-                "transition": transition_phrase,
-                "keywords": keywords,
-                "segment_type": segment_type,
-                "topic_phrase": topic_phrase,
-                "impact_profile": impact_profile,
-                "estimated_duration": segment_duration,
-                "word_count": segment_words,
-                "rendered": rendered,
-            })
-
-        cta_topic = segments[0]["topic_phrase"] if segments else "AI initiative"
-        cta_payload = self.cta.generate(
-            cta_topic,
-            context=self._build_cta_context(segments[0] if segments else None)
-        )
-
-        total_words = sum(segment["word_count"] for segment in segments)
-        total_duration = round(sum(segment["estimated_duration"] for segment in segments), 1)
-        avg_segment_duration = round(total_duration / max(1, len(segments)), 1)
 
+        cta_payload = self._compose_cta(segments)
         acts = {
             "act1": {
                 "hook": self._compose_opening(headline_blitz),
                 "bridge": bridge_sentence,
             },
-            "act2": {
-                "segments": segments,
-                "body": "",
-                "duration_estimate": total_duration,
-                "word_count": total_words,
-            },
+            "act2": {"segments": segments, "body": ""},
             "act3": {
                 "closing": self._compose_closing(analyzed),
                 "cta": cta_payload,
                 "sign_off": "Stay sharp — JunaidQ AI News",
             },
         }
-
-        return {
+        package = {
             "acts": acts,
             "segments": segments,
             "headline_blitz": headline_blitz,
             "bridge_sentence": bridge_sentence,
             "cta": cta_payload,
-            "pacing": {
-                "total_seconds": total_duration,
-                "average_segment_seconds": avg_segment_duration,
-                "segment_estimates": [segment["estimated_duration"] for segment in segments],
-            },
         }
+        self._refresh_pacing(package)
+        return package
+
+    def _compose_segment(
+        self,
+        idx: int,
+        story: Dict[str, Any],
+        total: int,
+        used_analogies: set[str],
+        used_transitions: set[str],
+    ) -> Dict[str, Any]:
+        analysis = story["analysis"]
+        segment_type = _determine_segment_type(story)
+        keywords = analysis.get("keywords", [])
+        highlight = self._select_highlight(story)
+        topic_phrase = self._topic_label(story, highlight)
+        impact_profile = self._impact_profile(analysis)
+        so_what_text, now_what_text = self._compose_impact_statements(story, highlight, topic_phrase, impact_profile)
+        wow_factor = analysis.get("wow_highlight") or self._compose_wow_from_highlight(
+            highlight,
+            analysis.get("summary_support"),
+            topic_phrase,
+        )
+        analogy_text = self._craft_analogy(story, highlight, used_analogies)
+        wow_score = float(analysis.get("wow_score", 0.0) or 0.0)
+        wow_tag = "wow_surge" if wow_score >= 0.65 else ("wow_warm" if wow_score >= 0.35 else "wow_calm")
+        risk_level = impact_profile["risk_level"]
+        action_tag = {
+            "threat": "action_defensive",
+            "opportunity": "action_offensive",
+            "monitor": "action_monitor",
+        }.get(risk_level, "action_monitor")
+        segment_position_tag = "segment_final" if idx == total - 1 else f"segment_{idx}"
+        transition_tag_candidates = [
+            segment_type,
+            segment_position_tag,
+            impact_profile["tone"],
+            risk_level,
+            wow_tag,
+            action_tag,
+            "closing" if idx == total - 1 else "momentum",
+        ]
+        transition_phrase = self.transitions.pick(transition_tag_candidates, used=used_transitions)
+        used_transitions.add(transition_phrase)
+        segment = {
+            "headline": story.get("title", ""),
+            "what": highlight,
+            "so_what": so_what_text,
+            "now_what": now_what_text,
+            "analogy": analogy_text,
+            "wow_factor": wow_factor,
+            "transition": transition_phrase,
+            "keywords": keywords,
+            "segment_type": segment_type,
+            "topic_phrase": topic_phrase,
+            "impact_profile": impact_profile,
+            "story_index": story.get("_story_index", idx),
+        }
+        self._render_segment(segment)
+        return segment
+
+    def _render_segment(self, segment: Dict[str, Any]) -> None:
+        template = segment_template(segment.get("segment_type", "news"))
+        rendered = _render_template(template, {
+            field: str(segment.get(field) or "")
+            for field in ("headline", "what", "so_what", "now_what", "analogy", "wow_factor", "transition")
+        })
+        segment_words = len(rendered.split())
+        segment["estimated_duration"] = round(segment_words / 155 * 60, 1) if segment_words else 0.0
+        segment["word_count"] = segment_words
+        segment["rendered"] = rendered
+
+    def _compose_cta(self, segments: List[Dict[str, Any]]) -> Dict[str, str]:
+        cta_topic = segments[0].get("topic_phrase") if segments else None
+        return self.cta.generate(
+            cta_topic or "AI initiative",
+            context=self._build_cta_context(segments[0] if segments else None)
+        )
+
+    def _refresh_pacing(self, package: Dict[str, Any]) -> None:
+        segments = package["segments"]
+        total_words = sum(segment["word_count"] for segment in segments)
+        total_duration = round(sum(segment["estimated_duration"] for segment in segments), 1)
+        avg_segment_duration = round(total_duration / max(1, len(segments)), 1)
+        act2 = package["acts"].setdefault("act2", {})
+        act2["segments"] = segments
+        act2["duration_estimate"] = total_duration
+        act2["word_count"] = total_words
+        package["pacing"] = {
+            "total_seconds": total_duration,
+            "average_segment_seconds": avg_segment_duration,
+            "segment_estimates": [segment["estimated_duration"] for segment in segments],
+        }
+
+    # ------------------------------------------------------------------
+    # Incremental regeneration
+    # ------------------------------------------------------------------
+
+    def regenerate_script(
+        self,
+        analyzed: List[Dict[str, Any]],
+        package: Dict[str, Any],
+        missing: List[str],
+    ) -> Dict[str, Any]:
+        """Re-render a failed package, recomposing only the parts named in ``missing``."""
+        if not analyzed:
+            return self._fallback_response()
+        package, regenerated = self.regenerate_package(analyzed, package, missing)
+        result = self.validator.validate(package)
+        output = self._render_output(package, result)
+        output["metadata"]["regenerated"] = regenerated
+        return output
+
+    def regenerate_package(
+        self,
+        analyzed: List[Dict[str, Any]],
+        package: Dict[str, Any],
+        missing: List[str],
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """Recompose the validator-flagged parts of ``package`` and keep the rest.
+
+        ``segment_<n>:<field>`` recomposes segment n, ``pacing:*`` drops or
+        appends whole segments, and headline/bridge/CTA keys refresh only
+        those pieces. Structural failures fall back to a full recompose.
+        """
+        if "acts" in missing or "segments" in missing or not package.get("segments"):
+            return self._compose_package(analyzed), ["all"]
+
+        segments: List[Dict[str, Any]] = list(package["segments"])
+        for segment in segments:
+            if not segment.get("rendered"):
+                self._render_segment(segment)
+        regenerated: List[str] = []
+        stale: set[int] = set()
+        for key in missing:
+            match = re.match(r"segment_(\d+):", key)
+            if match and int(match.group(1)) < len(segments):
+                stale.add(int(match.group(1)))
+
+        for idx in sorted(stale):
+            story = self._story_for_segment(analyzed, segments[idx], idx)
+            if story is None:
+                continue
+            previous = segments[idx]
+            used_analogies = {seg.get("analogy", "") for seg in segments} | {previous.get("analogy", "")}
+            used_transitions = {seg.get("transition", "") for seg in segments}
+            segments[idx] = self._compose_segment(idx, story, len(segments), used_analogies, used_transitions)
+            regenerated.append(f"segment_{idx}")
+
+        if "pacing:over_220s" in missing:
+            while len(segments) > 1 and sum(seg["estimated_duration"] for seg in segments) > 220:
+                segments.pop()
+                regenerated.append(f"drop:segment_{len(segments)}")
+        elif "pacing:under_90s" in missing:
+            used_indices = {seg.get("story_index") for seg in segments}
+            spare = [
+                (idx, story) for idx, story in enumerate(analyzed)
+                if idx not in used_indices and story.get("title") not in {seg.get("headline") for seg in segments}
+            ]
+            used_analogies = {seg.get("analogy", "") for seg in segments}
+            used_transitions = {seg.get("transition", "") for seg in segments}
+            for story_index, story in spare:
+                if sum(seg["estimated_duration"] for seg in segments) >= 90:
+                    break
+                idx = len(segments)
+                segments.append(
+                    self._compose_segment(idx, {**story, "_story_index": story_index}, idx + 1, used_analogies, used_transitions)
+                )
+                regenerated.append(f"add:segment_{idx}")
+
+        package = {**package, "segments": segments, "acts": dict(package.get("acts") or {})}
+        acts = package["acts"]
+        if "headline_blitz" in missing or "act:act1" in missing:
+            package["headline_blitz"] = self.analyzer.headline_blitz(analyzed, limit=4)
+            regenerated.append("headline_blitz")
+        if "bridge_sentence" in missing or "act:act1" in missing:
+            package["bridge_sentence"] = self.analyzer.build_bridge(analyzed)
+            regenerated.append("bridge_sentence")
+        if {"headline_blitz", "bridge_sentence", "act:act1"} & set(missing):
+            acts["act1"] = {
+                "hook": self._compose_opening(package["headline_blitz"]),
+                "bridge": package["bridge_sentence"],
+            }
+        if "cta" in missing or "act:act3" in missing or 0 in stale:
+            package["cta"] = self._compose_cta(segments)
+            regenerated.append("cta")
+        act3 = dict(acts.get("act3") or {})
+        if "act:act3" in missing or not act3.get("closing"):
+            act3["closing"] = self._compose_closing(analyzed)
+            act3.setdefault("sign_off", "Stay sharp — JunaidQ AI News")
+        act3["cta"] = package["cta"]
+        acts["act3"] = act3
+        acts["act2"] = {**(acts.get("act2") or {}), "body": ""}
+        self._refresh_pacing(package)
+        return package, regenerated
+
+    def _story_for_segment(
+        self,
+        analyzed: List[Dict[str, Any]],
+        segment: Dict[str, Any],
+        idx: int,
+    ) -> Optional[Dict[str, Any]]:
+        story_index = segment.get("story_index")
+        if isinstance(story_index, int) and 0 <= story_index < len(analyzed):
+            return {**analyzed[story_index], "_story_index": story_index}
+        headline = segment.get("headline")
+        for position, story in enumerate(analyzed):
+            if story.get("title") == headline:
+                return {**story, "_story_index": position}
+        return analyzed[idx] if idx < len(analyzed) else None
 
     def _select_highlight(self, story: Dict[str, Any]) -> str:
         analysis = story.get("analysis", {})
@@ -448,7 +695,7 @@ class ScriptGenerator:
             f"that's the signal exec teams will brief under {normalized}.",
             f"that's why {normalized} just jumped on the board docket.",
         ]
-        index = abs(hash(normalized)) % len(variants)
+        index = _stable_hash(normalized) % len(variants)
         return variants[index]
 
     def _craft_analogy(self, story: Dict[str, Any], highlight: str, used: set[str]) -> str:
@@ -529,7 +776,7 @@ class ScriptGenerator:
 
         for triggers, phrases in palette:
             if any(term in theme_text for term in triggers):
-                for phrase in phrases:
+                for phrase in self._rotate(phrases):
                     if phrase not in used:
                         return phrase
 
@@ -541,7 +788,7 @@ class ScriptGenerator:
             "It's the pit-stop where the {} machine gets rebuilt before the race restarts.",
         ]
         for offset in range(len(templates)):
-            idx = (abs(hash(focus_fragment)) + offset) % len(templates)
+            idx = (_stable_hash(focus_fragment) + offset) % len(templates)
             candidate = templates[idx].format(focus_fragment)
             if candidate not in used:
                 return candidate
@@ -549,6 +796,13 @@ class ScriptGenerator:
         # Deterministic final fallback ensures we always return a phrase.
         return "It's the brief from the war room telling you the map just changed."
 
+    def _rotate(self, options: List[str]) -> List[str]:
+        """Keep library order unless seeded, so candidates explore different analogies."""
+        if self.seed is None or not options:
+            return options
+        offset = self._rng.randrange(len(options))
+        return options[offset:] + options[:offset]
+
     def _analogy_focus(self, highlight: str) -> str:
         cleaned = re.sub(r"[^a-zA-Z0-9%$\s]", "", highlight).strip()
         if not cleaned:
@@ -614,15 +868,17 @@ class ScriptGenerator:
         try:
             client = OpenAI(api_key=api_key)
             try:
-                response = client.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {"role": "system", "content": "You craft sharp, vivid analogies for executive briefings."},
-                        {"role": "user", "content": prompt},
-                    ],
-                    max_tokens=80,
-                    temperature=0.7,
-                )
+                with span("llm_call", purpose="analogy", model=model), track_llm_call("analogy", model) as call:
+                    response = client.chat.completions.create(
+                        model=model,
+                        messages=[
+                            {"role": "system", "content": "You craft sharp, vivid analogies for executive briefings."},
+                            {"role": "user", "content": prompt},
+                        ],
+                        max_tokens=80,
+                        temperature=0.7,
+                    )
+                    call.usage(getattr(response, "usage", None))
                 message = response.choices[0].message
                 text_content = message.get("content", "") if isinstance(message, dict) else getattr(message, "content", "")
                 if isinstance(text_content, list):
@@ -717,7 +973,7 @@ class ScriptGenerator:
             "estimated_duration": 0.0,
             "word_count": 0,
         }
-        template = SEGMENT_TEMPLATES["news"]
+        template = segment_template("news")
         render_values = {}
         for key, value in basic_segment.items():
             if key in {"keywords", "segment_type", "estimated_duration", "word_count"}:
@@ -4,7 +4,7 @@ import math
 import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 # Keywords tuned for executive-facing AI news
 _SHOCK_TERMS = {
@@ -150,37 +150,37 @@ class StoryAnalyzer:
     def analyze(self, stories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         enriched: List[Dict[str, Any]] = []
         for story in stories:
-            text_fields = [str(story.get(field, "")) for field in ("summary", "full_text") if story.get(field)]
-            joined_text = " ".join(text_fields).strip()
-            combined_text = joined_text or str(story.get("title", ""))
-            text = combined_text
-            metrics = self._score_story(story)
-            wow = self._wow.compute(text)
-            keywords = self._extract_keywords(text)
-            summary_primary, summary_support = self._summarize_for_wow(
-                title=str(story.get("title", "")),
-                text=combined_text,
-                keywords=keywords,
-                wow_terms=wow
-            )
-            analogy = self._analogy.suggest(text, keywords)
-            enriched_story = {
-                **story,
-                "analysis": {
-                    "scores": metrics.__dict__,
-                    "keywords": keywords,
-                    "analogy": analogy,
-                    "wow_highlight": wow["wow_highlight"],
-                    "wow_score": wow["wow_score"],
-                    "technical_complexity": metrics.technical_complexity >= 0.5,
-                    "summary_highlight": summary_primary,
-                    "summary_support": summary_support,
-                }
-            }
-            enriched.append(enriched_story)
+            enriched.append({**story, "analysis": self.analyze_story(story)})
         enriched.sort(key=lambda s: s["analysis"]["scores"]["composite"], reverse=True)
         return enriched
 
+    def analyze_story(self, story: Mapping[str, Any]) -> Dict[str, Any]:
+        """Return the analysis block for one story without copying the story."""
+        text_fields = [str(story.get(field, "")) for field in ("summary", "full_text") if story.get(field)]
+        joined_text = " ".join(text_fields).strip()
+        combined_text = joined_text or str(story.get("title", ""))
+        text = combined_text
+        metrics = self._score_story(story)
+        wow = self._wow.compute(text)
+        keywords = self._extract_keywords(text)
+        summary_primary, summary_support = self._summarize_for_wow(
+            title=str(story.get("title", "")),
+            text=combined_text,
+            keywords=keywords,
+            wow_terms=wow
+        )
+        analogy = self._analogy.suggest(text, keywords)
+        return {
+            "scores": metrics.__dict__,
+            "keywords": keywords,
+            "analogy": analogy,
+            "wow_highlight": wow["wow_highlight"],
+            "wow_score": wow["wow_score"],
+            "technical_complexity": metrics.technical_complexity >= 0.5,
+            "summary_highlight": summary_primary,
+            "summary_support": summary_support,
+        }
+
     def headline_blitz(self, analyzed: List[Dict[str, Any]], limit: int = 4) -> List[str]:
         return [item.get("title", "").strip() for item in analyzed[:limit] if item.get("title")]
 
@@ -199,7 +199,7 @@ class StoryAnalyzer:
             return f"{topics[0].title()} meeting {topics[1]} is the collision shaping Q3 playbooks."
         return f"{topics[0].title()}, {topics[1]}, and {topics[2]} signal the same thing: operators need a plan before the next earnings call."
 
-    def _score_story(self, story: Dict[str, Any]) -> StoryScores:
+    def _score_story(self, story: Mapping[str, Any]) -> StoryScores:
         text = " ".join(
             str(story.get(field, ""))
             for field in ("title", "summary", "full_text")
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import os
 import re
-from typing import Dict
+from dataclasses import dataclass
+from typing import Callable, Dict, Mapping, Optional, Sequence, Union
 
 import httpx
 
 from ..config import settings
+from ..utils.metrics import track_llm_call
+from ..utils.tracing import span
 
 _WEAK_VERBS = {
     "is": "drives",
@@ -23,13 +26,91 @@ _WEAK_VERBS = {
     "made": "forced",
 }
 _PASSIVE_PATTERN = re.compile(r"\b(is|are|was|were|be|been)\s+(?:being\s+)?(\w+ed)\b", re.IGNORECASE)
+_SENTENCE_GAP = re.compile(r"(?<=[.!?])\s+")
+
+Replacement = Union[str, Callable[[Sequence[Optional[str]]], str]]
+
+
+@dataclass(frozen=True)
+class ToneRule:
+    """One rewrite rule: a regex fragment plus a literal or callable replacement.
+
+    Callables receive the rule's own groups, ``groups[0]`` being the whole match.
+    """
+
+    name: str
+    pattern: str
+    replacement: Replacement
+    flags: int = 0
+
+    @classmethod
+    def from_table(cls, name: str, table: Mapping[str, str], flags: int = 0) -> "ToneRule":
+        """Build a word-lookup rule matching any key of ``table`` as a whole word."""
+        alternation = "|".join(re.escape(word) for word in sorted(table, key=len, reverse=True))
+        lookup = dict(table)
+        if flags & re.IGNORECASE:
+            lookup = {word.lower(): value for word, value in table.items()}
+            return cls(name, rf"\b(?:{alternation})\b", lambda groups: lookup[groups[0].lower()], flags)
+        return cls(name, rf"\b(?:{alternation})\b", lambda groups: lookup[groups[0]], flags)
+
+
+class ToneRuleEngine:
+    """Compile a rule table into one alternation regex applied in a single pass.
+
+    Earlier rules win when several could match at the same position.
+    """
+
+    def __init__(self, rules: Sequence[ToneRule]) -> None:
+        self.rules = tuple(rules)
+        parts = []
+        self._spans: Dict[str, tuple[int, int, ToneRule]] = {}
+        group_index = 1
+        for idx, rule in enumerate(self.rules):
+            inner_groups = re.compile(rule.pattern, rule.flags).groups
+            key = f"rule{idx}"
+            self._spans[key] = (group_index, group_index + inner_groups + 1, rule)
+            parts.append(f"(?P<{key}>{self._scoped(rule.pattern, rule.flags)})")
+            group_index += inner_groups + 1
+        self._regex = re.compile("|".join(parts)) if parts else None
+
+    @staticmethod
+    def _scoped(pattern: str, flags: int) -> str:
+        inline = "".join(letter for flag, letter in ((re.IGNORECASE, "i"), (re.DOTALL, "s"), (re.MULTILINE, "m")) if flags & flag)
+        return f"(?{inline}:{pattern})" if inline else pattern
+
+    def apply(self, text: str) -> str:
+        if self._regex is None:
+            return text
+        return self._regex.sub(self._dispatch, text)
+
+    def _dispatch(self, match: re.Match[str]) -> str:
+        start, stop, rule = self._spans[match.lastgroup]
+        if isinstance(rule.replacement, str):
+            return rule.replacement
+        return rule.replacement(match.groups()[start - 1:stop - 1])
+
+
+DEFAULT_RULES: tuple[ToneRule, ...] = (
+    # Drop filler sentence openers ("There are...", "Here is...").
+    ToneRule("filler_opener", r"(?:^|(?<=[.!?] ))(?:there|here)\s+(?=\S)", "", re.IGNORECASE),
+    ToneRule("passive_voice", _PASSIVE_PATTERN.pattern, lambda groups: groups[2].capitalize(), re.IGNORECASE),
+    ToneRule.from_table("weak_verbs", _WEAK_VERBS),
+)
 
 
 class ToneEnhancer:
     """Apply rule-based tone adjustments with optional LLM polish."""
 
-    def __init__(self, enable_llm: bool = False) -> None:
+    _default_engine: Optional[ToneRuleEngine] = None
+
+    def __init__(self, enable_llm: bool = False, rules: Optional[Sequence[ToneRule]] = None) -> None:
         self.enable_llm = enable_llm and bool(settings.OPENAI_API_KEY)
+        if rules is None:
+            if ToneEnhancer._default_engine is None:
+                ToneEnhancer._default_engine = ToneRuleEngine(DEFAULT_RULES)
+            self._engine = ToneEnhancer._default_engine
+        else:
+            self._engine = ToneRuleEngine(rules)
 
     def enhance(self, text: str) -> Dict[str, str]:
         adjusted = self._apply_rules(text)
@@ -43,23 +124,8 @@ class ToneEnhancer:
         return {"text": final_text, "llm_used": llm_used}
 
     def _apply_rules(self, text: str) -> str:
-        def replace_passive(match: re.Match[str]) -> str:
-            verb = match.group(2)
-            return f"{verb.capitalize()}"
-
-        sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
-        rewrites = []
-        for sentence in sentences:
-            revised = _PASSIVE_PATTERN.sub(replace_passive, sentence)
-            words = revised.split()
-            if words:
-                first = words[0].lower()
-                if first in {"there", "here"} and len(words) > 1:
-                    revised = " ".join(words[1:])
-            for weak, strong in _WEAK_VERBS.items():
-                revised = re.sub(rf"\b{weak}\b", strong, revised)
-            rewrites.append(revised)
-        return " ".join(rewrites)
+        normalised = _SENTENCE_GAP.sub(" ", text.strip())
+        return self._engine.apply(normalised)
 
     def _llm_pass(self, text: str) -> str:
         payload = {
@@ -74,16 +140,19 @@ class ToneEnhancer:
             "temperature": 0.3
         }
         try:
-            with httpx.Client(timeout=30) as client:
+            with span("llm_call", purpose="tone", model=payload["model"]), \
+                    track_llm_call("tone", payload["model"]) as call, httpx.Client(timeout=30) as client:
                 response = client.post(
-                    "https://api.openai.com/v1/chat/completions",
+                    f"{settings.OPENAI_BASE_URL.rstrip('/')}/chat/completions",
                     headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"},
                     json=payload,
                 )
                 response.raise_for_status()
-                return response.json()["choices"][0]["message"]["content"].strip()
+                body = response.json()
+                call.usage(body.get("usage"))
+                return body["choices"][0]["message"]["content"].strip()
         except Exception:
             return text
 
 
-__all__ = ["ToneEnhancer"]
+__all__ = ["ToneEnhancer", "ToneRule", "ToneRuleEngine", "DEFAULT_RULES"]
@@ -2,44 +2,75 @@ from __future__ import annotations
 
 import json
 import random
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 TEMPLATE_PATH = Path(__file__).resolve().parents[2] / "templates" / "transition_phrases.json"
 
 
+def _entry_tags(entry: dict) -> List[str]:
+    tags = entry.get("tags")
+    if isinstance(tags, list):
+        return [str(tag) for tag in tags if tag]
+    tag = entry.get("tag")
+    return [str(tag)] if tag else []
+
+
+@lru_cache(maxsize=None)
+def _load_library(path: Path) -> Tuple[Tuple[str, ...], Dict[str, Tuple[int, ...]], Dict[str, int]]:
+    """Index the phrase library once per path into tag -> sorted phrase-id tuples."""
+    with open(path, "r", encoding="utf-8") as handle:
+        entries = json.load(handle)
+
+    phrases: List[str] = []
+    phrase_ids: Dict[str, int] = {}
+    tag_index: Dict[str, set[int]] = {}
+    for entry in entries:
+        phrase = entry.get("phrase")
+        if not phrase:
+            continue
+        phrase_id = phrase_ids.get(phrase)
+        if phrase_id is None:
+            phrase_id = len(phrases)
+            phrase_ids[phrase] = phrase_id
+            phrases.append(phrase)
+        for tag in _entry_tags(entry):
+            tag_index.setdefault(tag, set()).add(phrase_id)
+
+    ordered = {tag: tuple(sorted(ids)) for tag, ids in tag_index.items()}
+    return tuple(phrases), ordered, phrase_ids
+
+
 class TransitionGenerator:
     """Serve energetic transition phrases from the library."""
 
-    def __init__(self) -> None:
-        with open(TEMPLATE_PATH, "r", encoding="utf-8") as handle:
-            self._phrases = json.load(handle)
+    def __init__(self, *, seed: Optional[int] = None, path: Path = TEMPLATE_PATH) -> None:
+        self._phrases, self._tag_index, self._phrase_ids = _load_library(Path(path))
+        self._all_ids = tuple(range(len(self._phrases)))
+        # Sorted candidate ids per tag combination, so picks only filter out used ids
+        self._candidates: Dict[Tuple[str, ...], Tuple[int, ...]] = {}
+        self._rng = random.Random(seed)
+
+    def reseed(self, seed: Optional[int]) -> None:
+        self._rng.seed(seed)
 
     def pick(self, tag_candidates: List[str], used: Optional[Iterable[str]] = None) -> str:
-        used_set = set(used or [])
-        candidate_set = {tag for tag in tag_candidates if tag}
-
-        def entry_tags(entry: dict) -> List[str]:
-            tags = entry.get("tags")
-            if isinstance(tags, list):
-                return [str(tag) for tag in tags if tag]
-            tag = entry.get("tag")
-            return [str(tag)] if tag else []
-
-        available: List[str] = []
-        for entry in self._phrases:
-            tags = entry_tags(entry)
-            if not tags:
-                continue
-            if candidate_set & set(tags):
-                available.append(entry["phrase"])
-
-        if not available:
-            available = [p["phrase"] for p in self._phrases]
-
-        remaining = [phrase for phrase in available if phrase not in used_set]
-        choices = remaining or available
-        return random.choice(choices)
+        available = self._candidate_ids(tuple(tag for tag in tag_candidates if tag))
+        used_ids = {self._phrase_ids[phrase] for phrase in used or () if phrase in self._phrase_ids}
+        remaining = [phrase_id for phrase_id in available if phrase_id not in used_ids] if used_ids else available
+        return self._phrases[self._rng.choice(remaining or available)]
+
+    def _candidate_ids(self, tags: Tuple[str, ...]) -> Tuple[int, ...]:
+        cached = self._candidates.get(tags)
+        if cached is None:
+            if len(tags) == 1:
+                cached = self._tag_index.get(tags[0], ())
+            else:
+                cached = tuple(sorted({phrase_id for tag in tags for phrase_id in self._tag_index.get(tag, ())}))
+            cached = cached or self._all_ids
+            self._candidates[tags] = cached
+        return cached
 
 
 __all__ = ["TransitionGenerator"]
@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 import threading
 from collections import ChainMap
+from collections.abc import Mapping
 from pathlib import Path
 from typing import Any, Dict, Iterator, Optional
 
@@ -18,6 +19,12 @@ from langgraph.checkpoint.base import (
 from langchain_core.runnables.config import RunnableConfig
 
 from src.config import settings
+from src.utils.metrics import counter, histogram
+
+CHECKPOINT_WRITE_SECONDS = histogram(
+    "pipeline_checkpoint_write_seconds", "Checkpoint read-modify-write time", ("workflow", "op")
+)
+CHECKPOINT_WRITE_BYTES = counter("pipeline_checkpoint_write_bytes_total", "Bytes written to checkpoint files", ("workflow",))
 
 
 def _thread_id_from_config(config: RunnableConfig) -> str:
@@ -55,7 +62,7 @@ class FileCheckpointSaver(BaseCheckpointSaver):
             return merged
         if hasattr(value, "model_dump"):
             return self._jsonify(value.model_dump())
-        if isinstance(value, dict):
+        if isinstance(value, Mapping):  # dicts and mapping records such as StoryRecord
             return {k: self._jsonify(v) for k, v in value.items()}
         if isinstance(value, list):
             return [self._jsonify(v) for v in value]
@@ -125,7 +132,7 @@ class FileCheckpointSaver(BaseCheckpointSaver):
     ) -> RunnableConfig:
         thread_id = _thread_id_from_config(config)
         checkpoint_id = checkpoint["id"]
-        with self._lock:
+        with self._lock, CHECKPOINT_WRITE_SECONDS.time(workflow=self.directory.name, op="put"):
             data = self._load_thread(thread_id)
             entry = {
                 "config": self._jsonify(self._sanitise_config(config)),
@@ -148,7 +155,7 @@ class FileCheckpointSaver(BaseCheckpointSaver):
         task_path: str = "",
     ) -> None:
         thread_id = _thread_id_from_config(config)
-        with self._lock:
+        with self._lock, CHECKPOINT_WRITE_SECONDS.time(workflow=self.directory.name, op="put_writes"):
             data = self._load_thread(thread_id)
             if not data["checkpoints"]:
                 return
@@ -219,7 +226,9 @@ class FileCheckpointSaver(BaseCheckpointSaver):
 
     def _save_thread(self, thread_id: str, data: Dict[str, Any]) -> None:
         path = self._thread_path(thread_id)
-        path.write_bytes(self.serde.dumps(data))
+        payload = self.serde.dumps(data)
+        path.write_bytes(payload)
+        CHECKPOINT_WRITE_BYTES.inc(len(payload), workflow=self.directory.name)
 
     def _sanitise_config(self, config: RunnableConfig) -> RunnableConfig:
         cfg = dict(config)
@@ -0,0 +1,180 @@
+"""Live per-node progress events for pipeline runs.
+
+``stream_graph`` drives a compiled graph with ``astream`` and publishes a
+``node_start``/``node_finish`` pair for every task into a ``RunEventLog``: a
+bounded ring buffer that any number of async readers can follow, even when the
+run executes on another thread's event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+from langchain_core.runnables.config import RunnableConfig
+
+DEFAULT_BUFFER_SIZE = 512
+DEFAULT_MAX_RUNS = 100
+
+
+class RunEventLog:
+    """Ring buffer of events for one run, numbered by ``seq`` from 1."""
+
+    def __init__(self, run_id: str, maxlen: int = DEFAULT_BUFFER_SIZE) -> None:
+        self.run_id = run_id
+        self.closed = False
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=maxlen)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    def publish(self, kind: str, **data: Any) -> Dict[str, Any]:
+        with self._lock:
+            self._seq += 1
+            event = {"seq": self._seq, "ts": time.time(), "run_id": self.run_id, "kind": kind, **data}
+            self._events.append(event)
+        self._wake()
+        return event
+
+    def close(self) -> None:
+        self.closed = True
+        self._wake()
+
+    def since(self, seq: int = 0) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [event for event in self._events if event["seq"] > seq]
+
+    def last(self, kind: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for event in reversed(self._events):
+                if kind is None or event["kind"] == kind:
+                    return event
+        return None
+
+    async def follow(self, after: int = 0, heartbeat: Optional[float] = None) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Yield buffered then live events until the run closes; ``None`` every ``heartbeat`` idle seconds."""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            self._waiters.add(waiter)
+        try:
+            while True:
+                waiter[1].clear()
+                for event in self.since(after):
+                    after = event["seq"]
+                    yield event
+                if self.closed and not self.since(after):
+                    return
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+    def _wake(self) -> None:
+        with self._lock:
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:  # reader's loop already closed
+                pass
+
+
+class EventHub:
+    """Event logs by run id; the oldest closed runs are dropped past ``max_runs``."""
+
+    def __init__(self, max_runs: int = DEFAULT_MAX_RUNS, buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        self.max_runs = max_runs
+        self.buffer_size = buffer_size
+        self._runs: "OrderedDict[str, RunEventLog]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, run_id: str) -> RunEventLog:
+        """The live log for ``run_id``, or a fresh one if it is unknown or closed."""
+        with self._lock:
+            log = self._runs.get(run_id)
+            if log is None or log.closed:
+                log = RunEventLog(run_id, maxlen=self.buffer_size)
+                self._runs[run_id] = log
+            self._runs.move_to_end(run_id)
+            closed = [key for key, item in self._runs.items() if item.closed]
+            for key in closed[: max(0, len(self._runs) - self.max_runs)]:
+                del self._runs[key]
+            return log
+
+    def get(self, run_id: str) -> Optional[RunEventLog]:
+        with self._lock:
+            return self._runs.get(run_id)
+
+    def latest(self) -> Optional[RunEventLog]:
+        with self._lock:
+            return next(reversed(self._runs.values()), None)
+
+
+@contextmanager
+def track_run(events: Optional[RunEventLog], **attrs: Any) -> Iterator[None]:
+    """Bracket a run with ``run_start`` and ``run_failed`` events, closing the log afterwards."""
+    if events is None:
+        yield
+        return
+    events.publish("run_start", **attrs)
+    try:
+        yield
+    except Exception as exc:
+        events.publish("run_failed", error=f"{type(exc).__name__}: {exc}")
+        raise
+    finally:
+        events.close()
+
+
+def _node_span(result: Any, node: str) -> Optional[Dict[str, Any]]:
+    diagnostics = dict(result or []).get("diagnostics")
+    for item in reversed(getattr(diagnostics, "spans", None) or []):
+        if item.get("name") == node and item.get("parent") is None:
+            return item
+    return None
+
+
+def _counts(result: Any) -> Dict[str, int]:
+    return {key: len(value) for key, value in (result or []) if key.endswith("stories") and isinstance(value, list)}
+
+
+async def stream_graph(
+    graph: Any, state: Any, config: RunnableConfig, events: RunEventLog, *, graph_name: str
+) -> Dict[str, Any]:
+    """Run ``graph`` like ``ainvoke`` while publishing node start/finish events."""
+    started: Dict[str, float] = {}
+    final: Dict[str, Any] = {}
+    events.publish("graph_start", graph=graph_name)
+    graph_started = time.perf_counter()
+    async for mode, chunk in graph.astream(state, config=config, stream_mode=["tasks", "values"]):
+        if mode == "values":
+            final = chunk
+        elif "input" in chunk:
+            started[chunk["id"]] = time.perf_counter()
+            events.publish("node_start", graph=graph_name, node=chunk["name"], task_id=chunk["id"])
+        else:
+            elapsed = (time.perf_counter() - started.pop(chunk["id"], time.perf_counter())) * 1000
+            node_span = _node_span(chunk.get("result"), chunk["name"]) or {}
+            events.publish(
+                "node_finish",
+                graph=graph_name,
+                node=chunk["name"],
+                task_id=chunk["id"],
+                wall_ms=node_span.get("wall_ms", round(elapsed, 3)),
+                cpu_ms=node_span.get("cpu_ms"),
+                items=node_span.get("items"),
+                counts=_counts(chunk.get("result")),
+                error=repr(chunk["error"]) if chunk.get("error") else None,
+            )
+    events.publish("graph_finish", graph=graph_name, wall_ms=round((time.perf_counter() - graph_started) * 1000, 3))
+    return final
+
+
+__all__ = ["EventHub", "RunEventLog", "stream_graph", "track_run"]
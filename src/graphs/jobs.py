@@ -0,0 +1,171 @@
+"""Background job runner for pipeline runs started over HTTP."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Coroutine factory run for each job; receives the job params plus ``thread_id``
+# and ``enrich_executor`` and returns a JSON-serialisable result.
+JobTarget = Callable[..., Awaitable[Any]]
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when the runner already holds ``max_pending`` unfinished jobs."""
+
+
+@dataclass
+class Job:
+    id: str
+    thread_id: str
+    params: Dict[str, Any]
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self, include_result: bool = False) -> Dict[str, Any]:
+        payload = {
+            "job_id": self.id,
+            "thread_id": self.thread_id,
+            "status": self.status,
+            "params": self.params,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_s": round(self.finished_at - self.started_at, 3) if self.finished_at and self.started_at else None,
+            "error": self.error,
+        }
+        if include_result:
+            payload["result"] = self.result
+        return payload
+
+
+class JobRunner:
+    """Run pipeline jobs on a bounded pool of worker threads.
+
+    Each worker drives its job on a private event loop, so blocking nodes never
+    stall the caller's loop (the HTTP server) or each other. CPU-bound story
+    enrichment is handed to a shared process pool through ``enrich_executor``.
+    Finished jobs are kept in memory up to ``max_history``.
+    """
+
+    def __init__(
+        self,
+        target: JobTarget,
+        *,
+        max_workers: int = 2,
+        max_pending: int = 16,
+        enrich_processes: Optional[int] = 2,
+        max_history: int = 200,
+    ) -> None:
+        self.target = target
+        self.max_pending = max_pending
+        self.max_history = max_history
+        self._threads = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline-job")
+        self._enrich_processes = enrich_processes
+        self._processes: Optional[Executor] = None
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, params: Dict[str, Any], thread_id: Optional[str] = None) -> Job:
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if not job.done)
+            if pending >= self.max_pending:
+                raise JobQueueFull(f"{pending} jobs already queued or running")
+            job = Job(id=uuid.uuid4().hex, thread_id=thread_id or str(uuid.uuid4()), params=dict(params))
+            self._jobs[job.id] = job
+            self._prune()
+        self._threads.submit(self._execute, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None, poll: float = 0.05) -> Job:
+        """Await a job from async code without blocking the loop."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None:
+                raise KeyError(job_id)
+            if job.done:
+                return job
+            if deadline is not None and time.monotonic() > deadline:
+                raise asyncio.TimeoutError(job_id)
+            await asyncio.sleep(poll)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._threads.shutdown(wait=wait, cancel_futures=not wait)
+        if self._processes is not None:
+            self._processes.shutdown(wait=wait, cancel_futures=not wait)
+            self._processes = None
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _enrich_executor(self) -> Optional[Executor]:
+        if not self._enrich_processes:
+            return None
+        with self._lock:
+            if self._processes is None:
+                # spawn: forking a process that already runs worker threads is unsafe
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self._enrich_processes, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._processes
+
+    def _execute(self, job: Job) -> None:
+        job.status, job.started_at = RUNNING, time.time()
+        try:
+            job.result = asyncio.run(
+                self.target(**job.params, thread_id=job.thread_id, enrich_executor=self._enrich_executor())
+            )
+            status = SUCCEEDED
+        except Exception as exc:
+            # The traceback stays in the server log; clients only see the error line
+            logger.exception("Job %s (thread %s) failed", job.id, job.thread_id)
+            job.error = f"{type(exc).__name__}: {exc}"
+            status = FAILED
+        # finished_at first: readers treat the status flip as "done"
+        job.finished_at = time.time()
+        job.status = status
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(self._jobs) - self.max_history)]:
+            del self._jobs[job_id]
+
+
+__all__ = ["FAILED", "Job", "JobQueueFull", "JobRunner", "QUEUED", "RUNNING", "SUCCEEDED"]
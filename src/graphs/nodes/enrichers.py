@@ -2,17 +2,44 @@
 
 from __future__ import annotations
 
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.runnables.config import RunnableConfig
+
 from src.editorial.story_analyzer import StoryAnalyzer
 from src.graphs.state import ResearchState
-from src.models import StoryEnriched
+from src.models import PipelineDiagnostics, StoryRecord
+
+# Stories per task when analysis is offloaded to a process pool
+ENRICH_CHUNK_SIZE = 64
 
 
-def enrich_stories(state: ResearchState) -> ResearchState:
+def analyze_batch(stories: Sequence[StoryRecord]) -> List[Dict[str, Any]]:
+    """Analysis blocks for a batch of stories (module level so process pools can pickle it)."""
+    analyzer = StoryAnalyzer()
+    return [analyzer.analyze_story(story) for story in stories]
+
+
+def _analyze_all(stories: List[StoryRecord], executor: Optional[Executor]) -> List[Dict[str, Any]]:
+    if executor is None or len(stories) <= ENRICH_CHUNK_SIZE:
+        return analyze_batch(stories)
+    chunks = [stories[idx : idx + ENRICH_CHUNK_SIZE] for idx in range(0, len(stories), ENRICH_CHUNK_SIZE)]
+    return [analysis for batch in executor.map(analyze_batch, chunks) for analysis in batch]
+
+
+@PipelineDiagnostics.traced("enrich", items=lambda state: len(state.enriched_stories))
+def enrich_stories(state: ResearchState, config: Optional[RunnableConfig] = None) -> ResearchState:
+    """Analyze every raw story; ``configurable.enrich_executor`` offloads the work to a pool."""
     if not state.raw_stories:
         return state
-    analyzer = StoryAnalyzer()
-    payload = [story.model_dump() for story in state.raw_stories]
-    analyzed = analyzer.analyze(payload)
-    state.enriched_stories = [StoryEnriched.model_validate(item) for item in analyzed]
+    executor = ((config or {}).get("configurable") or {}).get("enrich_executor")
+    for story, analysis in zip(state.raw_stories, _analyze_all(state.raw_stories, executor)):
+        story.analysis = analysis
+    state.enriched_stories = sorted(
+        state.raw_stories,
+        key=lambda story: story.analysis["scores"]["composite"],
+        reverse=True,
+    )
     state.diagnostics.record("info", "enriched_stories", count=len(state.enriched_stories))
     return state
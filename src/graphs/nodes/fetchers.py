@@ -9,13 +9,16 @@ from src.ingest.rss_arxiv import fetch_rss_async
 from src.ingest.simple_sheets_manager import SimpleSheetsManager
 from src.ingest.youtube_trending import YouTubeTrendingTracker
 from src.ingest.youtube_trending_simple import get_trending_keywords_simple
+from src.models import PipelineDiagnostics
 
 
+@PipelineDiagnostics.traced("load_metadata", items=lambda state: len(state.sources))
 async def load_sheet_metadata(state: ResearchState) -> ResearchState:
     manager = SimpleSheetsManager()
-    sources = await manager.aget_sources()
-    companies = await manager.aget_companies()
-    weights = await manager.aget_scoring_weights()
+    with state.diagnostics.span("sheets"):
+        sources = await manager.aget_sources()
+        companies = await manager.aget_companies()
+        weights = await manager.aget_scoring_weights()
 
     state.sources = sources
     state.companies = companies
@@ -62,10 +65,12 @@ async def load_sheet_metadata(state: ResearchState) -> ResearchState:
     return state
 
 
+@PipelineDiagnostics.traced("fetch_feeds", items=lambda state: len(state.raw_stories))
 async def fetch_story_feeds(state: ResearchState) -> ResearchState:
     if not state.sources:
         return state
-    articles = await fetch_rss_async(state.sources, max_items=10)
+    max_items = int(state.metadata.get("max_items_per_source", 10))
+    articles = await fetch_rss_async(state.sources, max_items=max_items)
     state.raw_stories = articles
     state.diagnostics.record(
         "info",
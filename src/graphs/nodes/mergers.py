@@ -5,9 +5,11 @@ from __future__ import annotations
 from typing import Dict
 
 from src.graphs.state import ResearchState
+from src.models import PipelineDiagnostics
 from src.utils import content_fingerprint
 
 
+@PipelineDiagnostics.traced("merge", items=lambda state: len(state.raw_stories))
 def merge_and_dedupe(state: ResearchState) -> ResearchState:
     seen: Dict[str, int] = {}
     unique = []
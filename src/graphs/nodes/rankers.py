@@ -5,7 +5,8 @@ from __future__ import annotations
 from typing import Dict, List
 
 from src.graphs.state import ResearchState
-from src.rank.select import score as score_enriched_story
+from src.models import PipelineDiagnostics
+from src.rank.select import score_record
 
 
 def _apply_trending_boosts(stories: List, trending: Dict[str, float]) -> None:
@@ -19,11 +20,12 @@ def _apply_trending_boosts(stories: List, trending: Dict[str, float]) -> None:
                 story.boosts.setdefault(f"trend:{keyword}", bonus)
 
 
+@PipelineDiagnostics.traced("score", items=lambda state: len(state.scored_stories))
 def score_stories(state: ResearchState) -> ResearchState:
     if not state.enriched_stories:
         return state
     weight_overrides = state.metadata.get("rank_weights") if isinstance(state.metadata, dict) else None
-    scored = [score_enriched_story(story, weight_overrides) for story in state.enriched_stories]
+    scored = [score_record(story, weight_overrides) for story in state.enriched_stories]
     _apply_trending_boosts(scored, state.trending_keywords)
     scored.sort(key=lambda item: item.score, reverse=True)
     state.scored_stories = scored
@@ -31,6 +33,7 @@ def score_stories(state: ResearchState) -> ResearchState:
     return state
 
 
+@PipelineDiagnostics.traced("select", items=lambda state: len(state.selected_stories))
 def select_top_stories(state: ResearchState) -> ResearchState:
     if not state.scored_stories:
         return state
@@ -2,26 +2,49 @@
 
 from __future__ import annotations
 
-from src.editorial.script_adapter import draft_to_legacy, generate_script_draft
+from src.editorial.script_adapter import (
+    analyze_stories,
+    draft_to_legacy,
+    generate_script_draft,
+    regenerate_script_draft,
+)
 from src.graphs.state import ScriptState
+from src.models import PipelineDiagnostics
 
 
+@PipelineDiagnostics.traced("prepare", items=lambda state: len(state.selected_stories))
 def prepare_story_payload(state: ScriptState) -> ScriptState:
     if not state.selected_stories:
         state.errors.append("no_selected_stories")
         state.metadata["manual_review_required"] = True
         state.manual_review = True
         return state
-    state.analysis["stories_payload"] = [story.model_dump() for story in state.selected_stories]
+    state.analysis["stories_payload"] = list(state.selected_stories)
+    state.analysis.pop("analyzed", None)
+    state.draft = None
     state.attempts = 0
     state.metadata.setdefault("max_attempts", 2)
     return state
 
 
+@PipelineDiagnostics.traced("generate", items=lambda state: len(state.draft.segments) if state.draft else 0)
 def generate_script(state: ScriptState) -> ScriptState:
     payload = state.analysis.get("stories_payload", [])
     state.attempts += 1
-    draft = generate_script_draft(payload)
+    candidates = int(state.metadata.get("candidates", 1))
+    analyzed = state.analysis.get("analyzed")
+    if analyzed is None:
+        with state.diagnostics.span("analyze", stories=len(payload)):
+            analyzed = analyze_stories(payload)
+        state.analysis["analyzed"] = analyzed
+    previous = state.draft
+    if previous is not None and not previous.validation.passed and previous.segments:
+        # Retry: recompose only what the validator flagged, keep the rest of the draft.
+        draft = regenerate_script_draft(previous, analyzed)
+        regenerated = draft.metadata.get("regenerated", [])
+    else:
+        draft = generate_script_draft(payload, candidates=candidates, analyzed=analyzed)
+        regenerated = ["all"]
     state.draft = draft
     state.final_script = None
     state.validation = draft.validation.model_dump()
@@ -32,6 +55,8 @@ def generate_script(state: ScriptState) -> ScriptState:
         "script_generated",
         attempt=state.attempts,
         score=draft.validation.score,
+        candidates=candidates,
+        regenerated=regenerated,
     )
     if not draft.validation.passed:
         missing = list(dict.fromkeys(draft.validation.missing))
@@ -56,6 +81,7 @@ def assess_script(state: ScriptState) -> str:
     return "manual"
 
 
+@PipelineDiagnostics.traced("manual_review")
 def mark_manual_review(state: ScriptState) -> ScriptState:
     state.metadata["manual_review_required"] = True
     state.manual_review = True
@@ -70,6 +96,7 @@ def mark_manual_review(state: ScriptState) -> ScriptState:
     return state
 
 
+@PipelineDiagnostics.traced("finalize")
 def finalize_script(state: ScriptState) -> ScriptState:
     if state.final_script is None and state.draft is not None:
         state.final_script = state.draft
@@ -5,9 +5,16 @@ from __future__ import annotations
 import uuid
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
-from src.models import PipelineDiagnostics, ScoredStory, ScriptDraft, StoryEnriched, StoryInput, StorySource
+from src.models import PipelineDiagnostics, ScriptDraft, StoryRecord, StorySource
+
+
+def coerce_story_records(value: Any) -> Any:
+    """Boundary validation: models and payloads become shared StoryRecords."""
+    if not isinstance(value, list):
+        return value
+    return [StoryRecord.coerce(item) for item in value]
 
 
 class ResearchState(BaseModel):
@@ -15,10 +22,10 @@ class ResearchState(BaseModel):
 
     request_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     sources: List[StorySource] = Field(default_factory=list)
-    raw_stories: List[StoryInput] = Field(default_factory=list)
-    enriched_stories: List[StoryEnriched] = Field(default_factory=list)
-    scored_stories: List[ScoredStory] = Field(default_factory=list)
-    selected_stories: List[ScoredStory] = Field(default_factory=list)
+    raw_stories: List[StoryRecord] = Field(default_factory=list)
+    enriched_stories: List[StoryRecord] = Field(default_factory=list)
+    scored_stories: List[StoryRecord] = Field(default_factory=list)
+    selected_stories: List[StoryRecord] = Field(default_factory=list)
     companies: Dict[str, List[str]] = Field(default_factory=dict)
     scoring_weights: Dict[str, float] = Field(default_factory=dict)
     trending_keywords: Dict[str, float] = Field(default_factory=dict)
@@ -28,12 +35,17 @@ class ResearchState(BaseModel):
     checkpoints: Dict[str, Any] = Field(default_factory=dict)
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
+    @field_validator("raw_stories", "enriched_stories", "scored_stories", "selected_stories", mode="before")
+    @classmethod
+    def _coerce_stories(cls, value: Any) -> Any:
+        return coerce_story_records(value)
+
 
 class ScriptState(BaseModel):
     """State container for the script generation graph."""
 
     request_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    selected_stories: List[ScoredStory] = Field(default_factory=list)
+    selected_stories: List[StoryRecord] = Field(default_factory=list)
     analysis: Dict[str, Any] = Field(default_factory=dict)
     segments: List[Dict[str, Any]] = Field(default_factory=list)
     draft: Optional[ScriptDraft] = None
@@ -46,5 +58,10 @@ class ScriptState(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
     manual_review: bool = False
 
+    @field_validator("selected_stories", mode="before")
+    @classmethod
+    def _coerce_stories(cls, value: Any) -> Any:
+        return coerce_story_records(value)
+
 
-__all__ = ["ResearchState", "ScriptState"]
+__all__ = ["ResearchState", "ScriptState", "coerce_story_records"]
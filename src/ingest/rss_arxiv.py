@@ -4,20 +4,30 @@ from __future__ import annotations
 
 import asyncio
 import datetime as dt
+import time
 from typing import Iterable, List
 from urllib.parse import urlparse
 
-import feedparser
 import httpx
-from bs4 import BeautifulSoup
-from readability import Document
 
 from src.models import StoryInput, StorySource
 from src.utils import canonical_url, content_fingerprint, normalize_text, run_with_retry, with_timeout
 from src.utils.errors import FetchTimeout
+from src.utils.lazy import lazy_import
+from src.utils.metrics import counter, histogram
+from src.utils.tracing import span
+
+# Parsers are only needed once a feed or article arrives
+feedparser = lazy_import("feedparser")
+bs4 = lazy_import("bs4")
+readability = lazy_import("readability")
 
 _DEFAULT_TIMEOUT = 10.0
 
+FEED_FETCH_SECONDS = histogram("pipeline_feed_fetch_seconds", "RSS fetch and parse time per source", ("source",))
+FEED_FETCHES = counter("pipeline_feed_fetch_total", "RSS fetches per source by outcome", ("source", "outcome"))
+FEED_ITEMS = counter("pipeline_feed_items_total", "Stories parsed per source", ("source",))
+
 
 def _domain_of(url: str | None) -> str | None:
     if not url:
@@ -83,7 +93,18 @@ async def fetch_rss_async(
 
         async def _runner(src: StorySource) -> None:
             async with semaphore:
-                items = await _fetch_feed(client, src, max_items=max_items, timeout=timeout)
+                started = time.perf_counter()
+                outcome = "error"
+                try:
+                    with span("fetch_source", source=src.name) as current:
+                        items = await _fetch_feed(client, src, max_items=max_items, timeout=timeout)
+                        if current is not None:
+                            current.set(items=len(items))
+                    outcome = "ok"
+                finally:
+                    FEED_FETCH_SECONDS.observe(time.perf_counter() - started, source=src.name)
+                    FEED_FETCHES.inc(source=src.name, outcome=outcome)
+                FEED_ITEMS.inc(len(items), source=src.name)
                 results.extend(items)
 
         for source in sources_list:
@@ -100,8 +121,8 @@ async def fetch_fulltext_async(url: str, *, timeout: float = _DEFAULT_TIMEOUT) -
             response = await with_timeout(client.get(url), timeout)
         except Exception as exc:  # pragma: no cover - network issues exercised in integration tests
             raise FetchTimeout(f"Full-text request timed out for {url}") from exc
-        document = Document(response.text)
-        soup = BeautifulSoup(document.summary(), "html5lib")
+        document = readability.Document(response.text)
+        soup = bs4.BeautifulSoup(document.summary(), "html5lib")
         text = soup.get_text(" ", strip=True)
         return text or None
 
@@ -10,13 +10,18 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 
 from src.utils import to_thread
+from src.utils.lazy import lazy_import
+from src.utils.metrics import track_llm_call
+from src.utils.tracing import span
+
+# API clients are imported on first use so building the graphs stays cheap
+discovery = lazy_import("googleapiclient.discovery")
+google_errors = lazy_import("googleapiclient.errors")
+langchain_messages = lazy_import("langchain_core.messages")
+langchain_openai = lazy_import("langchain_openai")
 
 
 _VIDEO_BATCH = 10  # limit videos sent to LLM for affordability
@@ -67,7 +72,7 @@ class TrendingLLMAnalyzer:
 
     def __init__(self, model: str = _DEFAULT_MODEL, temperature: float = 0.2) -> None:
         try:
-            self.client = ChatOpenAI(model=model, temperature=temperature)
+            self.client = langchain_openai.ChatOpenAI(model=model, temperature=temperature)
         except Exception as exc:  # pragma: no cover - network/config
             self.client = None
             print(f"⚠️ Unable to initialise ChatOpenAI: {exc}")
@@ -116,13 +121,16 @@ class TrendingLLMAnalyzer:
         ).strip()
 
         try:
-            response = self.client.invoke(
-                [
-                    SystemMessage(content=system_prompt),
-                    HumanMessage(content=human_prompt),
-                ],
-                response_format={"type": "json_object"},
-            )
+            model = getattr(self.client, "model_name", None)
+            with span("llm_call", purpose="trending"), track_llm_call("trending", model) as call:
+                response = self.client.invoke(
+                    [
+                        langchain_messages.SystemMessage(content=system_prompt),
+                        langchain_messages.HumanMessage(content=human_prompt),
+                    ],
+                    response_format={"type": "json_object"},
+                )
+                call.usage(getattr(response, "usage_metadata", None))
         except Exception as exc:  # pragma: no cover - network/config
             print(f"⚠️ LLM trending analysis failed: {exc}")
             return {}
@@ -158,7 +166,7 @@ class YouTubeTrendingTracker:
         self._transcript_client = None
         self._latest_boosts: Dict[str, TrendingBoost] = {}
         if self.api_key:
-            self.youtube = build("youtube", "v3", developerKey=self.api_key)
+            self.youtube = discovery.build("youtube", "v3", developerKey=self.api_key)
         self._llm = TrendingLLMAnalyzer()
 
     def _get_youtube_api_key(self) -> Optional[str]:
@@ -215,7 +223,7 @@ class YouTubeTrendingTracker:
                 .list(part="snippet,statistics", id=",".join(video_ids))
                 .execute()
             )
-        except HttpError as exc:
+        except google_errors.HttpError as exc:
             print(f"⚠️ YouTube API error during details fetch: {exc}")
             return []
 
@@ -261,7 +269,7 @@ class YouTubeTrendingTracker:
                 regionCode="US",
             )
             response = request.execute()
-        except HttpError as exc:
+        except google_errors.HttpError as exc:
             print(f"⚠️ YouTube API error during search: {exc}")
             return []
 
@@ -342,7 +350,7 @@ class YouTubeTrendingTracker:
                 SERVICE_ACCOUNT_FILE,
                 scopes=["https://www.googleapis.com/auth/spreadsheets"],
             )
-            service = build("sheets", "v4", credentials=credentials)
+            service = discovery.build("sheets", "v4", credentials=credentials)
 
             spreadsheet = service.spreadsheets().get(spreadsheetId=SHEET_ID).execute()
             titles = {sheet["properties"]["title"] for sheet in spreadsheet.get("sheets", [])}
@@ -1,6 +1,6 @@
 """Typed models shared across the LangGraph pipeline."""
 
-from .stories import StorySource, StoryInput, StoryEnriched, ScoredStory
+from .stories import StorySource, StoryInput, StoryEnriched, ScoredStory, StoryRecord
 from .scripts import SegmentDraft, ScriptDraft, ValidationReport, PipelineDiagnostics
 
 __all__ = [
@@ -8,6 +8,7 @@ __all__ = [
     "StoryInput",
     "StoryEnriched",
     "ScoredStory",
+    "StoryRecord",
     "SegmentDraft",
     "ScriptDraft",
     "ValidationReport",
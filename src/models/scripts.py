@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+import functools
+import inspect
+import json
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 from pydantic import BaseModel, Field
 
+from src.utils.tracing import Span, chrome_trace, open_span
+
 
 class ValidationReport(BaseModel):
     """Result of validating a generated script."""
@@ -67,6 +73,7 @@ class PipelineDiagnostics(BaseModel):
     warnings: List[str] = Field(default_factory=list)
     errors: List[str] = Field(default_factory=list)
     events: List[Dict[str, Any]] = Field(default_factory=list)
+    spans: List[Dict[str, Any]] = Field(default_factory=list)
 
     def record(self, level: str, message: str, **details: Any) -> None:
         payload = {"level": level, "message": message, **details}
@@ -76,6 +83,53 @@ class PipelineDiagnostics(BaseModel):
         elif level == "warning":
             self.warnings.append(message)
 
+    def span(self, name: str, **attrs: Any) -> Iterator[Span]:
+        """Time a block (wall, CPU, items, memory); nests under any open span."""
+        return open_span(self.spans, name, **attrs)
+
+    @staticmethod
+    def traced(name: Optional[str] = None, items: Optional[Callable[[Any], int]] = None) -> Callable:
+        """Wrap a graph node taking the state first so it runs inside a span."""
+
+        def decorator(func: Callable) -> Callable:
+            span_name = name or func.__name__
+
+            def _finish(state: Any, current: Span) -> None:
+                if items is not None and current.items is None:
+                    current.set(items=items(state))
+
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(state: Any, *args: Any, **kwargs: Any) -> Any:
+                    with state.diagnostics.span(span_name) as current:
+                        result = await func(state, *args, **kwargs)
+                        _finish(state, current)
+                        return result
+
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(state: Any, *args: Any, **kwargs: Any) -> Any:
+                with state.diagnostics.span(span_name) as current:
+                    result = func(state, *args, **kwargs)
+                    _finish(state, current)
+                    return result
+
+            return wrapper
+
+        return decorator
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        return chrome_trace(self.spans)
+
+    def write_trace(self, path: str | Path, fmt: str = "json") -> Path:
+        """Write spans as plain JSON or, with fmt="chrome", as a Chrome trace."""
+        payload = self.chrome_trace() if fmt == "chrome" else {"spans": self.spans}
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(json.dumps(payload, indent=2, default=str), encoding="utf-8")
+        return target
+
 
 __all__ = [
     "ValidationReport",
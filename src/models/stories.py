@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Type, TypeVar
 from urllib.parse import urlparse
 
 from pydantic import BaseModel, Field, model_validator
@@ -76,9 +78,83 @@ class ScoredStory(StoryEnriched):
         return self
 
 
+ModelT = TypeVar("ModelT", bound=StoryInput)
+
+
+@dataclass(slots=True, eq=False)
+class StoryRecord(Mapping):
+    """Mutable story shared by every research and script node.
+
+    Nodes update one record in place (analysis, score, rank) instead of
+    re-validating a new pydantic model per stage. Validation happens at the
+    graph boundaries: ``coerce`` validates raw payloads on the way in and
+    ``to_model`` validates on the way out. The record is also a read-only
+    mapping over its fields, so dict-based editorial code can consume it
+    without ``model_dump``.
+    """
+
+    source: StorySource
+    title: str
+    url: str
+    summary: Optional[str] = None
+    full_text: Optional[str] = None
+    published_at: Optional[datetime] = None
+    source_domain: Optional[str] = None
+    language: Optional[str] = None
+    extras: Dict[str, Any] = field(default_factory=dict)
+    analysis: Dict[str, Any] = field(default_factory=dict)
+    diagnostics: Dict[str, Any] = field(default_factory=dict)
+    score: float = 0.0
+    rank: Optional[int] = None
+    boosts: Dict[str, float] = field(default_factory=dict)
+    companies_mentioned: List[str] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if not self.source_domain:
+            self.source_domain = _extract_domain(self.url)
+
+    @classmethod
+    def from_model(cls, model: StoryInput) -> "StoryRecord":
+        """Adopt an already-validated model without copying its containers."""
+        values = {name: getattr(model, name) for name in _RECORD_FIELDS if hasattr(model, name)}
+        return cls(**values)
+
+    @classmethod
+    def coerce(cls, value: Any) -> "StoryRecord":
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, StoryInput):
+            return cls.from_model(value)
+        return cls.from_model(ScoredStory.model_validate(value))
+
+    def to_model(self, model_cls: Type[ModelT] = ScoredStory) -> ModelT:  # type: ignore[assignment]
+        """Validate the record into ``model_cls`` at a graph boundary."""
+        return model_cls.model_validate({name: getattr(self, name) for name in model_cls.model_fields})
+
+    @property
+    def canonical_id(self) -> str:
+        return self.extras.get("canonical_id") or self.url
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _RECORD_FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_RECORD_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_RECORD_FIELDS)
+
+
+_RECORD_FIELDS = tuple(item.name for item in fields(StoryRecord))
+_RECORD_FIELD_SET = frozenset(_RECORD_FIELDS)
+
+
 __all__ = [
     "StorySource",
     "StoryInput",
     "StoryEnriched",
     "ScoredStory",
+    "StoryRecord",
 ]
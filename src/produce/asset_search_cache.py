@@ -0,0 +1,158 @@
+"""Persistent local cache for stock-asset search results.
+
+Entries are keyed by (provider, query, style, orientation) and hold the
+normalized asset metadata a provider returned. Entries expire after a TTL and
+the least recently used ones are evicted once the cache exceeds its size cap.
+The database (and its directory) is only created by the first write; calls
+block on SQLite, so async callers run them in a worker thread.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Per-shot annotations added after search; never persisted with the results.
+_TRANSIENT_FIELDS = ("relevance_score", "cached_url")
+
+DEFAULT_CACHE_PATH = os.environ.get("BROLL_SEARCH_CACHE", "./.cache/broll/search.sqlite3")
+DEFAULT_TTL_SECONDS = float(os.environ.get("BROLL_SEARCH_CACHE_TTL", str(7 * 24 * 3600)))
+DEFAULT_MAX_ENTRIES = int(os.environ.get("BROLL_SEARCH_CACHE_MAX_ENTRIES", "5000"))
+
+
+def normalize_assets(assets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Strip per-shot annotations so cached results are shot independent."""
+    return [{k: v for k, v in asset.items() if k not in _TRANSIENT_FIELDS} for asset in assets]
+
+
+class AssetSearchCache:
+    """SQLite-backed search cache with TTL expiry and an LRU entry cap."""
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_CACHE_PATH,
+        *,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self, create: bool) -> Optional[sqlite3.Connection]:
+        """Open the database on first use; reads of a cache never written to return None."""
+        if self._conn is not None:
+            return self._conn
+        memory = str(self.path) == ":memory:"
+        if not create and not memory and not self.path.exists():
+            return None
+        if not memory:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_cache (
+                provider TEXT NOT NULL,
+                query TEXT NOT NULL,
+                style TEXT NOT NULL,
+                orientation TEXT NOT NULL,
+                assets TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (provider, query, style, orientation)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS search_cache_lru ON search_cache (accessed_at)")
+        self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def _key(provider: str, query: str, style: str, orientation: str) -> tuple:
+        return provider, " ".join(query.lower().split()), style, orientation
+
+    def get(self, provider: str, query: str, style: str, orientation: str) -> Optional[List[Dict[str, Any]]]:
+        key = self._key(provider, query, style, orientation)
+        now = time.time()
+        with self._lock:
+            conn = self._connection(create=False)
+            row = conn.execute(
+                "SELECT assets, created_at FROM search_cache"
+                " WHERE provider = ? AND query = ? AND style = ? AND orientation = ?",
+                key,
+            ).fetchone() if conn is not None else None
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    conn.execute(
+                        "DELETE FROM search_cache WHERE provider = ? AND query = ? AND style = ? AND orientation = ?",
+                        key,
+                    )
+                    conn.commit()
+                self.stats["misses"] += 1
+                return None
+            conn.execute(
+                "UPDATE search_cache SET accessed_at = ?"
+                " WHERE provider = ? AND query = ? AND style = ? AND orientation = ?",
+                (now, *key),
+            )
+            conn.commit()
+        self.stats["hits"] += 1
+        return json.loads(row[0])
+
+    def put(self, provider: str, query: str, style: str, orientation: str, assets: List[Dict[str, Any]]) -> None:
+        key = self._key(provider, query, style, orientation)
+        now = time.time()
+        payload = json.dumps(normalize_assets(assets))
+        with self._lock:
+            conn = self._connection(create=True)
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*key, payload, now, now),
+            )
+            self.stats["writes"] += 1
+            self._evict(conn, now)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM search_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        (count,) = conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM search_cache WHERE rowid IN"
+                " (SELECT rowid FROM search_cache ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+            self.stats["evictions"] += overflow
+
+    def __len__(self) -> int:
+        with self._lock:
+            conn = self._connection(create=False)
+            if conn is None:
+                return 0
+            (count,) = conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()
+        return count
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connection(create=False)
+            if conn is not None:
+                conn.execute("DELETE FROM search_cache")
+                conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+__all__ = ["AssetSearchCache", "normalize_assets", "DEFAULT_CACHE_PATH"]
@@ -0,0 +1,198 @@
+"""Batched B-roll search shared across a whole shot list.
+
+Collects every layered query for every shot up front, executes each unique
+(provider, query, media) search once with per-provider concurrency limits,
+then fans the results back out to the shots that asked for them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.async_helpers import to_thread
+
+SearchKey = Tuple[str, str, str]  # (provider, query, media preference)
+
+_MOTION_STYLES = {"Cinematic", "Abstract/Futuristic"}
+_QUERIES_PER_SHOT = 3
+_ASSETS_PER_SHOT = 3
+
+
+def prefers_video(style: str) -> bool:
+    """Whether a shot style searches video before images."""
+    return style in _MOTION_STYLES
+
+
+class ShotPlan:
+    """Layered queries for one shot, in the order the researcher tries them."""
+
+    __slots__ = ("shot", "keywords", "style", "queries")
+
+    def __init__(self, shot: Dict[str, Any], keywords: List[str], style: str, queries: List[str]) -> None:
+        self.shot = shot
+        self.keywords = keywords
+        self.style = style
+        self.queries = queries
+
+
+class BrollSearchEngine:
+    """Deduplicate provider calls across shots and run them concurrently."""
+
+    def __init__(
+        self,
+        researcher: Any,
+        *,
+        provider_limits: Optional[Dict[str, int]] = None,
+        cache: Optional[Any] = None,
+    ) -> None:
+        self.researcher = researcher
+        self.cache = cache
+        limits = {
+            "pexels": int(os.environ.get("PEXELS_CONCURRENCY", "4")),
+            "pixabay": int(os.environ.get("PIXABAY_CONCURRENCY", "4")),
+        }
+        limits.update(provider_limits or {})
+        self._limits = limits
+        self.stats = {"shots": 0, "planned_calls": 0, "provider_calls": 0, "cache_hits": 0}
+
+    def plan(self, shot: Dict[str, Any]) -> ShotPlan:
+        keywords = shot.get("keywords", [])
+        style = shot.get("style", "Documentary/Stock")
+        queries = self.researcher._build_layered_queries(keywords, style)[:_QUERIES_PER_SHOT]
+        return ShotPlan(shot, keywords, style, queries)
+
+    async def research(self, session: Any, shots: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Return the ranked assets for each shot, in input order."""
+        plans = [self.plan(shot) for shot in shots]
+        results: Dict[SearchKey, List[Dict[str, Any]]] = {}
+        requests: Dict[SearchKey, Tuple[str, str]] = {}
+        self.stats["shots"] += len(plans)
+
+        # Pexels is always queried for every layered query, so fetch it all at once.
+        if self.researcher.pexels_key:
+            for plan in plans:
+                for query in plan.queries:
+                    requests.setdefault(self._key("pexels", query, plan.style), (query, plan.style))
+            await self._execute(session, requests, results)
+
+        # Pixabay only fills shots that are still short, which depends on earlier
+        # results; replay each shot and batch whatever is still unknown per round.
+        while True:
+            pending: Dict[SearchKey, Tuple[str, str]] = {}
+            for plan in plans:
+                missing, _ = self._replay(plan, results)
+                if missing is not None:
+                    pending.setdefault(missing, (self._query_for(plan, missing), plan.style))
+            if not pending:
+                break
+            await self._execute(session, pending, results)
+
+        finalize = []
+        for plan in plans:
+            _, assets = self._replay(plan, results)
+            self.stats["planned_calls"] += self._planned_calls(plan, results)
+            # Results are shared between shots; ranking annotates, so copy per shot.
+            finalize.append(
+                self.researcher._finalize_assets([dict(asset) for asset in assets], plan.keywords, plan.style)
+            )
+        return list(await asyncio.gather(*finalize))
+
+    async def warm(self, session: Any, queries: List[str], styles: List[str]) -> int:
+        """Prefetch queries for every configured provider; returns searches run."""
+        providers = [
+            name
+            for name, enabled in (("pexels", self.researcher.pexels_key), ("pixabay", self.researcher.pixabay_key))
+            if enabled
+        ]
+        requests: Dict[SearchKey, Tuple[str, str]] = {}
+        for provider in providers:
+            for style in styles:
+                for query in queries:
+                    requests.setdefault(self._key(provider, query, style), (query, style))
+        before = self.stats["provider_calls"]
+        await self._execute(session, requests, {})
+        return self.stats["provider_calls"] - before
+
+    def _key(self, provider: str, query: str, style: str) -> SearchKey:
+        return provider, query.strip().lower(), "video" if prefers_video(style) else "image"
+
+    def _query_for(self, plan: ShotPlan, key: SearchKey) -> str:
+        for query in plan.queries:
+            if self._key(key[0], query, plan.style) == key:
+                return query
+        return key[1]
+
+    def _replay(
+        self,
+        plan: ShotPlan,
+        results: Dict[SearchKey, List[Dict[str, Any]]],
+    ) -> Tuple[Optional[SearchKey], List[Dict[str, Any]]]:
+        """Walk the per-shot search order; stop at the first search not yet run."""
+        assets: List[Dict[str, Any]] = []
+        for query in plan.queries:
+            if self.researcher.pexels_key:
+                key = self._key("pexels", query, plan.style)
+                if key not in results:
+                    return key, assets
+                assets.extend(results[key])
+            if len(assets) < _ASSETS_PER_SHOT and self.researcher.pixabay_key:
+                key = self._key("pixabay", query, plan.style)
+                if key not in results:
+                    return key, assets
+                assets.extend(results[key])
+        return None, assets
+
+    def _planned_calls(self, plan: ShotPlan, results: Dict[SearchKey, List[Dict[str, Any]]]) -> int:
+        """Provider calls the shot would have made on its own."""
+        calls = 0
+        count = 0
+        for query in plan.queries:
+            if self.researcher.pexels_key:
+                calls += 1
+                count += len(results.get(self._key("pexels", query, plan.style), []))
+            if count < _ASSETS_PER_SHOT and self.researcher.pixabay_key:
+                calls += 1
+                count += len(results.get(self._key("pixabay", query, plan.style), []))
+        return calls
+
+    async def _execute(
+        self,
+        session: Any,
+        keys: Dict[SearchKey, Tuple[str, str]],
+        results: Dict[SearchKey, List[Dict[str, Any]]],
+    ) -> None:
+        semaphores = {provider: asyncio.Semaphore(max(1, limit)) for provider, limit in self._limits.items()}
+
+        orientation = getattr(self.researcher, "orientation", "landscape")
+
+        async def _run(key: SearchKey, query: str, style: str) -> None:
+            # The cache is keyed on the search mode a style selects, not the style name.
+            provider, _, mode = key
+            if self.cache is not None:
+                # SQLite blocks; keep it off the event loop
+                cached = await to_thread(self.cache.get, provider, query, mode, orientation)
+                if cached is not None:
+                    results[key] = cached
+                    self.stats["cache_hits"] += 1
+                    return
+            async with semaphores.setdefault(provider, asyncio.Semaphore(1)):
+                assets = await self._search(session, provider, query, style)
+            self.stats["provider_calls"] += 1
+            results[key] = assets
+            # Providers swallow errors and return []; don't pin those for a TTL.
+            if assets and self.cache is not None:
+                await to_thread(self.cache.put, provider, query, mode, orientation, assets)
+
+        await asyncio.gather(*(_run(key, query, style) for key, (query, style) in keys.items() if key not in results))
+
+    async def _search(self, session: Any, provider: str, query: str, style: str) -> List[Dict[str, Any]]:
+        if provider == "pexels":
+            return await self.researcher._search_pexels_async(session, query, style)
+        if provider == "pixabay":
+            return await self.researcher._search_pixabay_async(session, query, style)
+        raise ValueError(f"Unknown B-roll provider '{provider}'")
+
+
+__all__ = ["BrollSearchEngine", "ShotPlan", "prefers_video"]
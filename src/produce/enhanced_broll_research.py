@@ -14,16 +14,49 @@ from typing import List, Dict, Optional
 from concurrent.futures import ThreadPoolExecutor
 import hashlib
 
+from .asset_search_cache import AssetSearchCache
+from .broll_search import BrollSearchEngine
+
+# Conceptual/metaphorical stand-ins for abstract keywords
+CONCEPTUAL_QUERIES = {
+    'breakthrough': 'light breaking through darkness',
+    'innovation': 'futuristic technology',
+    'growth': 'plant growing timelapse',
+    'disruption': 'explosion shockwave',
+    'collaboration': 'hands joining together',
+    'intelligence': 'brain neural network',
+    'automation': 'robot assembly line',
+    'data': 'flowing data streams'
+}
+
+# Emotive/impact queries keyed by trigger word
+EMOTIVE_QUERIES = {
+    'revolutionary': 'dramatic transformation change',
+    'breakthrough': 'eureka moment discovery',
+    'crisis': 'urgent warning alert'
+}
+
+DEFAULT_QUERY = 'technology innovation future'
+
+# Queries that recur across runs regardless of the day's stories
+COMMON_QUERIES = [*CONCEPTUAL_QUERIES.values(), *EMOTIVE_QUERIES.values(), DEFAULT_QUERY]
+
 class EnhancedBrollResearch:
     """Enhanced B-roll research with multi-layer keyword strategy"""
     
-    def __init__(self):
+    def __init__(self, search_cache: Optional[AssetSearchCache] = None):
         """Initialize the enhanced B-roll researcher"""
         self.pexels_key = os.environ.get('PEXELS_API_KEY')
         self.pixabay_key = os.environ.get('PIXABAY_API_KEY')
         # Disable GCS for local testing
         self.storage_client = None
         self.cache_bucket = os.environ.get('ASSET_CACHE_BUCKET', 'yta-main-assets')
+        self.orientation = 'landscape'
+        
+        # Local search-result cache, consulted before any provider call
+        if search_cache is None and os.environ.get('BROLL_SEARCH_CACHE_ENABLED', 'true').lower() == 'true':
+            search_cache = AssetSearchCache()
+        self.search_cache = search_cache
         
         # Style-specific search modifiers
         self.style_modifiers = {
@@ -32,6 +65,7 @@ class EnhancedBrollResearch:
             'Documentary/Stock': ['professional', 'business', 'corporate', 'real', 'authentic'],
             'Graphic/Text Overlay': ['infographic', 'data visualization', 'chart', 'graph', 'text']
         }
+        self.search_engine = BrollSearchEngine(self, cache=search_cache)
     
     async def research_shot_assets(self, shot_list: List[Dict]) -> List[Dict]:
         """
@@ -43,48 +77,26 @@ class EnhancedBrollResearch:
         Returns:
             List of segments with populated asset URLs
         """
-        tasks = []
-        async with aiohttp.ClientSession() as session:
-            for segment in shot_list:
-                for shot in segment.get('shots', []):
-                    task = self._research_single_shot(session, shot)
-                    tasks.append(task)
-            
-            # Research all shots in parallel
-            results = await asyncio.gather(*tasks)
-        
+        shots = [shot for segment in shot_list for shot in segment.get('shots', [])]
+
+        # One pooled session; identical queries across shots hit each provider once
+        connector = aiohttp.TCPConnector(limit=16, limit_per_host=8)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            results = await self.search_engine.research(session, shots)
+
         # Map results back to shots
-        shot_idx = 0
-        for segment in shot_list:
-            for shot in segment.get('shots', []):
-                if shot_idx < len(results):
-                    shot['assets'] = results[shot_idx]
-                    shot_idx += 1
+        for shot, assets in zip(shots, results):
+            shot['assets'] = assets
         
         return shot_list
     
     async def _research_single_shot(self, session: aiohttp.ClientSession, shot: Dict) -> List[Dict]:
         """Research assets for a single shot"""
-        keywords = shot.get('keywords', [])
-        style = shot.get('style', 'Documentary/Stock')
-        
-        # Build search queries with different keyword layers
-        queries = self._build_layered_queries(keywords, style)
-        
-        # Search multiple providers in parallel
-        assets = []
-        for query in queries[:3]:  # Top 3 queries
-            # Try Pexels
-            if self.pexels_key:
-                pexels_assets = await self._search_pexels_async(session, query, style)
-                assets.extend(pexels_assets)
-            
-            # Try Pixabay if needed
-            if len(assets) < 3 and self.pixabay_key:
-                pixabay_assets = await self._search_pixabay_async(session, query, style)
-                assets.extend(pixabay_assets)
-        
-        # Deduplicate and rank assets
+        results = await self.search_engine.research(session, [shot])
+        return results[0]
+    
+    async def _finalize_assets(self, assets: List[Dict], keywords: List[str], style: str) -> List[Dict]:
+        """Deduplicate, rank and cache the top assets for a shot"""
         assets = self._deduplicate_assets(assets)
         assets = self._rank_assets(assets, keywords, style)
         
@@ -111,31 +123,19 @@ class EnhancedBrollResearch:
             queries.append(style_query)
         
         # Layer 3: Conceptual/metaphorical
-        conceptual_mappings = {
-            'breakthrough': 'light breaking through darkness',
-            'innovation': 'futuristic technology',
-            'growth': 'plant growing timelapse',
-            'disruption': 'explosion shockwave',
-            'collaboration': 'hands joining together',
-            'intelligence': 'brain neural network',
-            'automation': 'robot assembly line',
-            'data': 'flowing data streams'
-        }
-        
         for keyword in keywords:
-            if keyword.lower() in conceptual_mappings:
-                queries.append(conceptual_mappings[keyword.lower()])
+            if keyword.lower() in CONCEPTUAL_QUERIES:
+                queries.append(CONCEPTUAL_QUERIES[keyword.lower()])
                 break
         
         # Layer 4: Emotive/impact keywords
-        if 'revolutionary' in ' '.join(keywords).lower():
-            queries.append('dramatic transformation change')
-        elif 'breakthrough' in ' '.join(keywords).lower():
-            queries.append('eureka moment discovery')
-        elif 'crisis' in ' '.join(keywords).lower():
-            queries.append('urgent warning alert')
+        joined = ' '.join(keywords).lower()
+        for trigger, emotive_query in EMOTIVE_QUERIES.items():
+            if trigger in joined:
+                queries.append(emotive_query)
+                break
         
-        return queries if queries else ['technology innovation future']
+        return queries if queries else [DEFAULT_QUERY]
     
     async def _search_pexels_async(self, session: aiohttp.ClientSession, query: str, style: str) -> List[Dict]:
         """Async search Pexels for assets"""
@@ -151,7 +151,7 @@ class EnhancedBrollResearch:
         if prefer_video:
             # Search videos first
             url = 'https://api.pexels.com/videos/search'
-            params = {'query': query, 'per_page': 5, 'orientation': 'landscape'}
+            params = {'query': query, 'per_page': 5, 'orientation': self.orientation}
             
             try:
                 async with session.get(url, params=params, headers=headers) as response:
@@ -184,7 +184,7 @@ class EnhancedBrollResearch:
         # Fallback to images
         if len(assets) < 3:
             url = 'https://api.pexels.com/v1/search'
-            params = {'query': query, 'per_page': 5, 'orientation': 'landscape'}
+            params = {'query': query, 'per_page': 5, 'orientation': self.orientation}
             
             try:
                 async with session.get(url, params=params, headers=headers) as response:
@@ -253,7 +253,7 @@ class EnhancedBrollResearch:
                 'q': query,
                 'per_page': 5,
                 'image_type': 'photo',
-                'orientation': 'horizontal'
+                'orientation': 'horizontal' if self.orientation == 'landscape' else 'vertical'
             }
             
             try:
@@ -366,9 +366,23 @@ class EnhancedBrollResearch:
             return loop.run_until_complete(self.research_shot_assets(shot_list))
         finally:
             loop.close()
+    
+    async def warm_search_cache(self, queries: Optional[List[str]] = None) -> int:
+        """Prefetch common conceptual queries into the local search cache"""
+        queries = queries or COMMON_QUERIES
+        styles = list(self.style_modifiers)
+        async with aiohttp.ClientSession() as session:
+            return await self.search_engine.warm(session, queries, styles)
+
 
+if __name__ == "__main__" and sys.argv[1:2] == ['warm']:
+    # Prefetch common queries: python -m src.produce.enhanced_broll_research warm [query ...]
+    researcher = EnhancedBrollResearch()
+    fetched = asyncio.run(researcher.warm_search_cache(sys.argv[2:] or None))
+    print(f"Warmed B-roll search cache: {fetched} provider searches, "
+          f"{researcher.search_engine.stats['cache_hits']} already cached, {len(researcher.search_cache)} entries")
 
-if __name__ == "__main__":
+elif __name__ == "__main__":
     # Test the enhanced B-roll research
     test_shot_list = [
         {
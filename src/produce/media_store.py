@@ -0,0 +1,266 @@
+"""
+Content-addressed local media store for downloaded assets and renders.
+
+Blobs are named by their sha256 digest alone (the extension is kept in the
+index), so the same clip fetched from two URLs is stored once. An index maps
+source URLs to blobs; downloads stream in chunks into a per-URL partial file
+that is resumed with a Range request after an interruption. Resumes send the
+ETag or Last-Modified seen when the partial was started as If-Range, so a
+changed remote object is downloaded again from the start. Outputs are hardlinked to the blob instead of copied, and the
+least recently used blobs are evicted once the store exceeds its size cap.
+"""
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+MEDIA_STORE_DIR = os.getenv("MEDIA_STORE_DIR", "./.cache/media")
+MEDIA_STORE_MAX_BYTES = int(os.getenv("MEDIA_STORE_MAX_BYTES", str(20 * 1024 ** 3)))
+MEDIA_PUBLIC_BASE_URL = os.getenv("MEDIA_PUBLIC_BASE_URL")
+
+CHUNK_SIZE = 1024 * 1024
+URL_LOCK_STRIPES = 64
+# Index layout: 2 names blobs by digest alone (1 appended the URL's extension)
+INDEX_LAYOUT = 2
+
+
+class MediaStore:
+    """sha256-addressed blob store with a URL index and LRU size bound"""
+
+    def __init__(self,
+                 root: str = MEDIA_STORE_DIR,
+                 max_bytes: int = MEDIA_STORE_MAX_BYTES,
+                 public_base_url: Optional[str] = MEDIA_PUBLIC_BASE_URL,
+                 timeout: float = 600):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.public_base_url = public_base_url.rstrip("/") if public_base_url else None
+        self.timeout = timeout
+        self.blob_dir = self.root / "blobs"
+        self.partial_dir = self.root / "partial"
+        self.index_path = self.root / "index.json"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.partial_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Striped so concurrent downloads of one URL serialize without a lock per URL
+        self._url_locks = [threading.Lock() for _ in range(URL_LOCK_STRIPES)]
+        self._index = self._load_index()
+        if self._index.get("layout", 1) < INDEX_LAYOUT:
+            self._migrate_blob_names()
+
+    # Index -----------------------------------------------------------------
+
+    def _load_index(self) -> Dict:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            data = {}
+        data.setdefault("urls", {})
+        data.setdefault("blobs", {})
+        return data
+
+    def _save_index(self):
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(self._index, handle)
+        os.replace(tmp_path, self.index_path)
+
+    def _migrate_blob_names(self):
+        """One-off rename of blobs stored as digest + extension"""
+        with self._lock:
+            for digest, blob in self._index["blobs"].items():
+                path = self._blob_path(digest)
+                legacy = path.with_name(f"{digest}{blob.get('ext', '')}")
+                if legacy != path and legacy.exists() and not path.exists():
+                    os.replace(legacy, path)
+            self._index["layout"] = INDEX_LAYOUT
+            self._save_index()
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest
+
+    def local_path(self, url: str) -> Optional[Path]:
+        """Return the stored blob for a URL, if present"""
+        with self._lock:
+            digest = self._index["urls"].get(url)
+            blob = self._index["blobs"].get(digest) if digest else None
+            if not blob:
+                return None
+            path = self._blob_path(digest)
+            if not path.exists():
+                self._forget(digest)
+                self._save_index()
+                return None
+            blob["accessed_at"] = time.time()
+        return path
+
+    def public_url(self, url: str) -> Optional[str]:
+        """Stable content-addressed URL for a stored blob when a public mirror is configured"""
+        if not self.public_base_url:
+            return None
+        path = self.local_path(url)
+        if not path:
+            return None
+        return f"{self.public_base_url}/{path.relative_to(self.blob_dir).as_posix()}"
+
+    # Downloads -------------------------------------------------------------
+
+    def fetch(self, url: str, client: Optional[httpx.Client] = None) -> Path:
+        """Return the local blob for a URL, streaming it in if needed"""
+        path = self.local_path(url)
+        if path:
+            return path
+
+        if client is None:
+            with httpx.Client(timeout=self.timeout, follow_redirects=True) as owned:
+                return self._download(url, owned)
+        return self._download(url, client)
+
+    def prefetch(self, urls: Iterable[str]) -> Dict[str, Optional[Path]]:
+        """Fetch several URLs over one connection pool; failures map to None"""
+        fetched = {}
+        with httpx.Client(timeout=self.timeout, follow_redirects=True) as client:
+            for url in dict.fromkeys(urls):
+                try:
+                    fetched[url] = self.fetch(url, client)
+                except httpx.HTTPError as e:
+                    print(f"Media prefetch failed for {url}: {e}")
+                    fetched[url] = None
+        return fetched
+
+    def _download(self, url: str, client: httpx.Client) -> Path:
+        url_hash = hashlib.sha256(url.encode()).hexdigest()
+        # One download per URL at a time: concurrent fetches would interleave
+        # writes into the shared partial file
+        with self._url_locks[int(url_hash[:8], 16) % len(self._url_locks)]:
+            path = self.local_path(url)
+            if path:
+                return path
+            partial = self.partial_dir / (url_hash + ".part")
+            if not self._stream(url, client, partial):
+                # The partial did not match the server's copy; start over
+                partial.unlink(missing_ok=True)
+                self._validator_path(partial).unlink(missing_ok=True)
+                if not self._stream(url, client, partial):
+                    raise httpx.HTTPError(f"Range not satisfiable for a full download of {url}")
+            return self._store(url, partial)
+
+    def _stream(self, url: str, client: httpx.Client, partial: Path) -> bool:
+        """Fill partial with the body, resuming from its size; False if a stale partial must be discarded"""
+        validator_path = self._validator_path(partial)
+        offset = partial.stat().st_size if partial.exists() else 0
+        validator = validator_path.read_text(encoding="utf-8") if offset and validator_path.exists() else ""
+        # Without a validator there is no telling whether the partial is still the same object
+        headers = {"Range": f"bytes={offset}-", "If-Range": validator} if offset and validator else {}
+
+        with client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 416:
+                # Nothing left to fetch only if the partial is exactly the full body
+                total = response.headers.get("Content-Range", "").rpartition("/")[2]
+                return bool(headers) and total.isdigit() and int(total) == offset
+            response.raise_for_status()
+            resumed = bool(headers) and response.status_code == 206
+            if not resumed:
+                # A 200 is the whole (possibly changed) object: restart and remember its validator
+                etag = response.headers.get("ETag", "")
+                validator = etag if etag and not etag.startswith("W/") else response.headers.get("Last-Modified", "")
+                if validator:
+                    validator_path.write_text(validator, encoding="utf-8")
+                else:
+                    validator_path.unlink(missing_ok=True)
+            mode = "ab" if resumed else "wb"
+            with open(partial, mode) as handle:
+                for chunk in response.iter_bytes(CHUNK_SIZE):
+                    handle.write(chunk)
+        return True
+
+    @staticmethod
+    def _validator_path(partial: Path) -> Path:
+        return partial.with_suffix(".validator")
+
+    def _store(self, url: str, partial: Path) -> Path:
+        digest = self._hash_file(partial)
+        ext = Path(urlparse(url).path).suffix.lower()[:8]
+        blob_path = self._blob_path(digest)
+        self._validator_path(partial).unlink(missing_ok=True)
+        with self._lock:
+            if blob_path.exists():
+                partial.unlink()
+            else:
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(partial, blob_path)
+            now = time.time()
+            blob = self._index["blobs"].setdefault(digest, {"ext": ext, "size": blob_path.stat().st_size})
+            blob["accessed_at"] = now
+            self._index["urls"][url] = digest
+            self._evict(keep=digest)
+            self._save_index()
+        return blob_path
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def materialize(self, url: str, output_path: str, client: Optional[httpx.Client] = None) -> str:
+        """Place the blob for a URL at output_path, hardlinked when possible"""
+        blob_path = self.fetch(url, client)
+        output = Path(output_path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        if output.exists() or output.is_symlink():
+            output.unlink()
+        try:
+            os.link(blob_path, output)
+        except OSError:
+            # Cross-device or unsupported filesystem
+            shutil.copyfile(blob_path, output)
+        return str(output)
+
+    # Eviction --------------------------------------------------------------
+
+    def _forget(self, digest: str):
+        self._index["blobs"].pop(digest, None)
+        self._index["urls"] = {u: d for u, d in self._index["urls"].items() if d != digest}
+
+    def _evict(self, keep: Optional[str] = None):
+        blobs = self._index["blobs"]
+        total = sum(blob.get("size", 0) for blob in blobs.values())
+        if total <= self.max_bytes:
+            return
+        for digest, blob in sorted(blobs.items(), key=lambda item: item[1].get("accessed_at", 0)):
+            if total <= self.max_bytes:
+                break
+            if digest == keep:
+                continue
+            # Hardlinked outputs keep their data; only the store's link goes away
+            path = self._blob_path(digest)
+            if path.exists():
+                path.unlink()
+            total -= blob.get("size", 0)
+            self._forget(digest)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(blob.get("size", 0) for blob in self._index["blobs"].values())
+
+
+_default_store: Optional[MediaStore] = None
+
+
+def get_media_store() -> MediaStore:
+    """Process-wide store rooted at MEDIA_STORE_DIR"""
+    global _default_store
+    if _default_store is None:
+        _default_store = MediaStore()
+    return _default_store
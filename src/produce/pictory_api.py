@@ -1,8 +1,10 @@
 import os
-import time
 import httpx
 import json
 
+from .media_store import get_media_store
+from .render_poller import RenderJobFailed, get_render_poller
+
 class PictoryAPI:
     def __init__(self):
         self.client_id = os.getenv('PICTORY_CLIENT_ID')
@@ -129,34 +131,28 @@ class PictoryAPI:
             
     def wait_for_completion(self, job_id: str, max_wait: int = 600):
         """Wait for job to complete"""
-        start_time = time.time()
-        
-        while time.time() - start_time < max_wait:
-            status_data = self.check_job_status(job_id)
-            status = status_data.get('status')
-            
-            if status == 'completed':
-                return status_data
-            elif status == 'failed':
-                raise Exception(f'Job failed: {status_data.get("error")}')
-                
-            print(f'Job status: {status}, waiting...')
-            time.sleep(10)
+        if not self.access_token:
+            self.authenticate()
             
-        raise Exception('Job timed out')
+        try:
+            return get_render_poller().wait(
+                'pictory',
+                job_id,
+                f'{self.base_url}/jobs/{job_id}',
+                headers={'Authorization': self.access_token, 'X-Pictory-User-Id': self.user_id},
+                timeout=max_wait,
+            )
+        except RenderJobFailed as e:
+            raise Exception(f'Job failed: {e.data.get("error")}')
+        except TimeoutError:
+            raise Exception('Job timed out')
         
     def download_video(self, video_url: str, output_path: str):
-        """Download rendered video"""
-        with httpx.Client(timeout=300) as client:
-            response = client.get(video_url)
-            
-            if response.status_code != 200:
-                raise Exception(f'Video download failed: {response.status_code}')
-                
-            with open(output_path, 'wb') as f:
-                f.write(response.content)
-                
-        return output_path
+        """Download rendered video through the local media store"""
+        try:
+            return get_media_store().materialize(video_url, output_path)
+        except httpx.HTTPStatusError as e:
+            raise Exception(f'Video download failed: {e.response.status_code}')
         
     def generate_video(self, script: str, video_name: str, output_path: str):
         """Full pipeline to generate video"""
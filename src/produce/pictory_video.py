@@ -1,9 +1,11 @@
 import os
 import json
-import time
 import httpx
 from typing import Dict, Optional
 
+from .media_store import get_media_store
+from .render_poller import RenderJobFailed, get_render_poller
+
 class PictoryVideoGenerator:
     def __init__(self):
         self.client_id = os.getenv("PICTORY_CLIENT_ID")
@@ -91,32 +93,24 @@ class PictoryVideoGenerator:
             
     def wait_for_storyboard(self, job_id: str, max_wait: int = 300) -> Dict:
         """Wait for storyboard to complete"""
+        try:
+            return self._wait_for_job(job_id, max_wait)
+        except RenderJobFailed as e:
+            raise Exception(f"Storyboard generation failed: {e.data.get('error')}")
+        except TimeoutError:
+            raise Exception("Storyboard generation timed out")
+        
+    def _wait_for_job(self, job_id: str, max_wait: int) -> Dict:
+        """Track a Pictory job on the shared render poller"""
         if not self.access_token:
             self.authenticate()
-            
-        url = f"{self.base_url}/jobs/{job_id}"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
-        
-        start_time = time.time()
-        while time.time() - start_time < max_wait:
-            with httpx.Client(timeout=30) as client:
-                response = client.get(url, headers=headers)
-                
-                if response.status_code != 200:
-                    raise Exception(f"Status check failed: {response.status_code} - {response.text}")
-                    
-                data = response.json()
-                status = data.get("status")
-                
-                if status == "completed":
-                    return data
-                elif status == "failed":
-                    raise Exception(f"Storyboard generation failed: {data.get('error')}")
-                    
-                print(f"Storyboard status: {status}, waiting...")
-                time.sleep(10)
-                
-        raise Exception("Storyboard generation timed out")
+        return get_render_poller().wait(
+            "pictory",
+            job_id,
+            f"{self.base_url}/jobs/{job_id}",
+            headers={"Authorization": f"Bearer {self.access_token}"},
+            timeout=max_wait,
+        )
         
     def render_video(self, storyboard_job_id: str) -> str:
         """Render video from storyboard"""
@@ -143,45 +137,20 @@ class PictoryVideoGenerator:
             
     def wait_for_render(self, render_job_id: str, max_wait: int = 600) -> str:
         """Wait for video render to complete and get download URL"""
-        if not self.access_token:
-            self.authenticate()
-            
-        url = f"{self.base_url}/jobs/{render_job_id}"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
-        
-        start_time = time.time()
-        while time.time() - start_time < max_wait:
-            with httpx.Client(timeout=30) as client:
-                response = client.get(url, headers=headers)
-                
-                if response.status_code != 200:
-                    raise Exception(f"Render status check failed: {response.status_code} - {response.text}")
-                    
-                data = response.json()
-                status = data.get("status")
-                
-                if status == "completed":
-                    return data.get("result", {}).get("videoUrl")
-                elif status == "failed":
-                    raise Exception(f"Video render failed: {data.get('error')}")
-                    
-                print(f"Render status: {status}, waiting...")
-                time.sleep(15)
-                
-        raise Exception("Video render timed out")
+        try:
+            data = self._wait_for_job(render_job_id, max_wait)
+        except RenderJobFailed as e:
+            raise Exception(f"Video render failed: {e.data.get('error')}")
+        except TimeoutError:
+            raise Exception("Video render timed out")
+        return data.get("result", {}).get("videoUrl")
             
     def download_video(self, video_url: str, output_path: str) -> str:
-        """Download rendered video"""
-        with httpx.Client(timeout=300) as client:
-            response = client.get(video_url)
-            
-            if response.status_code != 200:
-                raise Exception(f"Video download failed: {response.status_code}")
-                
-            with open(output_path, "wb") as f:
-                f.write(response.content)
-                
-        return output_path
+        """Download rendered video through the local media store"""
+        try:
+            return get_media_store().materialize(video_url, output_path)
+        except httpx.HTTPStatusError as e:
+            raise Exception(f"Video download failed: {e.response.status_code}")
         
     def generate(self, script_data: Dict, output_path: str, video_name: str = "AI News") -> str:
         """Full pipeline to generate video from script"""
@@ -0,0 +1,382 @@
+"""
+Multiplexed render-job poller for Shotstack, Pictory and Runway
+
+One background event loop polls every outstanding render job across
+providers with per-job adaptive backoff, instead of a blocking sleep loop per
+render. Each tracked job resolves a future (usable from threads or asyncio)
+and outstanding job ids are persisted so a restarted process can resume
+waiting on renders it already paid for.
+"""
+import os
+import json
+import time
+import asyncio
+import threading
+from concurrent.futures import Future, InvalidStateError
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from ..utils.metrics import counter, gauge, histogram
+
+RENDER_JOBS_PATH = os.getenv("RENDER_JOBS_PATH", "./.cache/render_jobs.json")
+
+# Parser: provider response body -> (state, payload); state is pending/done/failed
+StatusParser = Callable[[Dict[str, Any]], Tuple[str, Dict[str, Any]]]
+
+RENDER_JOBS_IN_FLIGHT = gauge("pipeline_render_jobs_in_flight", "Render jobs being polled", ("provider",))
+RENDER_POLLS = counter("pipeline_render_polls_total", "Render status checks by result", ("provider", "result"))
+RENDER_JOB_SECONDS = histogram("pipeline_render_job_seconds", "Time from tracking a render job to settling it",
+                               ("provider", "outcome"))
+
+
+class RenderJobFailed(Exception):
+    """Provider reported a render job as failed (payload in .data)"""
+
+    def __init__(self, provider: str, job_id: str, data: Dict[str, Any]):
+        self.provider = provider
+        self.job_id = job_id
+        self.data = data
+        super().__init__(f"{provider} job {job_id} failed: {data.get('error', data.get('status'))}")
+
+
+def _parse_shotstack(body: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    data = body.get("response", {}) or {}
+    status = data.get("status")
+    if status == "done":
+        return "done", data
+    if status in ("failed", "cancelled"):
+        return "failed", data
+    return "pending", data
+
+
+def _parse_completed(body: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    status = body.get("status")
+    if status == "completed":
+        return "done", body
+    if status == "failed":
+        return "failed", body
+    return "pending", body
+
+
+@dataclass
+class ProviderSpec:
+    """How to read a provider's job status and how eagerly to poll it"""
+    parse: StatusParser
+    initial_interval: float = 5.0
+    max_interval: float = 30.0
+    backoff: float = 1.5
+
+
+DEFAULT_PROVIDERS = {
+    "shotstack": ProviderSpec(_parse_shotstack, initial_interval=5.0),
+    "pictory": ProviderSpec(_parse_completed, initial_interval=10.0, max_interval=60.0),
+    "runway": ProviderSpec(_parse_completed, initial_interval=2.0),
+}
+
+
+@dataclass
+class TrackedJob:
+    """A render job being polled"""
+    provider: str
+    job_id: str
+    status_url: str
+    deadline: float
+    headers: Dict[str, str] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    interval: float = 0.0
+    next_poll: float = 0.0
+    last_seen: Optional[Tuple[Any, Any]] = None
+    errors: int = 0
+    tracked_at: float = field(default_factory=time.time)
+    future: Future = field(default_factory=Future)
+
+    @property
+    def key(self) -> str:
+        return f"{self.provider}:{self.job_id}"
+
+    def to_record(self) -> Dict[str, Any]:
+        # Headers carry credentials and are never persisted
+        return {
+            "provider": self.provider,
+            "job_id": self.job_id,
+            "status_url": self.status_url,
+            "deadline": self.deadline,
+            "metadata": self.metadata,
+        }
+
+
+class RenderJobPoller:
+    """Single-loop poller for render jobs across providers"""
+
+    def __init__(self,
+                 state_path: Optional[str] = RENDER_JOBS_PATH,
+                 providers: Optional[Dict[str, ProviderSpec]] = None,
+                 max_errors: int = 5,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.state_path = Path(state_path) if state_path else None
+        self.providers = dict(DEFAULT_PROVIDERS)
+        self.providers.update(providers or {})
+        self.max_errors = max_errors
+        self._transport = transport
+        self._jobs: Dict[str, TrackedJob] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # Public API ------------------------------------------------------------
+
+    def track(self,
+              provider: str,
+              job_id: str,
+              status_url: str,
+              *,
+              headers: Optional[Dict[str, str]] = None,
+              timeout: float = 600,
+              metadata: Optional[Dict[str, Any]] = None,
+              callback: Optional[Callable[[Future], None]] = None,
+              deadline: Optional[float] = None) -> Future:
+        """Start polling a job; returns a future resolving to the provider payload"""
+        if provider not in self.providers:
+            raise ValueError(f"Unknown render provider '{provider}'")
+        spec = self.providers[provider]
+        job = TrackedJob(
+            provider=provider,
+            job_id=job_id,
+            status_url=status_url,
+            deadline=deadline if deadline is not None else time.time() + timeout,
+            headers=dict(headers or {}),
+            metadata=dict(metadata or {}),
+            interval=spec.initial_interval,
+        )
+        with self._lock:
+            existing = self._jobs.get(job.key)
+            if existing and not existing.future.done():
+                if headers:
+                    existing.headers = job.headers
+                job = existing
+            else:
+                self._jobs[job.key] = job
+                self._persist()
+                self._update_in_flight()
+        if callback:
+            job.future.add_done_callback(callback)
+        self._ensure_loop()
+        self._loop.call_soon_threadsafe(self._wake.set)
+        return job.future
+
+    def wait(self, provider: str, job_id: str, status_url: str, **kwargs) -> Dict[str, Any]:
+        """Block until a job settles (raises RenderJobFailed / TimeoutError)"""
+        return self.track(provider, job_id, status_url, **kwargs).result()
+
+    async def wait_async(self, provider: str, job_id: str, status_url: str, **kwargs) -> Dict[str, Any]:
+        """Await a job from any event loop"""
+        return await asyncio.wrap_future(self.track(provider, job_id, status_url, **kwargs))
+
+    def resume(self, headers: Optional[Dict[str, Dict[str, str]]] = None) -> Dict[str, Future]:
+        """Re-track jobs persisted by a previous process; headers are per provider"""
+        headers = headers or {}
+        resumed = {}
+        for record in self._load():
+            if record.get("provider") not in self.providers:
+                continue
+            future = self.track(
+                record["provider"],
+                record["job_id"],
+                record["status_url"],
+                headers=headers.get(record["provider"]),
+                metadata=record.get("metadata"),
+                deadline=record.get("deadline"),
+            )
+            resumed[f"{record['provider']}:{record['job_id']}"] = future
+        return resumed
+
+    def outstanding(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [job.to_record() for job in self._jobs.values()]
+
+    def shutdown(self):
+        """Stop the polling loop; outstanding jobs stay persisted for resume()"""
+        with self._lock:
+            loop, thread, self._loop, self._thread = self._loop, self._thread, None, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._stop(), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+    # Persistence -----------------------------------------------------------
+
+    def _load(self) -> List[Dict[str, Any]]:
+        if not self.state_path or not self.state_path.exists():
+            return []
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as handle:
+                return json.load(handle).get("jobs", [])
+        except (OSError, ValueError):
+            return []
+
+    def _persist(self):
+        """Write outstanding jobs; caller holds the lock"""
+        if not self.state_path:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({"jobs": [job.to_record() for job in self._jobs.values()]}, handle)
+        os.replace(tmp_path, self.state_path)
+
+    # Event loop ------------------------------------------------------------
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is not None:
+                return
+            ready = threading.Event()
+            loop = asyncio.new_event_loop()
+
+            def _run():
+                asyncio.set_event_loop(loop)
+                self._wake = asyncio.Event()
+                ready.set()
+                self._task = loop.create_task(self._main())
+                loop.run_forever()
+
+            self._loop = loop
+            self._thread = threading.Thread(target=_run, name="render-poller", daemon=True)
+            self._thread.start()
+            ready.wait()
+
+    async def _stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _main(self):
+        async with httpx.AsyncClient(timeout=60, transport=self._transport) as client:
+            while True:
+                now = time.time()
+                with self._lock:
+                    jobs = list(self._jobs.values())
+                due = [job for job in jobs if job.next_poll <= now]
+                if due:
+                    results = await asyncio.gather(*(self._poll(client, job) for job in due), return_exceptions=True)
+                    for job, result in zip(due, results):
+                        if isinstance(result, Exception):
+                            # A broken job must not stop the loop every other job is waiting on
+                            print(f"Render poller error for {job.key}: {result!r}")
+                            try:
+                                self._settle(job, error=result)
+                            except Exception as e:
+                                print(f"Render poller could not settle {job.key}: {e!r}")
+                    continue
+
+                self._wake.clear()
+                delay = min((job.next_poll for job in jobs), default=now + 60) - time.time()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=max(0.0, delay))
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _poll(self, client: httpx.AsyncClient, job: TrackedJob):
+        if job.future.done():
+            # Every waiter gave up (cancelled future); stop polling on its behalf
+            self._settle(job)
+            return
+        try:
+            await self._check(client, job)
+        except Exception as e:
+            RENDER_POLLS.inc(provider=job.provider, result="error")
+            self._settle(job, error=RuntimeError(f"Status check failed for {job.key}: {e!r}"))
+
+    async def _check(self, client: httpx.AsyncClient, job: TrackedJob):
+        spec = self.providers[job.provider]
+        if time.time() > job.deadline:
+            RENDER_POLLS.inc(provider=job.provider, result="timeout")
+            self._settle(job, error=TimeoutError(f"{job.provider} job {job.job_id} timed out"))
+            return
+
+        try:
+            response = await client.get(job.status_url, headers=job.headers)
+            if response.status_code == 404:
+                RENDER_POLLS.inc(provider=job.provider, result="not_found")
+                self._settle(job, error=RenderJobFailed(job.provider, job.job_id, {"status": "not_found"}))
+                return
+            response.raise_for_status()
+            state, payload = spec.parse(response.json())
+        except (httpx.HTTPError, ValueError) as e:
+            RENDER_POLLS.inc(provider=job.provider, result="error")
+            job.errors += 1
+            if job.errors >= self.max_errors:
+                self._settle(job, error=RuntimeError(f"Status check failed for {job.key}: {e}"))
+                return
+            self._reschedule(job, spec, changed=False)
+            return
+
+        job.errors = 0
+        RENDER_POLLS.inc(provider=job.provider, result=state)
+        if state == "done":
+            self._settle(job, result=payload)
+        elif state == "failed":
+            self._settle(job, error=RenderJobFailed(job.provider, job.job_id, payload))
+        else:
+            seen = (payload.get("status"), payload.get("renderProgress", payload.get("progress")))
+            changed = seen != job.last_seen
+            if changed:
+                print(f"{job.provider} job {job.job_id}: {seen[0]} ({seen[1] or 0}%)")
+            job.last_seen = seen
+            self._reschedule(job, spec, changed=changed)
+
+    @staticmethod
+    def _reschedule(job: TrackedJob, spec: ProviderSpec, changed: bool):
+        # Poll eagerly while a job is moving, back off while it sits still
+        if changed:
+            job.interval = spec.initial_interval
+        else:
+            job.interval = min(job.interval * spec.backoff, spec.max_interval)
+        job.next_poll = time.time() + job.interval
+
+    def _settle(self, job: TrackedJob, result: Optional[Dict[str, Any]] = None, error: Optional[BaseException] = None):
+        with self._lock:
+            self._jobs.pop(job.key, None)
+            self._persist()
+            self._update_in_flight()
+        if job.future.cancelled():
+            outcome = "cancelled"
+        else:
+            outcome = "done" if error is None else "timeout" if isinstance(error, TimeoutError) else "failed"
+        RENDER_JOB_SECONDS.observe(time.time() - job.tracked_at, provider=job.provider, outcome=outcome)
+        if job.future.done():  # cancelled by its waiter
+            return
+        try:
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(result)
+        except InvalidStateError:  # cancelled between the check and here
+            pass
+
+    def _update_in_flight(self):
+        """Refresh the per-provider queue depth gauge; caller holds the lock"""
+        for provider in self.providers:
+            RENDER_JOBS_IN_FLIGHT.set(sum(1 for job in self._jobs.values() if job.provider == provider), provider=provider)
+
+
+_default_poller: Optional[RenderJobPoller] = None
+_default_lock = threading.Lock()
+
+
+def get_render_poller() -> RenderJobPoller:
+    """Process-wide poller persisting to RENDER_JOBS_PATH"""
+    global _default_poller
+    with _default_lock:
+        if _default_poller is None:
+            _default_poller = RenderJobPoller()
+        return _default_poller
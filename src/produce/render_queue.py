@@ -0,0 +1,356 @@
+"""
+Persistent render queue in front of VideoRendererSelector
+
+Render requests are stored in SQLite so several videos (and re-renders) can
+be in flight at once across one or more worker processes. Workers claim the
+highest-priority job whose renderer still has capacity, failures are retried
+with backoff and routed to the fallback renderer, and jobs held by a crashed
+worker are requeued once their lease expires. Live workers renew the lease
+while a render is in progress.
+"""
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+RENDER_QUEUE_PATH = os.getenv("RENDER_QUEUE_PATH", "./.cache/render_queue.sqlite3")
+
+# Lower runs first
+PRIORITIES = {
+    "breaking": 0,
+    "daily": 50,
+    "weekly": 100,
+}
+
+DEFAULT_PROVIDER_LIMITS = {
+    "shotstack": int(os.getenv("SHOTSTACK_MAX_RENDERS", "3")),
+    "pictory": int(os.getenv("PICTORY_MAX_RENDERS", "1")),
+}
+
+
+class RenderQueue:
+    """SQLite-backed queue of render requests"""
+
+    def __init__(self,
+                 path: str = RENDER_QUEUE_PATH,
+                 provider_limits: Optional[Dict[str, int]] = None,
+                 max_attempts: int = 3,
+                 retry_delay: float = 30.0,
+                 lease_seconds: float = 1800.0):
+        self.path = path
+        self.provider_limits = dict(DEFAULT_PROVIDER_LIMITS)
+        self.provider_limits.update(provider_limits or {})
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease_seconds = lease_seconds
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS render_jobs (
+                id TEXT PRIMARY KEY,
+                priority INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                renderer TEXT NOT NULL,
+                fallback TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                request TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                worker TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                not_before REAL NOT NULL DEFAULT 0,
+                lease_until REAL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS render_jobs_ready ON render_jobs (status, priority, created_at)"
+        )
+
+    # Producers -------------------------------------------------------------
+
+    def enqueue(self,
+                request: Dict[str, Any],
+                renderer: str,
+                fallback: Optional[str] = None,
+                priority: Any = "daily") -> str:
+        """Queue a render_video request for a chosen renderer; returns the job id"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        rank = PRIORITIES[priority] if isinstance(priority, str) else int(priority)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO render_jobs (id, priority, status, renderer, fallback, request, created_at, updated_at)"
+                " VALUES (?, ?, 'queued', ?, ?, ?, ?, ?)",
+                (job_id, rank, renderer, fallback, json.dumps(request), now, now),
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM render_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def jobs(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = "SELECT * FROM render_jobs"
+        params: tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY priority, created_at", params).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    # Workers ---------------------------------------------------------------
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """Atomically take the next runnable job whose renderer has a free slot"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Crashed workers: put their expired leases back in line
+                self._conn.execute(
+                    "UPDATE render_jobs SET status = 'queued', worker = NULL, lease_until = NULL"
+                    " WHERE status = 'running' AND lease_until < ?",
+                    (now,),
+                )
+                running = dict(self._conn.execute(
+                    "SELECT renderer, COUNT(*) FROM render_jobs WHERE status = 'running' GROUP BY renderer"
+                ).fetchall())
+                full = [name for name, limit in self.provider_limits.items() if running.get(name, 0) >= limit]
+                query = "SELECT * FROM render_jobs WHERE status = 'queued' AND not_before <= ?"
+                if full:
+                    query += f" AND renderer NOT IN ({', '.join('?' * len(full))})"
+                row = self._conn.execute(
+                    query + " ORDER BY priority, created_at LIMIT 1", (now, *full)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE render_jobs SET status = 'running', worker = ?, lease_until = ?, updated_at = ?"
+                        " WHERE id = ?",
+                        (worker, now + self.lease_seconds, now, row["id"]),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        job = self._row_to_job(row)
+        job["status"] = "running"
+        return job
+
+    def renew(self, job_id: str, worker: str) -> bool:
+        """Extend a running job's lease; False if the worker no longer holds it"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE render_jobs SET lease_until = ?, updated_at = ?"
+                " WHERE id = ? AND worker = ? AND status = 'running'",
+                (now + self.lease_seconds, now, job_id, worker),
+            )
+        return cursor.rowcount > 0
+
+    def outstanding(self) -> int:
+        """Jobs not yet settled: ready, waiting out a retry backoff, or leased by a worker"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM render_jobs WHERE status IN ('queued', 'running')"
+            ).fetchone()
+        return row[0]
+
+    def complete(self, job_id: str, worker: str, result: str) -> bool:
+        """Mark a job done; False if the worker's lease expired or the job was re-leased"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE render_jobs SET status = 'done', result = ?, error = NULL, lease_until = NULL,"
+                " updated_at = ? WHERE id = ? AND worker = ? AND status = 'running' AND lease_until >= ?",
+                (result, now, job_id, worker, now),
+            )
+        return cursor.rowcount > 0
+
+    def fail(self, job_id: str, worker: str, error: str) -> Optional[str]:
+        """
+        Record a failed attempt; retries on the fallback renderer until attempts run out
+
+        Returns the job's new status, or None if the worker no longer holds its lease.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM render_jobs WHERE id = ? AND worker = ? AND status = 'running' AND lease_until >= ?",
+                (job_id, worker, now),
+            ).fetchone()
+            if row is None:
+                return None
+            attempts = row["attempts"] + 1
+            if attempts >= self.max_attempts:
+                status, renderer, fallback = "failed", row["renderer"], row["fallback"]
+            else:
+                status = "queued"
+                # Route the retry to the fallback renderer once, then alternate back
+                renderer, fallback = (row["fallback"], row["renderer"]) if row["fallback"] else (row["renderer"], None)
+            self._conn.execute(
+                "UPDATE render_jobs SET status = ?, renderer = ?, fallback = ?, attempts = ?, error = ?,"
+                " worker = NULL, lease_until = NULL, not_before = ?, updated_at = ? WHERE id = ?",
+                (status, renderer, fallback, attempts, error, now + self.retry_delay * attempts, now, job_id),
+            )
+        return status
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["request"] = json.loads(job["request"])
+        return job
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RenderWorker:
+    """Runs queued renders through VideoRendererSelector with bounded concurrency"""
+
+    def __init__(self, queue: RenderQueue, selector: Any = None, poll_interval: float = 5.0):
+        if selector is None:
+            from .video_renderer_selector import VideoRendererSelector
+            selector = VideoRendererSelector()
+        self.queue = queue
+        self.selector = selector
+        self.poll_interval = poll_interval
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._stop = threading.Event()
+
+    def run_once(self) -> Optional[Dict[str, Any]]:
+        """Claim and render a single job; returns the job or None when idle"""
+        job = self.queue.claim(self.worker_id)
+        if job is None:
+            return None
+        request = job["request"]
+        heartbeat = self._start_heartbeat(job["id"])
+        try:
+            result = self.selector.render_with(
+                job["renderer"],
+                request["script"],
+                request["title"],
+                request.get("segments", []),
+                request.get("voiceover_url"),
+                request["output_path"],
+                request.get("style", "professional"),
+            )
+        except Exception as e:
+            heartbeat.set()
+            status = self.queue.fail(job["id"], self.worker_id, str(e))
+            if status is None:
+                return self._lease_lost(job)
+            logger.warning(f"Render {job['id']} failed on {job['renderer']}: {e} ({status})")
+            job.update(status=status, error=str(e))
+            return job
+        heartbeat.set()
+        if not self.queue.complete(job["id"], self.worker_id, result):
+            return self._lease_lost(job)
+        job.update(status="done", result=result)
+        return job
+
+    def _lease_lost(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """The lease expired mid-render and the job may be someone else's now; drop this outcome"""
+        logger.warning(f"Dropping the outcome of render {job['id']}: lease no longer held by {self.worker_id}")
+        job.update(status="lease_lost")
+        return job
+
+    def _start_heartbeat(self, job_id: str) -> threading.Event:
+        """Renew the job's lease every third of its length until the returned event is set"""
+        done = threading.Event()
+        interval = self.queue.lease_seconds / 3
+
+        def _beat():
+            while not done.wait(interval):
+                if not self.queue.renew(job_id, self.worker_id) and not done.is_set():
+                    logger.warning(f"Lost the lease on render {job_id}")
+                    return
+
+        threading.Thread(target=_beat, name=f"render-lease-{job_id[:8]}", daemon=True).start()
+        return done
+
+    def run(self, concurrency: Optional[int] = None, stop_when_idle: bool = False):
+        """
+        Render until stopped; per-renderer caps are enforced by the queue
+
+        With stop_when_idle the workers exit once no job is outstanding, so
+        retries waiting out their backoff and jobs blocked on a renderer's
+        concurrency cap are still rendered before returning.
+        """
+        concurrency = concurrency or sum(self.queue.provider_limits.values())
+
+        def _loop():
+            while not self._stop.is_set():
+                if self.run_once() is None:
+                    if stop_when_idle and not self.queue.outstanding():
+                        return
+                    self._stop.wait(self.poll_interval)
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="render-worker") as pool:
+            for _ in range(concurrency):
+                pool.submit(_loop)
+
+    def stop(self):
+        self._stop.set()
+
+
+def enqueue_render(queue: RenderQueue,
+                   selector: Any,
+                   script: str,
+                   title: str,
+                   segments: List[Dict],
+                   voiceover_url: str,
+                   output_path: str,
+                   prefer_shotstack: bool = True,
+                   style: str = "professional",
+                   priority: Any = "daily") -> str:
+    """Queue a VideoRendererSelector.render_video call instead of running it inline"""
+    renderer = selector.choose_renderer(script, segments, prefer_shotstack)
+    request = {
+        "script": script,
+        "title": title,
+        "segments": segments,
+        "voiceover_url": voiceover_url,
+        "output_path": output_path,
+        "style": style,
+    }
+    return queue.enqueue(request, renderer, selector.fallback_for(renderer), priority)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render queue worker")
+    parser.add_argument("command", choices=["worker", "status"])
+    parser.add_argument("--queue", default=RENDER_QUEUE_PATH)
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--once", action="store_true", help="Exit when the queue is drained")
+    args = parser.parse_args()
+
+    queue = RenderQueue(args.queue)
+    if args.command == "status":
+        for job in queue.jobs():
+            print(f"{job['id']}  {job['status']:<8} {job['renderer']:<10} p{job['priority']:<4} "
+                  f"{job['request'].get('title')}  {job.get('result') or job.get('error') or ''}")
+        return
+    logging.basicConfig(level=logging.INFO)
+    RenderWorker(queue).run(concurrency=args.concurrency, stop_when_idle=args.once)
+
+
+if __name__ == "__main__":
+    main()
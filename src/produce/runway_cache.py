@@ -0,0 +1,144 @@
+"""
+Cache backends for RunwayML generations
+
+A backend maps a request cache key to the completed job record and keeps a
+copy of the generated media. LocalRunwayCache stores a JSON metadata index
+next to blobs in the content-addressed media store; GCSRunwayCache keeps the
+original bucket layout.
+"""
+import os
+import json
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .media_store import MediaStore, get_media_store
+
+RUNWAY_CACHE_DIR = os.getenv("RUNWAY_CACHE_DIR", "./.cache/runway")
+
+
+class RunwayCacheBackend(ABC):
+    """Interface for Runway result caches"""
+
+    @abstractmethod
+    async def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return {'job_id', 'job_type', 'result_url', 'metadata'} for a key, if cached
+
+        result_url points at the cached copy, never at the provider's expiring URL.
+        """
+
+    @abstractmethod
+    async def put(self, cache_key: str, record: Dict[str, Any]) -> Optional[str]:
+        """Store a completed job; returns the URL callers should use from now on"""
+
+
+class LocalRunwayCache(RunwayCacheBackend):
+    """Filesystem cache: metadata index plus media blobs in a MediaStore"""
+
+    def __init__(self,
+                 root: str = RUNWAY_CACHE_DIR,
+                 media_store: Optional[MediaStore] = None,
+                 http_client: Optional[httpx.Client] = None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / "index.json"
+        self.media_store = media_store or get_media_store()
+        self.http_client = http_client
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(self._index, handle)
+        os.replace(tmp_path, self.index_path)
+
+    async def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._index.get(cache_key)
+        if not record:
+            return None
+        # Provider URLs expire; a record whose blob was evicted is a miss
+        path = self.media_store.local_path(record["source_url"])
+        if not path:
+            with self._lock:
+                self._index.pop(cache_key, None)
+                self._save_index()
+            return None
+        return dict(record, result_url=self._stored_url(record["source_url"], path), local_path=str(path))
+
+    async def put(self, cache_key: str, record: Dict[str, Any]) -> Optional[str]:
+        source_url = record["result_url"]
+        path = await asyncio.to_thread(self.media_store.fetch, source_url, self.http_client)
+        result_url = self._stored_url(source_url, path)
+        stored = dict(record, result_url=result_url, source_url=source_url, local_path=str(path))
+        with self._lock:
+            self._index[cache_key] = stored
+            self._save_index()
+        return result_url
+
+    def _stored_url(self, source_url: str, path: Path) -> str:
+        """Public mirror URL of the blob when configured, else its local path"""
+        return self.media_store.public_url(source_url) or str(path)
+
+
+class GCSRunwayCache(RunwayCacheBackend):
+    """Cache in the yta-runway-cache bucket (cache/<key>.json + videos/<key>.mp4)"""
+
+    def __init__(self, bucket_name: str = "yta-runway-cache", http_client: Any = None):
+        from google.cloud import storage
+
+        self.bucket_name = bucket_name
+        self.bucket = storage.Client().bucket(bucket_name)
+        self.http_client = http_client
+
+    async def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        blob = self.bucket.blob(f"cache/{cache_key}.json")
+        if blob.exists():
+            return json.loads(blob.download_as_text())
+        return None
+
+    async def put(self, cache_key: str, record: Dict[str, Any]) -> Optional[str]:
+        # Copy the video first: the record must point at the bucket, not the expiring provider URL
+        try:
+            video_blob_name = f"videos/{cache_key}.mp4"
+            async with self.http_client.stream("GET", record["result_url"]) as response:
+                response.raise_for_status()
+                self.bucket.blob(video_blob_name).upload_from_string(
+                    await response.aread(),
+                    content_type="video/mp4"
+                )
+        except Exception as e:
+            print(f"Warning: Failed to cache video file: {e}")
+            return None
+
+        result_url = f"gs://{self.bucket_name}/{video_blob_name}"
+        self.bucket.blob(f"cache/{cache_key}.json").upload_from_string(
+            json.dumps(dict(record, result_url=result_url, source_url=record["result_url"])),
+            content_type="application/json"
+        )
+        return result_url
+
+
+def create_runway_cache(http_client: Any = None) -> Optional[RunwayCacheBackend]:
+    """Backend from RUNWAY_CACHE_BACKEND: local (default), gcs or none"""
+    backend = os.getenv("RUNWAY_CACHE_BACKEND", "local").lower()
+    if backend == "none":
+        return None
+    if backend == "gcs":
+        try:
+            return GCSRunwayCache(http_client=http_client)
+        except Exception as e:
+            print(f"Warning: GCS caching disabled, using local cache: {e}")
+    return LocalRunwayCache()
@@ -10,10 +10,12 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 import backoff
-from google.cloud import storage
 import hashlib
 import json
 
+from .render_poller import RenderJobFailed, get_render_poller
+from .runway_cache import RunwayCacheBackend, create_runway_cache
+
 
 class RunwayAssetType(Enum):
     """RunwayML asset generation types"""
@@ -41,12 +43,13 @@ class RunwayMLClient:
     """
     Production-ready RunwayML API client with:
     - Exponential backoff retry logic
-    - GCS caching for results
+    - Pluggable result cache (local filesystem by default)
+    - In-flight coalescing of identical requests
     - Job status polling
     - Error handling
     """
 
-    def __init__(self):
+    def __init__(self, cache: Optional[RunwayCacheBackend] = None):
         """Initialize RunwayML client with API credentials"""
         self.api_key = os.environ.get('RUNWAY_API_KEY')
         if not self.api_key:
@@ -61,13 +64,12 @@ class RunwayMLClient:
             timeout=30.0
         )
 
-        # GCS for caching
-        try:
-            self.gcs_client = storage.Client()
-            self.cache_bucket = self.gcs_client.bucket('yta-runway-cache')
-        except Exception as e:
-            print(f"Warning: GCS caching disabled: {e}")
-            self.cache_bucket = None
+        # Result cache (RUNWAY_CACHE_BACKEND=local|gcs|none)
+        self.cache = cache if cache is not None else create_runway_cache(self.client)
+
+        # Submissions and cache writes shared by identical concurrent requests
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._cache_writes: Dict[str, asyncio.Task] = {}
 
     @backoff.on_exception(backoff.expo, httpx.HTTPError, max_tries=3)
     async def generate_video(self,
@@ -90,11 +92,7 @@ class RunwayMLClient:
         # Add style modifiers for consistency
         enhanced_prompt = f"{prompt}, {style} style, cinematic lighting, high quality, 4K"
 
-        # Cache check
         cache_key = self._generate_cache_key(enhanced_prompt, duration, seed)
-        cached_result = await self._check_cache(cache_key)
-        if cached_result:
-            return cached_result
 
         # API request
         payload = {
@@ -108,24 +106,27 @@ class RunwayMLClient:
         if seed is not None:
             payload["seed"] = seed
 
-        response = await self.client.post(
-            f"{self.base_url}/gen3/turbo",
-            json=payload
-        )
+        async def _submit() -> RunwayJob:
+            response = await self.client.post(
+                f"{self.base_url}/gen3/turbo",
+                json=payload
+            )
+
+            response.raise_for_status()
+            data = response.json()
 
-        response.raise_for_status()
-        data = response.json()
+            return RunwayJob(
+                job_id=data.get("id", "unknown"),
+                status="processing",
+                job_type=RunwayAssetType.VIDEO_GEN,
+                metadata={
+                    "prompt": prompt,
+                    "duration": duration,
+                    "cache_key": cache_key
+                }
+            )
 
-        return RunwayJob(
-            job_id=data.get("id", "unknown"),
-            status="processing",
-            job_type=RunwayAssetType.VIDEO_GEN,
-            metadata={
-                "prompt": prompt,
-                "duration": duration,
-                "cache_key": cache_key
-            }
-        )
+        return await self._submit_once(cache_key, _submit)
 
     async def enhance_video(self,
                            video_url: str,
@@ -167,20 +168,25 @@ class RunwayMLClient:
                 "style": style
             })
 
-        response = await self.client.post(
-            f"{self.base_url}/enhance",
-            json=payload
-        )
+        cache_key = self._generate_cache_key("enhance", payload)
 
-        response.raise_for_status()
-        data = response.json()
+        async def _submit() -> RunwayJob:
+            response = await self.client.post(
+                f"{self.base_url}/enhance",
+                json=payload
+            )
 
-        return RunwayJob(
-            job_id=data.get("id"),
-            status="processing",
-            job_type=RunwayAssetType.UPSCALE,
-            metadata={"input": video_url, "operations": payload["operations"]}
-        )
+            response.raise_for_status()
+            data = response.json()
+
+            return RunwayJob(
+                job_id=data.get("id"),
+                status="processing",
+                job_type=RunwayAssetType.UPSCALE,
+                metadata={"input": video_url, "operations": payload["operations"], "cache_key": cache_key}
+            )
+
+        return await self._submit_once(cache_key, _submit)
 
     async def compose_final(self,
                            video_segments: List[str],
@@ -211,69 +217,93 @@ class RunwayMLClient:
             }
         }
 
-        response = await self.client.post(
-            f"{self.base_url}/compose",
-            json=payload
-        )
+        cache_key = self._generate_cache_key("compose", payload)
 
-        response.raise_for_status()
-        data = response.json()
+        async def _submit() -> RunwayJob:
+            response = await self.client.post(
+                f"{self.base_url}/compose",
+                json=payload
+            )
 
-        return RunwayJob(
-            job_id=data.get("id"),
-            status="processing",
-            job_type=RunwayAssetType.COMPOSE,
-            metadata={"segments": len(video_segments)}
-        )
+            response.raise_for_status()
+            data = response.json()
+
+            return RunwayJob(
+                job_id=data.get("id"),
+                status="processing",
+                job_type=RunwayAssetType.COMPOSE,
+                metadata={"segments": len(video_segments), "cache_key": cache_key}
+            )
+
+        return await self._submit_once(cache_key, _submit)
+
+    async def _submit_once(self, cache_key: str, submit) -> RunwayJob:
+        """Serve from cache, join an identical in-flight job, or submit a new one"""
+        cached = await self._check_cache(cache_key)
+        if cached:
+            return cached
+
+        pending = self._inflight.get(cache_key)
+        if pending is None:
+            pending = asyncio.ensure_future(submit())
+            self._inflight[cache_key] = pending
+
+            def _drop_failed(future: asyncio.Future):
+                if future.cancelled() or future.exception() is not None:
+                    self._inflight.pop(cache_key, None)
+
+            pending.add_done_callback(_drop_failed)
+        return await asyncio.shield(pending)
 
     async def wait_for_completion(self,
                                  job: RunwayJob,
                                  timeout: int = 300,
                                  poll_interval: float = 2.0) -> RunwayJob:
         """
-        Poll for job completion with exponential backoff
+        Wait for job completion on the shared render poller
 
         Args:
             job: RunwayJob to monitor
             timeout: Maximum wait time in seconds
-            poll_interval: Initial poll interval
+            poll_interval: Unused; the poller adapts its interval per job
 
         Returns:
             Completed RunwayJob with result URL
         """
-        start = asyncio.get_event_loop().time()
-        current_interval = poll_interval
-
-        while asyncio.get_event_loop().time() - start < timeout:
-            response = await self.client.get(f"{self.base_url}/jobs/{job.job_id}")
+        if job.status == "completed" and job.result_url:
+            # Served from cache
+            return job
 
-            if response.status_code == 404:
+        try:
+            data = await get_render_poller().wait_async(
+                "runway",
+                job.job_id,
+                f"{self.base_url}/jobs/{job.job_id}",
+                headers=dict(self.client.headers),
+                timeout=timeout,
+                metadata={"job_type": job.job_type.name},
+            )
+        except RenderJobFailed as e:
+            if e.data.get("status") == "not_found":
                 # Job not found, might be cached
                 if job.metadata and job.metadata.get("cache_key"):
                     cached = await self._check_cache(job.metadata["cache_key"])
                     if cached:
                         return cached
                 raise Exception(f"Job {job.job_id} not found")
-
-            response.raise_for_status()
-            data = response.json()
-
-            job.status = data.get("status", "unknown")
-
-            if job.status == "completed":
-                job.result_url = data.get("output_url")
-                # Cache successful result
-                if job.result_url and job.metadata and job.metadata.get("cache_key"):
-                    await self._cache_result(job)
-                return job
-            elif job.status == "failed":
-                job.error = data.get("error", "Unknown error")
-                raise Exception(f"Job failed: {job.error}")
-
-            await asyncio.sleep(current_interval)
-            current_interval = min(current_interval * 1.5, 30)  # Exponential backoff
-
-        raise TimeoutError(f"Job {job.job_id} timed out after {timeout}s")
+            job.status = e.data.get("status", "failed")
+            job.error = e.data.get("error", "Unknown error")
+            self._release(job)
+            raise Exception(f"Job failed: {job.error}")
+        except TimeoutError:
+            self._release(job)
+            raise TimeoutError(f"Job {job.job_id} timed out after {timeout}s")
+
+        job.status = data.get("status", "completed")
+        job.result_url = data.get("output_url")
+        # Cache successful result
+        await self._cache_result(job)
+        return job
 
     def _generate_cache_key(self, *args) -> str:
         """Generate cache key from parameters"""
@@ -282,64 +312,56 @@ class RunwayMLClient:
 
     async def _check_cache(self, cache_key: str) -> Optional[RunwayJob]:
         """Check if result exists in cache"""
-        if not self.cache_bucket:
+        if not self.cache:
             return None
 
-        blob_name = f"cache/{cache_key}.json"
-        blob = self.cache_bucket.blob(blob_name)
-
-        if blob.exists():
-            data = json.loads(blob.download_as_text())
-            return RunwayJob(
-                job_id=data["job_id"],
-                status="completed",
-                job_type=RunwayAssetType[data["job_type"]],
-                result_url=data["result_url"],
-                metadata=data.get("metadata")
-            )
+        data = await self.cache.get(cache_key)
+        if not data:
+            return None
 
-        return None
+        return RunwayJob(
+            job_id=data["job_id"],
+            status="completed",
+            job_type=RunwayAssetType[data["job_type"]],
+            result_url=data["result_url"],
+            metadata=data.get("metadata")
+        )
 
     async def _cache_result(self, job: RunwayJob):
-        """Cache successful result in GCS"""
-        if not self.cache_bucket or not job.result_url:
+        """Cache a completed job once, however many callers waited on it"""
+        cache_key = (job.metadata or {}).get("cache_key")
+        if not self.cache or not job.result_url or not cache_key:
+            self._release(job)
             return
 
-        cache_key = job.metadata.get("cache_key")
-        if not cache_key:
-            return
-
-        # Save job data
-        blob_name = f"cache/{cache_key}.json"
-        blob = self.cache_bucket.blob(blob_name)
+        write = self._cache_writes.get(cache_key)
+        if write is None:
+            write = asyncio.ensure_future(self._write_cache(cache_key, job))
+            self._cache_writes[cache_key] = write
+        await write
 
-        cache_data = {
+    async def _write_cache(self, cache_key: str, job: RunwayJob):
+        record = {
             "job_id": job.job_id,
             "job_type": job.job_type.name,
             "result_url": job.result_url,
             "metadata": job.metadata
         }
-
-        blob.upload_from_string(
-            json.dumps(cache_data),
-            content_type="application/json"
-        )
-
-        # Also download and cache the actual video
         try:
-            video_blob_name = f"videos/{cache_key}.mp4"
-            video_blob = self.cache_bucket.blob(video_blob_name)
-
-            async with self.client.stream("GET", job.result_url) as response:
-                video_blob.upload_from_string(
-                    await response.aread(),
-                    content_type="video/mp4"
-                )
-
-            # Update job with cached URL
-            job.result_url = f"gs://yta-runway-cache/{video_blob_name}"
+            cached_url = await self.cache.put(cache_key, record)
+            if cached_url:
+                job.result_url = cached_url
         except Exception as e:
-            print(f"Warning: Failed to cache video file: {e}")
+            print(f"Warning: Failed to cache Runway result: {e}")
+        finally:
+            self._cache_writes.pop(cache_key, None)
+            self._release(job)
+
+    def _release(self, job: RunwayJob):
+        """Stop coalescing new requests onto a settled job"""
+        cache_key = (job.metadata or {}).get("cache_key")
+        if cache_key:
+            self._inflight.pop(cache_key, None)
 
     async def close(self):
         """Clean up client connections"""
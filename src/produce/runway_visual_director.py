@@ -3,7 +3,9 @@ RunwayML Visual Director
 Implements Director's visual protocol with AI-powered scene generation
 """
 
-from typing import Dict, List, Optional, Any
+import os
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Any
 from dataclasses import dataclass
 import re
 from .runway_client import RunwayMLClient, RunwayJob
@@ -28,9 +30,13 @@ class RunwayVisualDirector:
     - Seamless integration
     """
 
-    def __init__(self):
+    def __init__(self, max_runway_jobs: Optional[int] = None):
         """Initialize visual director with RunwayML client"""
         self.client = RunwayMLClient()
+        # Global budget of Runway jobs in flight across all segments
+        self.max_runway_jobs = max_runway_jobs or int(os.environ.get("RUNWAY_MAX_CONCURRENT_JOBS", "4"))
+        self._job_slots: Optional[asyncio.Semaphore] = None
+        self._job_slots_loop = None
         self.logo_registry = self._load_logo_registry()
         self.style_guide = self._load_style_guide()
 
@@ -52,40 +58,92 @@ class RunwayVisualDirector:
             "transitions": []
         }
 
+        # Layers are independent; run them together and keep layer order
+        visual_plan["layers"] = list(await asyncio.gather(*self._layer_jobs(segment, timing)))
+
+        # Add transitions between segments
+        visual_plan["transitions"] = self._plan_transitions(segment)
+
+        return visual_plan
+
+    async def direct_all(self,
+                         segments: List[Dict],
+                         timings: Optional[List[Dict]] = None,
+                         on_plan: Optional[Callable[[int, Dict], None]] = None) -> List[Dict]:
+        """
+        Direct every segment concurrently under the global Runway job budget
+
+        Args:
+            segments: Shot list segments
+            timings: Per-segment timing (defaults to each segment's duration)
+            on_plan: Called with (index, plan) as each segment's layers finish
+
+        Returns:
+            Visual plans in segment order
+
+        Raises:
+            ValueError: if timings and segments differ in length
+        """
+        if timings is None:
+            timings = [{"duration": segment.get("duration", 5.0)} for segment in segments]
+        elif len(timings) != len(segments):
+            raise ValueError(f"Got {len(timings)} timings for {len(segments)} segments")
+
+        async def _direct(index: int, segment: Dict, timing: Dict) -> Dict:
+            plan = await self.direct_segment(segment, timing)
+            if on_plan:
+                on_plan(index, plan)
+            return plan
+
+        return list(await asyncio.gather(*(
+            _direct(index, segment, timing)
+            for index, (segment, timing) in enumerate(zip(segments, timings))
+        )))
+
+    def _layer_jobs(self, segment: Dict, timing: Dict) -> List[Awaitable[VisualLayer]]:
+        """Layer coroutines for a segment, in composition order"""
+        jobs = []
+
         # Layer 1: Base B-roll (Generated or Enhanced)
-        base_layer = await self._create_base_layer(segment, timing)
-        visual_plan["layers"].append(base_layer)
+        jobs.append(self._create_base_layer(segment, timing))
 
         # Layer 2: Logo Overlays (First Mentions)
         entities = self._extract_entities(segment)
         if entities:
-            logo_layer = await self._create_logo_layer(entities, timing)
-            visual_plan["layers"].append(logo_layer)
+            jobs.append(self._create_logo_layer(entities, timing))
 
         # Layer 3: Text Overlays (Keywords, Data Points)
         text_elements = self._extract_text_elements(segment)
         if text_elements:
-            text_layer = await self._create_text_layer(text_elements, timing)
-            visual_plan["layers"].append(text_layer)
+            jobs.append(self._create_text_layer(text_elements, timing))
 
         # Layer 4: Screenshot Enhancement
         if segment.get("source_url"):
-            screenshot_layer = await self._enhance_screenshot(
+            jobs.append(self._enhance_screenshot(
                 segment["source_url"],
                 segment.get("highlight_text"),
                 timing
-            )
-            visual_plan["layers"].append(screenshot_layer)
+            ))
 
         # Layer 5: Picture-in-Picture if needed
         if self._needs_pip(segment):
-            pip_layer = await self._create_pip_layout(segment, timing)
-            visual_plan["layers"].append(pip_layer)
+            jobs.append(self._create_pip_layout(segment, timing))
 
-        # Add transitions between segments
-        visual_plan["transitions"] = self._plan_transitions(segment)
+        return jobs
 
-        return visual_plan
+    def _runway_slots(self) -> asyncio.Semaphore:
+        """Semaphore bounding Runway jobs, rebuilt per event loop"""
+        loop = asyncio.get_running_loop()
+        if self._job_slots is None or self._job_slots_loop is not loop:
+            self._job_slots = asyncio.Semaphore(self.max_runway_jobs)
+            self._job_slots_loop = loop
+        return self._job_slots
+
+    async def _run_runway_job(self, submit: Callable[[], Awaitable[RunwayJob]]) -> RunwayJob:
+        """Submit a Runway job and wait for it while holding a budget slot"""
+        async with self._runway_slots():
+            job = await submit()
+            return await self.client.wait_for_completion(job)
 
     async def _create_base_layer(self, segment: Dict, timing: Dict) -> VisualLayer:
         """
@@ -107,14 +165,12 @@ class RunwayVisualDirector:
             # Generate B-roll with AI
             prompt = self._build_visual_prompt(segment)
 
-            job = await self.client.generate_video(
+            completed_job = await self._run_runway_job(lambda: self.client.generate_video(
                 prompt=prompt,
                 duration=timing["duration"],
                 style="futuristic tech documentary",
                 seed=42  # Consistency across regenerations
-            )
-
-            completed_job = await self.client.wait_for_completion(job)
+            ))
 
             return VisualLayer(
                 layer_type="base_video",
@@ -133,13 +189,12 @@ class RunwayVisualDirector:
 
             # Enhance if needed
             if asset.get("quality", "medium") == "low":
-                enhance_job = await self.client.enhance_video(
+                enhanced = await self._run_runway_job(lambda: self.client.enhance_video(
                     video_url=asset["url"],
                     upscale=True,
                     stabilize=True,
                     style="cinematic_tech"
-                )
-                enhanced = await self.client.wait_for_completion(enhance_job)
+                ))
                 video_url = enhanced.result_url
             else:
                 video_url = asset["url"]
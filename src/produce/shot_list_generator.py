@@ -10,6 +10,8 @@ from typing import List, Dict, Tuple
 import subprocess
 import os
 
+from ..utils.metrics import track_llm_call
+
 class ShotListGenerator:
     """Generate detailed shot lists for video production"""
     
@@ -88,14 +90,16 @@ Now, using this framework, process the following raw script into a complete shot
             prompt = self.UNIVERSAL_TEMPLATE + script
             
             # Call OpenAI API with GPT-5
-            response = client.chat.completions.create(
-                model="gpt-5",  # Using GPT-5 for advanced shot list generation
-                messages=[
-                    {"role": "system", "content": "You are a professional video producer specializing in fast-paced news content. Generate detailed shot lists with specific B-roll descriptions."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_completion_tokens=4000
-            )
+            with track_llm_call("shot_list", "gpt-5") as call:
+                response = client.chat.completions.create(
+                    model="gpt-5",  # Using GPT-5 for advanced shot list generation
+                    messages=[
+                        {"role": "system", "content": "You are a professional video producer specializing in fast-paced news content. Generate detailed shot lists with specific B-roll descriptions."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_completion_tokens=4000
+                )
+                call.usage(getattr(response, "usage", None))
             
             # Parse the response
             shot_list = self._parse_markdown_table(response.choices[0].message.content)
@@ -3,10 +3,11 @@ Shotstack API integration for professional video generation
 More control and cost-effective than Pictory for templated content
 """
 import os
-import time
 import httpx
 from typing import Dict, List, Optional
 
+from .render_poller import RenderJobFailed, get_render_poller
+
 class ShotstackAPI:
     def __init__(self):
         self.api_key = os.getenv("SHOTSTACK_API_KEY")
@@ -197,29 +198,20 @@ class ShotstackAPI:
         return {"clips": clips}
     
     def _wait_for_render(self, render_id: str, timeout: int = 300) -> str:
-        """Poll for render completion"""
-        headers = {"x-api-key": self.api_key}
-        start_time = time.time()
-        
-        with httpx.Client() as client:
-            while time.time() - start_time < timeout:
-                response = client.get(
-                    f"{self.base_url}/render/{render_id}",
-                    headers=headers
-                )
-                response.raise_for_status()
-                data = response.json()["response"]
-                
-                status = data["status"]
-                if status == "done":
-                    return data["url"]
-                elif status == "failed":
-                    raise Exception(f"Render failed: {data.get('error')}")
-                
-                print(f"Render status: {status}, progress: {data.get('renderProgress', 0)}%")
-                time.sleep(5)
-                
-        raise Exception("Render timeout")
+        """Wait on the shared render poller for completion"""
+        try:
+            data = get_render_poller().wait(
+                "shotstack",
+                render_id,
+                f"{self.base_url}/render/{render_id}",
+                headers={"x-api-key": self.api_key},
+                timeout=timeout,
+            )
+        except RenderJobFailed as e:
+            raise Exception(f"Render failed: {e.data.get('error')}")
+        except TimeoutError:
+            raise Exception("Render timeout")
+        return data["url"]
 
 # Example usage:
 if __name__ == "__main__":
@@ -7,16 +7,20 @@ Creates fast-paced videos with 4-7 second cuts and professional transitions
 import os
 import sys
 import json
-import time
 import requests
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import random
 
+from .media_store import MediaStore, get_media_store, MEDIA_PUBLIC_BASE_URL
+from .render_poller import RenderJobFailed, get_render_poller
+from .shotstack_timeline import IncrementalRenderer
+from .voiceover_alignment import VoiceoverAlignment
+
 class ShotstackDynamic:
     """Dynamic timeline builder for Shotstack with enhanced pacing"""
     
-    def __init__(self):
+    def __init__(self, media_store: Optional[MediaStore] = None):
         """Initialize Shotstack Dynamic with API configuration"""
         self.api_key = os.environ.get('SHOTSTACK_API_KEY')
         if not self.api_key:
@@ -30,6 +34,11 @@ class ShotstackDynamic:
             "Content-Type": "application/json"
         }
         
+        # Content-addressed mirror for stock clips (only useful when publicly served)
+        if media_store is None and MEDIA_PUBLIC_BASE_URL:
+            media_store = get_media_store()
+        self.media_store = media_store
+        
         # Professional transitions for different styles (Shotstack-supported)
         self.transitions = {
             'Cinematic': ['fade', 'wipeLeft', 'wipeRight', 'slideLeft'],
@@ -49,7 +58,8 @@ class ShotstackDynamic:
     def build_dynamic_timeline(self, 
                               shot_list: List[Dict], 
                               voiceover_url: str,
-                              total_duration: float) -> Dict:
+                              total_duration: float,
+                              alignment: Optional[VoiceoverAlignment] = None) -> Dict:
         """
         Build a dynamic timeline with fast-paced cuts
         
@@ -57,6 +67,8 @@ class ShotstackDynamic:
             shot_list: List of shot segments with assets and timing
             voiceover_url: URL of the voiceover audio
             total_duration: Total duration of the video
+            alignment: Measured voiceover timing; when given, clip starts and
+                lengths follow the narration instead of estimated durations
             
         Returns:
             Shotstack timeline specification
@@ -67,6 +79,7 @@ class ShotstackDynamic:
         graphics_clips = []
         
         current_time = 0
+        self.prefetch_assets(shot_list)
         
         for segment_idx, segment in enumerate(shot_list):
             shots = segment.get('shots', [])
@@ -78,6 +91,12 @@ class ShotstackDynamic:
             # Calculate duration per shot (4-7 seconds ideal)
             shot_duration = min(7, max(4, segment_duration / len(shots)))
             
+            slots = None
+            if alignment is not None:
+                # Only shots with a usable asset get screen time
+                usable = [shot for shot in shots if shot.get('assets') and self._asset_url(shot['assets'][0])]
+                slots = iter(alignment.shot_slots(segment_idx, len(usable)))
+            
             for shot_idx, shot in enumerate(shots):
                 # Get best asset for this shot
                 assets = shot.get('assets', [])
@@ -85,11 +104,18 @@ class ShotstackDynamic:
                     continue
                 
                 asset = assets[0]  # Use best ranked asset
-                asset_url = asset.get('cached_url', asset.get('url'))
+                asset_url = self._asset_url(asset)
                 
                 if not asset_url:
                     continue
                 
+                if slots is not None:
+                    current_time, shot_duration = next(slots)
+                    if broll_clips:
+                        # Close any gap left by a segment without usable shots
+                        previous = broll_clips[-1]
+                        previous['length'] = round(current_time - previous['start'], 3)
+                
                 # Create B-roll clip
                 clip = self._create_dynamic_clip(
                     asset_url=asset_url,
@@ -126,6 +152,12 @@ class ShotstackDynamic:
                 
                 current_time += shot_duration
         
+        if alignment is not None:
+            # End card follows the narration, not the estimated shot total
+            current_time = alignment.duration
+            if broll_clips:
+                broll_clips[-1]['length'] = round(current_time - broll_clips[-1]['start'], 3)
+        
         # Add end card
         end_card = self._create_end_card(
             start_time=current_time,
@@ -184,6 +216,25 @@ class ShotstackDynamic:
         
         return timeline
     
+    def prefetch_assets(self, shot_list: List[Dict]):
+        """Pull the best asset of each shot into the media store"""
+        if not self.media_store:
+            return
+        urls = [
+            shot['assets'][0]['url']
+            for segment in shot_list
+            for shot in segment.get('shots', [])
+            if shot.get('assets') and shot['assets'][0].get('url')
+        ]
+        self.media_store.prefetch(urls)
+    
+    def _asset_url(self, asset: Dict) -> Optional[str]:
+        """Prefer the stable content-addressed mirror URL over the source URL"""
+        asset_url = asset.get('cached_url', asset.get('url'))
+        if asset_url and self.media_store and asset.get('url'):
+            return self.media_store.public_url(asset['url']) or asset_url
+        return asset_url
+    
     def _create_dynamic_clip(self, asset_url: str, asset_type: str, start_time: float,
                             duration: float, style: str, shot_index: int, 
                             segment_index: int) -> Dict:
@@ -205,25 +256,28 @@ class ShotstackDynamic:
             }
         }
         
+        # Varied but stable per clip, so rebuilt timelines diff cleanly
+        rng = random.Random(f"{segment_index}:{shot_index}:{asset_url}")
+        
         # Add transition based on style
         transitions = self.transitions.get(style, ['fade'])
         if shot_index == 0:
             # First shot of segment gets a fade in
             clip["transition"] = {
                 "in": "fade",
-                "out": random.choice(transitions)
+                "out": rng.choice(transitions)
             }
         else:
             # Other shots get varied transitions
             clip["transition"] = {
-                "in": random.choice(transitions),
-                "out": random.choice(transitions)
+                "in": rng.choice(transitions),
+                "out": rng.choice(transitions)
             }
         
         # Add effect based on style
         effects = self.effects.get(style)
         if effects and asset_type == "image":
-            clip["effect"] = random.choice(effects)
+            clip["effect"] = rng.choice(effects)
         
         # Add filter for cinematic style (using Shotstack string filters)
         if style == "Cinematic":
@@ -426,6 +480,21 @@ class ShotstackDynamic:
         else:
             raise Exception(f"Render submission failed: {response.text}")
     
+    def render_incremental(self, timeline: Dict, previous_timeline: Optional[Dict] = None,
+                           timeout: int = 300) -> Dict:
+        """
+        Render only segments whose clips changed since earlier renders
+        
+        Args:
+            timeline: Shotstack timeline specification
+            previous_timeline: Last rendered timeline, used to report changed ranges
+            timeout: Maximum wait per render in seconds
+            
+        Returns:
+            Dict with final 'url', per-segment details and rendered/reused counts
+        """
+        return IncrementalRenderer(self).render(timeline, previous_timeline, timeout=timeout)
+    
     def get_render_status(self, render_id: str) -> Dict:
         """Get the status of a render job"""
         response = requests.get(
@@ -449,23 +518,20 @@ class ShotstackDynamic:
         Returns:
             URL of the rendered video
         """
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            status = self.get_render_status(render_id)
-            
-            if status['status'] == 'done':
-                return status['url']
-            elif status['status'] == 'failed':
-                raise Exception(f"Render failed: {status.get('error', 'Unknown error')}")
-            
-            # Show progress
-            progress = status.get('renderTime', 0)
-            print(f"Render progress: {progress}% - Status: {status['status']}")
-            
-            time.sleep(5)
-        
-        raise Exception(f"Render timeout after {timeout} seconds")
+        try:
+            status = get_render_poller().wait(
+                "shotstack",
+                render_id,
+                f"{self.api_url}/render/{render_id}",
+                headers=self.headers,
+                timeout=timeout,
+            )
+        except RenderJobFailed as e:
+            raise Exception(f"Render failed: {e.data.get('error', 'Unknown error')}")
+        except TimeoutError:
+            raise Exception(f"Render timeout after {timeout} seconds")
+        
+        return status['url']
 
 
 if __name__ == "__main__":
@@ -3,11 +3,13 @@ Enhanced Shotstack integration combining TimelineSpec compatibility with profess
 Merges existing driver with advanced news video features
 """
 import os
-import time
 import json
 import httpx
 from typing import Dict, List, Optional, Union
 
+from .media_store import get_media_store
+from .render_poller import RenderJobFailed, get_render_poller
+
 SHOTSTACK_HOST = os.getenv("SHOTSTACK_HOST", "https://api.shotstack.io/v1")
 SHOTSTACK_API_KEY = os.getenv("SHOTSTACK_API_KEY")
 
@@ -404,34 +406,20 @@ class ShotstackEnhanced:
             return response.json().get("response", {}).get("id")
     
     def _poll_render(self, render_id: str, poll_interval: int = 5, timeout: int = 120) -> dict:
-        """Poll render status until complete"""
-        headers = {"x-api-key": self.api_key}
-        start_time = time.time()
-        
-        with httpx.Client(timeout=60) as client:
-            while time.time() - start_time < timeout:
-                response = client.get(
-                    f"{self.base_url}/render/{render_id}",
-                    headers=headers
-                )
-                if response.status_code >= 300:
-                    raise RuntimeError(f"Status check failed: {response.status_code}")
-                
-                data = response.json().get("response", {})
-                status = data.get("status")
-                
-                if status == "done":
-                    # For done status, the URL should be available
-                    return data
-                elif status in ("failed", "cancelled"):
-                    return data
-                
-                # Show progress
-                progress = data.get("renderProgress", 0)
-                print(f"Render progress: {progress}% - Status: {status}")
-                time.sleep(poll_interval)
-        
-        raise RuntimeError("Render polling timeout")
+        """Wait on the shared render poller until the render settles"""
+        try:
+            return get_render_poller().wait(
+                "shotstack",
+                render_id,
+                f"{self.base_url}/render/{render_id}",
+                headers={"x-api-key": self.api_key},
+                timeout=timeout,
+            )
+        except RenderJobFailed as e:
+            # Callers inspect the failed/cancelled payload themselves
+            return e.data
+        except TimeoutError:
+            raise RuntimeError("Render polling timeout")
     
     def _download_result(self, data: dict, output_path: str) -> str:
         """Download rendered video"""
@@ -439,14 +427,7 @@ class ShotstackEnhanced:
         if not url:
             raise RuntimeError("No output URL in render response")
         
-        with httpx.Client(timeout=600) as client:
-            with client.stream("GET", url) as response:
-                response.raise_for_status()
-                with open(output_path, "wb") as f:
-                    for chunk in response.iter_bytes():
-                        f.write(chunk)
-        
-        return output_path
+        return get_media_store().materialize(url, output_path)
 
 # Convenience functions for backward compatibility
 def render_with_shotstack(spec: dict, out_path: str):
@@ -0,0 +1,316 @@
+"""
+Timeline model, clip-level diffing and partial re-render for Shotstack
+
+A Shotstack edit is split into segments at cut points no clip straddles.
+Each segment is rendered on its own and cached by a content fingerprint, so
+after an edit only segments whose clips changed are rendered again; the
+final video is a cheap stitch of segment renders.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from .media_store import MEDIA_PUBLIC_BASE_URL, MediaStore, get_media_store
+
+SEGMENT_CACHE_PATH = os.getenv("SHOTSTACK_SEGMENT_CACHE", "./.cache/shotstack_segments.json")
+# Shotstack deletes render output after 24 hours; stop reusing its URLs well before that
+SEGMENT_URL_TTL = float(os.getenv("SHOTSTACK_SEGMENT_TTL", str(20 * 3600)))
+
+# Segments shorter than this are merged forward to keep render overhead down
+DEFAULT_SEGMENT_SECONDS = 15.0
+
+
+def _fingerprint(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class TimelineClip:
+    """One clip on one track, with a content fingerprint"""
+    track: int
+    start: float
+    length: float
+    spec: str  # canonical JSON of the clip
+
+    @property
+    def end(self) -> float:
+        return self.start + self.length
+
+    @property
+    def key(self) -> str:
+        return _fingerprint([self.track, self.spec])
+
+    def as_dict(self) -> Dict[str, Any]:
+        return json.loads(self.spec)
+
+
+@dataclass
+class TimelineDiff:
+    """Clip-level difference between two timelines"""
+    added: List[TimelineClip] = field(default_factory=list)
+    removed: List[TimelineClip] = field(default_factory=list)
+    changed_ranges: List[Tuple[float, float]] = field(default_factory=list)
+    full: bool = False
+
+    @property
+    def unchanged(self) -> bool:
+        return not self.full and not self.added and not self.removed
+
+
+@dataclass
+class Timeline:
+    """Parsed Shotstack edit: clips per track plus global settings"""
+    clips: List[TimelineClip]
+    soundtrack: Optional[Dict[str, Any]]
+    background: Optional[str]
+    output: Dict[str, Any]
+
+    @classmethod
+    def from_shotstack(cls, edit: Dict[str, Any]) -> "Timeline":
+        body = edit.get("timeline", {})
+        clips = []
+        for track_idx, track in enumerate(body.get("tracks", [])):
+            for clip in track.get("clips", []):
+                clips.append(TimelineClip(
+                    track=track_idx,
+                    start=float(clip.get("start", 0)),
+                    length=float(clip.get("length") or 0),
+                    spec=json.dumps(clip, sort_keys=True),
+                ))
+        clips.sort(key=lambda c: (c.start, c.track))
+        return cls(clips, body.get("soundtrack"), body.get("background"), edit.get("output", {}))
+
+    @property
+    def duration(self) -> float:
+        return max((clip.end for clip in self.clips), default=0.0)
+
+    def globals_key(self) -> str:
+        return _fingerprint([self.soundtrack, self.background, self.output])
+
+    # Diffing ---------------------------------------------------------------
+
+    def diff(self, other: "Timeline") -> TimelineDiff:
+        """What changed going from self to other"""
+        if self.globals_key() != other.globals_key():
+            return TimelineDiff(full=True, changed_ranges=[(0.0, max(self.duration, other.duration))])
+
+        old_keys = {}
+        for clip in self.clips:
+            old_keys.setdefault(clip.key, []).append(clip)
+        added = []
+        for clip in other.clips:
+            bucket = old_keys.get(clip.key)
+            if bucket:
+                bucket.pop()
+            else:
+                added.append(clip)
+        removed = [clip for bucket in old_keys.values() for clip in bucket]
+        ranges = _merge_ranges([(clip.start, clip.end) for clip in added + removed])
+        return TimelineDiff(added=added, removed=removed, changed_ranges=ranges)
+
+    # Segmenting ------------------------------------------------------------
+
+    def cut_points(self) -> List[float]:
+        """Times no clip straddles, i.e. where the edit can be split"""
+        edges = sorted({0.0, self.duration, *(c.start for c in self.clips), *(c.end for c in self.clips)})
+        return [t for t in edges if not any(c.start < t < c.end for c in self.clips)]
+
+    def segments(self, min_seconds: float = DEFAULT_SEGMENT_SECONDS) -> List[Tuple[float, float]]:
+        cuts = self.cut_points()
+        bounds = []
+        start = 0.0
+        for cut in cuts[1:]:
+            if cut - start >= min_seconds or cut == cuts[-1]:
+                bounds.append((start, cut))
+                start = cut
+        if len(bounds) > 1 and bounds[-1][1] - bounds[-1][0] < min_seconds / 2:
+            # Fold a short tail into the previous segment
+            tail = bounds.pop()
+            bounds[-1] = (bounds[-1][0], tail[1])
+        return bounds or [(0.0, self.duration)]
+
+    def segment_edit(self, start: float, end: float) -> Dict[str, Any]:
+        """Standalone Shotstack edit for [start, end) with times rebased to 0"""
+        tracks: Dict[int, List[Dict[str, Any]]] = {}
+        for clip in self.clips:
+            if clip.start >= start and clip.end <= end and clip.length > 0:
+                spec = clip.as_dict()
+                spec["start"] = round(clip.start - start, 3)
+                tracks.setdefault(clip.track, []).append(spec)
+
+        ordered = [{"clips": tracks[idx]} for idx in sorted(tracks)]
+        if self.soundtrack and self.soundtrack.get("src"):
+            # Slice the voiceover so stitched segments play it continuously
+            asset = {"type": "audio", "src": self.soundtrack["src"], "trim": round(start, 3)}
+            if "volume" in self.soundtrack:
+                asset["volume"] = self.soundtrack["volume"]
+            effect = self._segment_effect(start, end)
+            if effect:
+                asset["effect"] = effect
+            ordered.append({"clips": [{"asset": asset, "start": 0, "length": round(end - start, 3)}]})
+
+        body: Dict[str, Any] = {"tracks": ordered}
+        if self.background:
+            body["background"] = self.background
+        return {"timeline": body, "output": self.output}
+
+    def _segment_effect(self, start: float, end: float) -> Optional[str]:
+        """Soundtrack fade for a slice: fade in only at the start, out only at the end"""
+        effect = (self.soundtrack or {}).get("effect")
+        if effect not in ("fadeIn", "fadeOut", "fadeInFadeOut"):
+            return effect
+        fade_in = effect in ("fadeIn", "fadeInFadeOut") and start <= 0
+        fade_out = effect in ("fadeOut", "fadeInFadeOut") and end >= self.duration
+        if fade_in and fade_out:
+            return "fadeInFadeOut"
+        return "fadeIn" if fade_in else "fadeOut" if fade_out else None
+
+    def segment_key(self, start: float, end: float) -> str:
+        return _fingerprint(self.segment_edit(start, end))
+
+
+def _merge_ranges(ranges: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    merged: List[Tuple[float, float]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def diff_timelines(old_edit: Dict[str, Any], new_edit: Dict[str, Any]) -> TimelineDiff:
+    """Clip-level diff of two Shotstack edits"""
+    return Timeline.from_shotstack(old_edit).diff(Timeline.from_shotstack(new_edit))
+
+
+class SegmentRenderCache:
+    """
+    Segment fingerprint -> rendered URL, persisted as JSON
+
+    Shotstack only keeps renders for a day, so its URLs are reused for at
+    most ``ttl`` seconds. With a public media mirror configured each render
+    is also copied into the MediaStore and its stable mirror URL is served
+    for as long as the blob stays in the store.
+    """
+
+    def __init__(self,
+                 path: str = SEGMENT_CACHE_PATH,
+                 media_store: Optional[MediaStore] = None,
+                 ttl: float = SEGMENT_URL_TTL,
+                 http_client: Optional[httpx.Client] = None):
+        self.path = Path(path)
+        if media_store is None and MEDIA_PUBLIC_BASE_URL:
+            media_store = get_media_store()
+        self.media_store = media_store if media_store is not None and media_store.public_base_url else None
+        self.ttl = ttl
+        self.http_client = http_client
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                self._entries = json.load(handle)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if not isinstance(entry, dict):
+            return None  # missing, or a bare URL written before expiry was tracked
+        if self.media_store:
+            mirrored = self.media_store.public_url(entry["source_url"])
+            if mirrored:
+                return mirrored
+        if time.time() - entry.get("rendered_at", 0) < self.ttl:
+            return entry["source_url"]
+        with self._lock:
+            self._entries.pop(key, None)
+            self._save()
+        return None
+
+    def put(self, key: str, url: str) -> str:
+        """Record a finished render; returns the URL to use for it"""
+        if self.media_store:
+            try:
+                self.media_store.fetch(url, self.http_client)
+            except httpx.HTTPError as e:
+                print(f"Warning: could not mirror segment render {url}: {e}")
+        with self._lock:
+            self._entries[key] = {"source_url": url, "rendered_at": time.time()}
+            self._save()
+        return self.get(key) or url
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(self._entries, handle)
+        os.replace(tmp_path, self.path)
+
+
+class IncrementalRenderer:
+    """Render a Shotstack edit as cached segments plus a stitch"""
+
+    def __init__(self, builder: Any, cache: Optional[SegmentRenderCache] = None,
+                 min_segment_seconds: float = DEFAULT_SEGMENT_SECONDS):
+        self.builder = builder
+        self.cache = cache or SegmentRenderCache()
+        self.min_segment_seconds = min_segment_seconds
+
+    def render(self, edit: Dict[str, Any], previous: Optional[Dict[str, Any]] = None,
+               timeout: int = 300) -> Dict[str, Any]:
+        """
+        Render only segments that are not cached, then stitch
+
+        Returns:
+            {'url', 'segments', 'rendered', 'reused', 'changed_ranges'}
+        """
+        timeline = Timeline.from_shotstack(edit)
+        bounds = timeline.segments(self.min_segment_seconds)
+        keys = [timeline.segment_key(start, end) for start, end in bounds]
+
+        # Submit every missing segment first so Shotstack renders them in parallel
+        submitted = {}
+        for (start, end), key in zip(bounds, keys):
+            if key not in submitted and not self.cache.get(key):
+                submitted[key] = self.builder.render_video(timeline.segment_edit(start, end))
+        for key, render_id in submitted.items():
+            self.cache.put(key, self.builder.wait_for_render(render_id, timeout=timeout))
+
+        segment_urls = [self.cache.get(key) for key in keys]
+        if len(segment_urls) == 1:
+            url = segment_urls[0]
+        else:
+            stitch_id = self.builder.render_video(self.stitch_edit(bounds, segment_urls, timeline.output))
+            url = self.builder.wait_for_render(stitch_id, timeout=timeout)
+
+        changed = (
+            Timeline.from_shotstack(previous).diff(timeline).changed_ranges
+            if previous is not None else [(0.0, timeline.duration)]
+        )
+        return {
+            "url": url,
+            "segments": [
+                {"start": start, "end": end, "key": key, "url": seg_url, "rendered": key in submitted}
+                for (start, end), key, seg_url in zip(bounds, keys, segment_urls)
+            ],
+            "rendered": len(submitted),
+            "reused": len(bounds) - sum(1 for key in keys if key in submitted),
+            "changed_ranges": changed,
+        }
+
+    @staticmethod
+    def stitch_edit(bounds: List[Tuple[float, float]], urls: List[str], output: Dict[str, Any]) -> Dict[str, Any]:
+        """Butt-join segment renders back into one video"""
+        clips = [
+            {"asset": {"type": "video", "src": url}, "start": round(start, 3), "length": round(end - start, 3)}
+            for (start, end), url in zip(bounds, urls)
+        ]
+        return {"timeline": {"background": "#000000", "tracks": [{"clips": clips}]}, "output": output}
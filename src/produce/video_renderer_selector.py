@@ -41,30 +41,48 @@ class VideoRendererSelector:
             Path to rendered video
         """
         
-        # Determine which renderer to use
+        renderer = self.choose_renderer(script, segments, prefer_shotstack)
+        try:
+            return self.render_with(renderer, script, title, segments, voiceover_url, output_path, style)
+        except Exception as e:
+            fallback = self.fallback_for(renderer)
+            if not fallback:
+                raise
+            logger.warning(f"{renderer.title()} render failed: {e}, falling back to {fallback.title()}")
+            return self.render_with(fallback, script, title, segments, voiceover_url, output_path, style)
+    
+    def choose_renderer(self, script: str, segments: List[Dict], prefer_shotstack: bool = True) -> str:
+        """Pick 'shotstack' or 'pictory' for a video"""
         use_shotstack = self._should_use_shotstack(
             script, segments, prefer_shotstack
         )
         
         if use_shotstack and self.shotstack_enabled:
-            try:
-                logger.info("Using Shotstack for video rendering (cost-effective)")
-                return self._render_with_shotstack(
-                    title, segments, voiceover_url, output_path, style
-                )
-            except Exception as e:
-                logger.warning(f"Shotstack render failed: {e}, falling back to Pictory")
-                if self.pictory_enabled:
-                    return self._render_with_pictory(script, title, output_path)
-                raise
-        
+            return "shotstack"
         elif self.pictory_enabled:
-            logger.info("Using Pictory for video rendering (advanced B-roll)")
-            return self._render_with_pictory(script, title, output_path)
-        
+            return "pictory"
         else:
             raise RuntimeError("No suitable video renderer available")
     
+    def fallback_for(self, renderer: str) -> Optional[str]:
+        """Renderer to retry with after a failure (Shotstack falls back to Pictory)"""
+        if renderer == "shotstack" and self.pictory_enabled:
+            return "pictory"
+        return None
+    
+    def render_with(self, renderer: str, script: str, title: str, segments: List[Dict],
+                    voiceover_url: str, output_path: str, style: str = "professional") -> str:
+        """Render synchronously with a specific renderer"""
+        if renderer == "shotstack":
+            logger.info("Using Shotstack for video rendering (cost-effective)")
+            return self._render_with_shotstack(
+                title, segments, voiceover_url, output_path, style
+            )
+        if renderer == "pictory":
+            logger.info("Using Pictory for video rendering (advanced B-roll)")
+            return self._render_with_pictory(script, title, output_path)
+        raise ValueError(f"Unknown renderer '{renderer}'")
+    
     def _should_use_shotstack(self, script: str, segments: List[Dict], 
                              prefer_shotstack: bool) -> bool:
         """
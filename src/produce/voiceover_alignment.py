@@ -0,0 +1,203 @@
+"""
+Align shot-list cuts to the actual voiceover audio
+
+Shot lists carry estimated durations (word counts / timestamps) that drift
+from the narration. This module measures the real voiceover instead: exact
+per-segment timings from the TTS engine when available, plus pauses found by
+silence detection on the decoded audio. Segment boundaries and shot cuts are
+then snapped to the nearest pause so cuts never land mid-sentence.
+"""
+import os
+import math
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..tts.audio import audio_duration, read_wav_samples
+
+SILENCE_THRESHOLD_DB = float(os.getenv("VO_SILENCE_THRESHOLD_DB", "-35"))
+MIN_SILENCE_SECONDS = float(os.getenv("VO_MIN_SILENCE_SECONDS", "0.2"))
+
+# How far (seconds) a proposed cut may move to reach a pause
+SNAP_WINDOW = 1.5
+WINDOW_SECONDS = 0.02
+
+
+def decode_audio(path: str) -> Optional[Tuple[array, int]]:
+    """
+    Mono 16-bit samples for a voiceover file
+
+    WAV is decoded with the standard library. MP3 is decoded with pydub and
+    ffmpeg (both in requirements/langgraph.lock and the Docker image); when
+    either is missing None is returned and callers fall back to the
+    frame-accurate duration plus TTS segment timings.
+    """
+    data = Path(path).read_bytes()
+    if data[:4] == b"RIFF":
+        return read_wav_samples(data)
+    try:
+        from pydub import AudioSegment
+    except ImportError:
+        print(f"Warning: pydub is not installed; skipping silence detection for {path}")
+        return None
+    try:
+        segment = AudioSegment.from_file(path).set_channels(1).set_sample_width(2)
+    except Exception as e:
+        print(f"Warning: cannot decode {path} for silence detection (is ffmpeg installed?): {e}")
+        return None
+    return array("h", segment.raw_data), segment.frame_rate
+
+
+def _window_levels(samples: array, window: int) -> List[float]:
+    """RMS level in dBFS for consecutive windows"""
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if np is not None:
+        usable = len(samples) // window * window
+        frames = np.frombuffer(samples, dtype=np.int16)[:usable].astype(np.float64).reshape(-1, window)
+        rms = np.sqrt((frames ** 2).mean(axis=1)) / 32768.0
+        return [20 * math.log10(value) if value > 0 else -120.0 for value in rms]
+
+    levels = []
+    for offset in range(0, len(samples) - window + 1, window):
+        chunk = samples[offset:offset + window]
+        rms = math.sqrt(sum(s * s for s in chunk) / window) / 32768.0
+        levels.append(20 * math.log10(rms) if rms > 0 else -120.0)
+    return levels
+
+
+def detect_silences(samples: array,
+                    rate: int,
+                    threshold_db: float = SILENCE_THRESHOLD_DB,
+                    min_silence: float = MIN_SILENCE_SECONDS) -> List[Tuple[float, float]]:
+    """(start, end) seconds of every pause at least min_silence long"""
+    window = max(1, int(rate * WINDOW_SECONDS))
+    silences = []
+    run_start = None
+    levels = _window_levels(samples, window)
+    for idx, level in enumerate(levels + [0.0]):  # sentinel closes a trailing run
+        if level < threshold_db:
+            if run_start is None:
+                run_start = idx
+        elif run_start is not None:
+            start, end = run_start * window / rate, idx * window / rate
+            if end - start >= min_silence:
+                silences.append((round(start, 3), round(end, 3)))
+            run_start = None
+    return silences
+
+
+@dataclass
+class VoiceoverAlignment:
+    """Measured voiceover timing used to place shot-list cuts"""
+    duration: float
+    pauses: List[float] = field(default_factory=list)  # candidate cut times
+    segment_bounds: List[Tuple[float, float]] = field(default_factory=list)
+
+    def snap(self, t: float, lower: float, upper: float) -> float:
+        """Nearest pause to t within the snap window and (lower, upper)"""
+        candidates = [p for p in self.pauses if lower < p < upper and abs(p - t) <= SNAP_WINDOW]
+        return min(candidates, key=lambda p: abs(p - t)) if candidates else t
+
+    def shot_slots(self, segment_index: int, count: int) -> List[Tuple[float, float]]:
+        """(start, length) for count shots evenly filling a segment, cut at pauses"""
+        start, end = self.segment_bounds[segment_index]
+        if count <= 0:
+            return []
+        cuts = [start]
+        step = (end - start) / count
+        for idx in range(1, count):
+            cuts.append(self.snap(start + idx * step, cuts[-1] + 0.5, end - 0.5))
+        cuts.append(end)
+        return [(round(a, 3), round(b - a, 3)) for a, b in zip(cuts, cuts[1:])]
+
+
+def _timing(timing: Any) -> Tuple[str, float, float]:
+    """(name, start, duration) from a SegmentAudio or its dict form"""
+    if isinstance(timing, dict):
+        return str(timing.get("name", "")), float(timing["start"]), float(timing["duration"])
+    return timing.name, float(timing.start), float(timing.duration)
+
+
+def _unit_name(segment: Dict[str, Any], idx: int) -> str:
+    """TTS unit name ("segment_N") narrating a shot-list segment"""
+    segment_id = segment.get("segment_id", segment.get("id"))
+    if segment_id is None:
+        return f"segment_{idx}"
+    if isinstance(segment_id, int) or str(segment_id).isdigit():
+        return f"segment_{segment_id}"
+    return str(segment_id)
+
+
+def align_shot_list(shot_list: Sequence[Dict[str, Any]],
+                    duration: float,
+                    segment_timings: Optional[Sequence[Any]] = None,
+                    silences: Optional[Sequence[Tuple[float, float]]] = None) -> VoiceoverAlignment:
+    """
+    Place shot-list segments on the real voiceover
+
+    Args:
+        shot_list: Segments with estimated 'duration' used as relative weights
+        duration: Measured voiceover length in seconds
+        segment_timings: TTS SegmentAudio (or dicts with 'name', 'start',
+            'duration'). When every shot-list segment has a matching
+            "segment_N" unit (by 'segment_id'/'id', else by position) the
+            cuts are taken from them verbatim, with the intro before the
+            first segment and the outro after the last. Plain-text units
+            ("part_N") are used in order when there is one per segment.
+            Otherwise timings only serve as pause hints
+        silences: Detected pauses as (start, end)
+    """
+    timings = [_timing(t) for t in segment_timings or []]
+    pauses = sorted({
+        *(round((a + b) / 2, 3) for a, b in silences or []),
+        *(round(start, 3) for _, start, _ in timings if start > 0),
+    })
+    alignment = VoiceoverAlignment(duration=round(duration, 3), pauses=pauses)
+    if not shot_list:
+        return alignment
+
+    starts = {name: start for name, start, _ in timings}
+    names = [_unit_name(segment, idx) for idx, segment in enumerate(shot_list)]
+    segment_starts = None
+    if all(name in starts for name in names):
+        segment_starts = [starts[name] for name in names]
+    elif len(timings) == len(shot_list) and not any(name.startswith("segment_") for name in starts):
+        segment_starts = [start for _, start, _ in timings]
+    elif timings:
+        missing = [name for name in names if name not in starts]
+        print(f"Warning: no TTS timing for shot-list segments {missing}; aligning on pauses instead")
+
+    if segment_starts is not None:
+        cuts = [0.0, *segment_starts[1:], duration]
+        if all(a < b for a, b in zip(cuts, cuts[1:])):
+            alignment.segment_bounds = [(round(a, 3), round(b, 3)) for a, b in zip(cuts, cuts[1:])]
+            return alignment
+        print("Warning: TTS segment order does not match the shot list; aligning on pauses instead")
+
+    weights = [max(float(segment.get("duration") or 0), 0.1) for segment in shot_list]
+    scale = duration / sum(weights)
+    cuts = [0.0]
+    elapsed = 0.0
+    for weight in weights[:-1]:
+        elapsed += weight * scale
+        cuts.append(alignment.snap(elapsed, cuts[-1] + 1.0, duration - 1.0))
+    cuts.append(duration)
+    alignment.segment_bounds = [(round(a, 3), round(b, 3)) for a, b in zip(cuts, cuts[1:])]
+    return alignment
+
+
+def align_voiceover(shot_list: Sequence[Dict[str, Any]],
+                    audio_path: str,
+                    segment_timings: Optional[Sequence[Any]] = None) -> VoiceoverAlignment:
+    """Measure a local voiceover file and align the shot list to it"""
+    data = Path(audio_path).read_bytes()
+    fmt = "wav" if data[:4] == b"RIFF" else "mp3"
+    duration = audio_duration(data, fmt)
+    decoded = decode_audio(audio_path)
+    silences = detect_silences(*decoded) if decoded else []
+    return align_shot_list(shot_list, duration, segment_timings, silences)
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Dict, Iterable, List, Optional
 
-from src.models import ScoredStory, StoryEnriched
+from src.models import ScoredStory, StoryEnriched, StoryRecord
 from src.utils import canonical_url, content_fingerprint
 
 _DEFAULT_WEIGHTS: Dict[str, float] = {
@@ -16,13 +16,13 @@ _DEFAULT_WEIGHTS: Dict[str, float] = {
 }
 
 
-def _score_from_analysis(story: StoryEnriched, weight_overrides: Optional[Dict[str, float]] = None) -> float:
+def _score_from_analysis(story: StoryEnriched | StoryRecord, weight_overrides: Optional[Dict[str, float]] = None) -> float:
     weights = {**_DEFAULT_WEIGHTS, **(weight_overrides or {})}
     scores = story.analysis.get("scores", {}) if isinstance(story.analysis, dict) else {}
     return sum(weights.get(metric, 0.0) * float(scores.get(metric, 0.0)) for metric in weights)
 
 
-def _fingerprint(story: StoryEnriched) -> str:
+def _fingerprint(story: StoryEnriched | StoryRecord) -> str:
     return story.extras.get("fingerprint") or content_fingerprint(story.url, story.title, story.summary or "")
 
 
@@ -45,6 +45,16 @@ def score(story: StoryEnriched, weight_overrides: Optional[Dict[str, float]] = N
     )
 
 
+def score_record(story: StoryRecord, weight_overrides: Optional[Dict[str, float]] = None) -> StoryRecord:
+    """Score a shared record in place; the record-based twin of ``score``."""
+    story.url = canonical_url(story.url) or story.url
+    story.extras["fingerprint"] = _fingerprint(story)
+    story.score = float(round(_score_from_analysis(story, weight_overrides), 6))
+    story.boosts = {}
+    story.companies_mentioned = story.analysis.get("companies", []) if isinstance(story.analysis, dict) else []
+    return story
+
+
 def pick_top(
     stories: Iterable[StoryEnriched],
     k: int = 5,
@@ -64,4 +74,4 @@ def pick_top(
     return ranked_stories[:k]
 
 
-__all__ = ["score", "pick_top"]
+__all__ = ["score", "score_record", "pick_top"]
@@ -0,0 +1,135 @@
+"""Pure-Python audio helpers: durations and concatenation for MP3 and WAV."""
+
+from __future__ import annotations
+
+import io
+import wave
+from array import array
+from typing import Iterator, List, Optional, Tuple
+
+# MPEG audio frame header tables (kbps / Hz), indexed [version][layer][idx]
+_BITRATES = {
+    ("1", 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    ("1", 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    ("1", 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    ("2", 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    ("2", 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    ("2", 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_SAMPLE_RATES = {"1": [44100, 48000, 32000], "2": [22050, 24000, 16000], "2.5": [11025, 12000, 8000]}
+
+
+def _skip_id3(data: bytes) -> int:
+    """Offset of the first byte after a leading ID3v2 tag."""
+    if data[:3] != b"ID3" or len(data) < 10:
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    return 10 + size
+
+
+def _parse_frame_header(data: bytes, pos: int) -> Optional[Tuple[int, int, int]]:
+    """Return (frame_length, samples, sample_rate) for a frame header at pos."""
+    if pos + 4 > len(data) or data[pos] != 0xFF or (data[pos + 1] & 0xE0) != 0xE0:
+        return None
+    version_bits = (data[pos + 1] >> 3) & 0x03
+    layer_bits = (data[pos + 1] >> 1) & 0x03
+    bitrate_idx = data[pos + 2] >> 4
+    rate_idx = (data[pos + 2] >> 2) & 0x03
+    padding = (data[pos + 2] >> 1) & 0x01
+    if version_bits == 1 or layer_bits == 0 or bitrate_idx in (0, 15) or rate_idx == 3:
+        return None
+
+    version = {3: "1", 2: "2", 0: "2.5"}[version_bits]
+    layer = 4 - layer_bits
+    bitrate = _BITRATES[("1" if version == "1" else "2", layer)][bitrate_idx] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_idx]
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate
+    samples = 1152 if layer == 2 or version == "1" else 576
+    return samples // 8 * bitrate // sample_rate + padding, samples, sample_rate
+
+
+def mp3_frames(data: bytes) -> Iterator[Tuple[int, int, int, int]]:
+    """Yield (offset, length, samples, sample_rate) for each MPEG audio frame."""
+    pos = _skip_id3(data)
+    while pos + 4 <= len(data):
+        header = _parse_frame_header(data, pos)
+        if header is None:
+            pos += 1  # resync past junk or trailing tags
+            continue
+        length, samples, rate = header
+        yield pos, length, samples, rate
+        pos += length
+
+
+def mp3_duration(data: bytes) -> float:
+    return sum(samples / rate for _, _, samples, rate in mp3_frames(data))
+
+
+def wav_duration(data: bytes) -> float:
+    with wave.open(io.BytesIO(data)) as handle:
+        return handle.getnframes() / float(handle.getframerate())
+
+
+def audio_duration(data: bytes, fmt: str) -> float:
+    return wav_duration(data) if fmt == "wav" else mp3_duration(data)
+
+
+def read_wav_samples(data: bytes) -> Tuple[array, int]:
+    """Mono 16-bit samples and sample rate from WAV bytes (channels are averaged)."""
+    with wave.open(io.BytesIO(data)) as handle:
+        if handle.getsampwidth() != 2:
+            raise ValueError("Only 16-bit PCM WAV is supported")
+        channels = handle.getnchannels()
+        rate = handle.getframerate()
+        samples = array("h", handle.readframes(handle.getnframes()))
+    if channels > 1:
+        samples = array("h", (sum(samples[i:i + channels]) // channels for i in range(0, len(samples), channels)))
+    return samples, rate
+
+
+def write_wav(samples: array, rate: int) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(rate)
+        handle.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def concat_audio(clips: List[bytes], fmt: str) -> bytes:
+    """Join same-format clips; MP3 frames are spliced, WAV PCM is re-wrapped."""
+    if fmt == "mp3":
+        out = bytearray()
+        for clip in clips:
+            for offset, length, _, _ in mp3_frames(clip):
+                out += clip[offset:offset + length]
+        return bytes(out)
+
+    buffer = io.BytesIO()
+    params = None
+    with wave.open(buffer, "wb") as out_handle:
+        for clip in clips:
+            with wave.open(io.BytesIO(clip)) as handle:
+                clip_params = (handle.getnchannels(), handle.getsampwidth(), handle.getframerate())
+                if params is None:
+                    params = clip_params
+                    out_handle.setnchannels(params[0])
+                    out_handle.setsampwidth(params[1])
+                    out_handle.setframerate(params[2])
+                elif clip_params != params:
+                    raise ValueError("Cannot concatenate WAV clips with different formats")
+                out_handle.writeframes(handle.readframes(handle.getnframes()))
+    return buffer.getvalue()
+
+
+__all__ = [
+    "audio_duration",
+    "concat_audio",
+    "mp3_duration",
+    "mp3_frames",
+    "read_wav_samples",
+    "wav_duration",
+    "write_wav",
+]
@@ -1,18 +1,23 @@
-import os, httpx
+import os
+from typing import Any
 from pydub import AudioSegment
 from ..config import settings
+from ..models import ScriptDraft
+from .engine import ElevenLabsTTS, TTSEngine
 
-def synthesize(text: str, out_path: str) -> str:
+def synthesize(script: Any, out_path: str) -> str:
+    """Write a WAV voiceover for a ScriptDraft (plain text is wrapped in one)."""
     if not (settings.ELEVENLABS_API_KEY and settings.ELEVENLABS_VOICE_ID):
         AudioSegment.silent(duration=1000).export(out_path, format="wav")
         return out_path
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{settings.ELEVENLABS_VOICE_ID}"
-    headers = {"xi-api-key": settings.ELEVENLABS_API_KEY, "accept": "audio/mpeg"}
-    payload = {"text": text, "voice_settings": {"stability": 0.4, "similarity_boost": 0.6}}
-    with httpx.Client(timeout=60) as c:
-        r = c.post(url, headers=headers, json=payload)
-        r.raise_for_status()
-        tmp = out_path.replace(".wav",".mp3")
-        with open(tmp,"wb") as f: f.write(r.content)
+    backend = ElevenLabsTTS(
+        settings.ELEVENLABS_API_KEY,
+        settings.ELEVENLABS_VOICE_ID,
+        settings={"stability": 0.4, "similarity_boost": 0.6},
+    )
+    draft = script if isinstance(script, ScriptDraft) else ScriptDraft(final_text=str(script))
+    # Draft segments are synthesized concurrently and cached, then joined
+    tmp = out_path.replace(".wav", ".mp3")
+    TTSEngine(backend).synthesize_draft(draft, tmp)
     AudioSegment.from_mp3(tmp).export(out_path, format="wav")
     return out_path
@@ -0,0 +1,234 @@
+"""Segment-parallel TTS with an on-disk cache per synthesized segment."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import re
+from abc import ABC, abstractmethod
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from .audio import audio_duration, concat_audio, write_wav
+
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "./.cache/tts")
+TTS_MAX_CONCURRENCY = int(os.getenv("TTS_MAX_CONCURRENCY", "4"))
+
+ScriptUnit = Tuple[str, str]  # (segment name, text)
+
+
+@dataclass(frozen=True)
+class SegmentAudio:
+    """Timing of one synthesized segment within the concatenated voiceover."""
+
+    name: str
+    text: str
+    start: float
+    duration: float
+    cache_key: str
+    cached: bool
+
+
+@dataclass
+class Synthesis:
+    """Concatenated voiceover plus per-segment timings."""
+
+    path: str
+    format: str
+    duration: float
+    segments: List[SegmentAudio] = field(default_factory=list)
+
+    def segment_durations(self) -> Dict[str, float]:
+        return {segment.name: segment.duration for segment in self.segments}
+
+
+class TTSBackend(ABC):
+    """Interface for a speech backend; identity fields feed the cache key."""
+
+    voice: str = ""
+    model: str = ""
+    format: str = "mp3"
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None) -> None:
+        self.settings: Dict[str, Any] = dict(settings or {})
+
+    @abstractmethod
+    def synthesize(self, text: str) -> bytes:
+        """Audio bytes in ``format`` for one segment of text."""
+
+
+class ElevenLabsTTS(TTSBackend):
+    """ElevenLabs text-to-speech returning MP3."""
+
+    def __init__(
+        self,
+        api_key: str,
+        voice: str,
+        *,
+        model: str = "eleven_monolingual_v1",
+        settings: Optional[Dict[str, Any]] = None,
+        output_format: str = "mp3_44100_128",
+        timeout: float = 60,
+    ) -> None:
+        super().__init__(settings or {"stability": 0.5, "similarity_boost": 0.75})
+        self.api_key = api_key
+        self.voice = voice
+        self.model = model
+        self.output_format = output_format
+        self.timeout = timeout
+
+    def synthesize(self, text: str) -> bytes:
+        response = httpx.post(
+            f"https://api.elevenlabs.io/v1/text-to-speech/{self.voice}",
+            params={"output_format": self.output_format},
+            headers={"xi-api-key": self.api_key, "accept": "audio/mpeg"},
+            json={"text": text, "model_id": self.model, "voice_settings": self.settings},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.content
+
+
+class LocalTTS(TTSBackend):
+    """Deterministic offline stand-in: a quiet tone per word-run, then a pause."""
+
+    format = "wav"
+
+    def __init__(self, *, words_per_minute: float = 150, sample_rate: int = 8000, pause: float = 0.4) -> None:
+        super().__init__({"wpm": words_per_minute, "rate": sample_rate, "pause": pause})
+        self.voice = "local"
+        self.model = "tone"
+        self.words_per_minute = words_per_minute
+        self.sample_rate = sample_rate
+        self.pause = pause
+
+    def synthesize(self, text: str) -> bytes:
+        words = max(1, len(text.split()))
+        speech = int(words / self.words_per_minute * 60 * self.sample_rate)
+        step = 2 * math.pi * 220 / self.sample_rate
+        samples = array("h", (int(6000 * math.sin(i * step)) for i in range(speech)))
+        samples.extend([0] * int(self.pause * self.sample_rate))
+        return write_wav(samples, self.sample_rate)
+
+
+class TTSEngine:
+    """Synthesize script segments concurrently, caching each segment on disk."""
+
+    def __init__(
+        self,
+        backend: TTSBackend,
+        *,
+        cache_dir: str | Path = TTS_CACHE_DIR,
+        max_workers: int = TTS_MAX_CONCURRENCY,
+    ) -> None:
+        self.backend = backend
+        self.cache_dir = Path(cache_dir)
+        self.max_workers = max(1, max_workers)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def cache_key(self, text: str) -> str:
+        identity = {
+            "voice": self.backend.voice,
+            "model": self.backend.model,
+            "settings": self.backend.settings,
+            "format": self.backend.format,
+            "text": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        }
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+    def _segment_audio(self, text: str) -> Tuple[bytes, float, str, bool]:
+        key = self.cache_key(text)
+        audio_path = self.cache_dir / f"{key}.{self.backend.format}"
+        meta_path = self.cache_dir / f"{key}.json"
+        if audio_path.exists() and meta_path.exists():
+            duration = json.loads(meta_path.read_text())["duration"]
+            return audio_path.read_bytes(), duration, key, True
+
+        data = self.backend.synthesize(text)
+        duration = audio_duration(data, self.backend.format)
+        tmp_path = audio_path.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, audio_path)
+        meta_path.write_text(json.dumps({"duration": duration, "chars": len(text)}))
+        return data, duration, key, False
+
+    def synthesize_units(self, units: Sequence[ScriptUnit], out_path: str) -> Synthesis:
+        """Synthesize (name, text) units in parallel and write the joined audio."""
+        units = [(name, text.strip()) for name, text in units if text and text.strip()]
+        if not units:
+            raise ValueError("Nothing to synthesize")
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(units))) as pool:
+            rendered = list(pool.map(lambda unit: self._segment_audio(unit[1]), units))
+
+        segments = []
+        cursor = 0.0
+        for (name, text), (_, duration, key, cached) in zip(units, rendered):
+            segments.append(SegmentAudio(name, text, round(cursor, 3), round(duration, 3), key, cached))
+            cursor += duration
+
+        Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(out_path, "wb") as handle:
+            handle.write(concat_audio([data for data, _, _, _ in rendered], self.backend.format))
+        return Synthesis(out_path, self.backend.format, round(cursor, 3), segments)
+
+    def synthesize_draft(self, draft: Any, out_path: str) -> Synthesis:
+        """Synthesize the draft's approved text at its intro/segment/outro boundaries."""
+        return self.synthesize_units(script_units(draft), out_path)
+
+    def synthesize_text(self, text: str, out_path: str) -> Synthesis:
+        return self.synthesize_units(split_script_text(text), out_path)
+
+
+def script_units(draft: Any) -> List[ScriptUnit]:
+    """Voiceover units at ScriptDraft boundaries: intro, one per segment, outro.
+
+    Drafts from the script generator carry their tone-enhanced units, which
+    join to ``final_text``. Other drafts with a ``final_text`` are split into
+    paragraphs; only drafts without one are assembled from their structure.
+    """
+    stored = (draft.metadata or {}).get("voiceover_units")
+    if stored:
+        return [(unit["name"], unit["text"]) for unit in stored if unit["text"].strip()]
+    if draft.final_text:
+        return split_script_text(draft.final_text)
+    acts = draft.acts or {}
+    act1 = acts.get("act1", {}) or {}
+    act3 = acts.get("act3", {}) or {}
+
+    intro = [act1.get("hook", ""), *draft.headline_blitz, draft.bridge_sentence or act1.get("bridge", "")]
+    units: List[ScriptUnit] = [("intro", " ".join(part for part in intro if part))]
+    for idx, segment in enumerate(draft.segments):
+        text = segment.voiceover or " ".join(
+            part for part in (segment.headline, segment.what, segment.so_what, segment.now_what, segment.analogy) if part
+        )
+        units.append((f"segment_{idx}", text))
+
+    cta = act3.get("cta") or draft.cta or {}
+    outro = [act3.get("closing", ""), cta.get("question", "") if isinstance(cta, dict) else str(cta), act3.get("sign_off", "")]
+    units.append(("outro", " ".join(part for part in outro if part)))
+    return [(name, text) for name, text in units if text.strip()]
+
+
+def split_script_text(text: str) -> List[ScriptUnit]:
+    """Fallback units for plain scripts: paragraphs separated by blank lines."""
+    paragraphs = [part.strip() for part in re.split(r"\n\s*\n", text) if part.strip()]
+    return [(f"part_{idx}", paragraph) for idx, paragraph in enumerate(paragraphs)]
+
+
+__all__ = [
+    "ElevenLabsTTS",
+    "LocalTTS",
+    "SegmentAudio",
+    "Synthesis",
+    "TTSBackend",
+    "TTSEngine",
+    "script_units",
+    "split_script_text",
+]
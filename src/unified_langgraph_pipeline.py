@@ -4,13 +4,18 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import uuid
+from concurrent.futures import Executor
 from pathlib import Path
 from typing import Tuple
 
 from langgraph.graph import END, StateGraph
 
+from src.config import settings
 from src.graphs import build_research_graph, build_script_graph
+from src.graphs.events import RunEventLog, stream_graph, track_run
 from src.graphs.state import ResearchState, ScriptState
+from src.utils.profiling import MODES as PROFILE_MODES, RunProfiler, profiling
 
 
 def create_unified_graph():
@@ -36,7 +41,10 @@ def create_unified_graph():
 
         script_state = ScriptState(
             selected_stories=research_result.selected_stories,
-            metadata={"max_attempts": state.get("max_attempts", 2)},
+            metadata={
+                "max_attempts": state.get("max_attempts", 2),
+                "candidates": state.get("candidates", 1),
+            },
         )
         script_config = {
             "configurable": {
@@ -64,6 +72,60 @@ async def run_pipeline(
     selection_limit: int = 6,
     max_attempts: int = 2,
     thread_id: str | None = None,
+    candidates: int = 1,
+    enrich_executor: Executor | None = None,
+    events: RunEventLog | None = None,
+    profiler: RunProfiler | None = None,
+) -> Tuple[ResearchState, ScriptState]:
+    """Run research then script; ``events`` receives live node progress and is closed at the end.
+
+    With a ``profiler`` its selected nodes are profiled and the results are
+    written to ``profiler.output_dir`` when the run ends, even if it fails.
+    """
+    if profiler is not None and enrich_executor is not None and profiler.wants("enrich"):
+        # Analysis in pool processes would be invisible to the profiler
+        profiler.notes.append("enrich ran in-process instead of on the enrich process pool")
+        enrich_executor = None
+    with track_run(events, thread_id=thread_id):
+        try:
+            with profiling(profiler):
+                research_result, script_result = await _run_graphs(
+                    hours_filter, selection_limit, max_attempts, thread_id, candidates, enrich_executor, events
+                )
+        finally:
+            if profiler is not None and events is not None:
+                events.publish("profile", path=str(profiler.output_dir / "summary.json"))
+        if events is not None:
+            events.publish(
+                "run_finish",
+                stories_found=len(research_result.raw_stories),
+                stories_selected=len(research_result.selected_stories),
+                script_generated=script_result.final_script is not None,
+            )
+    return research_result, script_result
+
+
+def default_profile_dir(thread_id: str) -> Path:
+    """Profiles live next to the run's checkpoints: ``<checkpoint dir>/../profiles/<thread_id>``."""
+    if thread_id in {"", ".", ".."} or Path(thread_id).name != thread_id:
+        raise ValueError(f"Thread id {thread_id!r} cannot be used as a directory name")
+    return Path(settings.LANGGRAPH_CHECKPOINT_DIR).parent / "profiles" / thread_id
+
+
+async def _invoke(graph, state, config, events: RunEventLog | None, name: str):
+    if events is None:
+        return await graph.ainvoke(state, config=config)
+    return await stream_graph(graph, state, config, events, graph_name=name)
+
+
+async def _run_graphs(
+    hours_filter: int | None,
+    selection_limit: int,
+    max_attempts: int,
+    thread_id: str | None,
+    candidates: int,
+    enrich_executor: Executor | None,
+    events: RunEventLog | None,
 ) -> Tuple[ResearchState, ScriptState]:
     research_graph = build_research_graph()
     research_state = ResearchState(
@@ -74,23 +136,22 @@ async def run_pipeline(
     research_config = {
         "configurable": {
             "thread_id": f"{base_thread_id}-research",
+            "enrich_executor": enrich_executor,
         }
     }
-    research_raw = await research_graph.ainvoke(
-        research_state, config=research_config
-    )
+    research_raw = await _invoke(research_graph, research_state, research_config, events, "research")
     research_result = research_raw if isinstance(research_raw, ResearchState) else ResearchState.model_validate(research_raw)
     script_graph = build_script_graph()
     script_state = ScriptState(
         selected_stories=research_result.selected_stories,
-        metadata={"max_attempts": max_attempts},
+        metadata={"max_attempts": max_attempts, "candidates": candidates},
     )
     script_config = {
         "configurable": {
             "thread_id": f"{base_thread_id}-script",
         }
     }
-    script_raw = await script_graph.ainvoke(script_state, config=script_config)
+    script_raw = await _invoke(script_graph, script_state, script_config, events, "script")
     script_result = script_raw if isinstance(script_raw, ScriptState) else ScriptState.model_validate(script_raw)
     return research_result, script_result
 
@@ -106,16 +167,42 @@ def main() -> None:
         help="Maximum script generation attempts before manual review",
     )
     parser.add_argument("--thread-id", type=str, default=None, help="Thread identifier for checkpointing")
+    parser.add_argument(
+        "--candidates",
+        type=int,
+        default=1,
+        help="Script candidates composed in parallel per attempt (best validator score wins)",
+    )
     parser.add_argument("--output", type=Path, default=None, help="Optional path to dump script text")
+    parser.add_argument("--profile", action="store_true", help="Profile nodes (CPU + allocations) for this run")
+    parser.add_argument(
+        "--profile-nodes",
+        type=lambda value: [item.strip() for item in value.split(",") if item.strip()],
+        default=None,
+        help="Comma-separated node names to profile (default: all)",
+    )
+    parser.add_argument("--profile-mode", choices=PROFILE_MODES, default="cprofile", help="cProfile or stack sampling")
+    parser.add_argument("--profile-dir", type=Path, default=None, help="Where to write profiles (default: next to checkpoints)")
     args = parser.parse_args()
+    profiler = None
+    if args.profile or args.profile_nodes:
+        thread_id = args.thread_id or str(uuid.uuid4())
+        args.thread_id = thread_id
+        profiler = RunProfiler(
+            args.profile_dir or default_profile_dir(thread_id), nodes=args.profile_nodes, mode=args.profile_mode
+        )
     research_state, script_state = asyncio.run(
         run_pipeline(
             hours_filter=args.hours_filter,
             selection_limit=args.selection_limit,
             max_attempts=args.max_attempts,
             thread_id=args.thread_id,
+            candidates=args.candidates,
+            profiler=profiler,
         )
     )
+    if profiler is not None:
+        print(f"Profile summary: {profiler.output_dir / 'summary.txt'}")
     print("Research diagnostics:", research_state.diagnostics.events)
     if script_state.final_script:
         msg = "\nGenerated script (validation score {:.2f}):".format(
@@ -3,19 +3,21 @@
 from __future__ import annotations
 
 import uuid
+from concurrent.futures import Executor
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from langgraph.graph import StateGraph
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
+from src.graphs.events import RunEventLog, stream_graph, track_run
+from src.graphs.state import coerce_story_records
+from src.utils.profiling import RunProfiler, profiling
 from src.models import (
     PipelineDiagnostics,
-    ScoredStory,
     ScriptDraft,
-    StoryEnriched,
-    StoryInput,
+    StoryRecord,
     StorySource,
 )
 
@@ -28,10 +30,10 @@ class UnifiedPipelineState(BaseModel):
 
     # Stage 1 – Research
     sources: List[StorySource] = Field(default_factory=list)
-    raw_stories: List[StoryInput] = Field(default_factory=list)
-    enriched_stories: List[StoryEnriched] = Field(default_factory=list)
-    scored_stories: List[ScoredStory] = Field(default_factory=list)
-    selected_stories: List[ScoredStory] = Field(default_factory=list)
+    raw_stories: List[StoryRecord] = Field(default_factory=list)
+    enriched_stories: List[StoryRecord] = Field(default_factory=list)
+    scored_stories: List[StoryRecord] = Field(default_factory=list)
+    selected_stories: List[StoryRecord] = Field(default_factory=list)
     companies: Dict[str, List[str]] = Field(default_factory=dict)
     scoring_weights: Dict[str, float] = Field(default_factory=dict)
     trending_keywords: Dict[str, float] = Field(default_factory=dict)
@@ -52,17 +54,76 @@ class UnifiedPipelineState(BaseModel):
     checkpoints: Dict[str, Any] = Field(default_factory=dict)
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
+    @field_validator("raw_stories", "enriched_stories", "scored_stories", "selected_stories", mode="before")
+    @classmethod
+    def _coerce_stories(cls, value: Any) -> Any:
+        return coerce_story_records(value)
+
 
 CONFIG_PATH = Path(__file__).resolve().parents[1] / "langflow" / "pipeline_config.json"
 
 
 def build_unified_visual_graph() -> StateGraph:
-    """Build the unified graph based on the Langflow-authored config."""
+    """Build the unified graph based on the Langflow-authored config.
+
+    Compiled graphs are cached per config content, so repeated calls are cheap.
+    """
 
     from langflow_support import build_graph_from_file
 
     return build_graph_from_file(CONFIG_PATH)
 
 
-# Entry point for LangGraph
-graph = build_unified_visual_graph()
+async def run_visual_pipeline(
+    graph: Any = None,
+    hours_filter: int | None = None,
+    selection_limit: int = 6,
+    max_attempts: int = 2,
+    thread_id: str | None = None,
+    candidates: int = 1,
+    enrich_executor: Executor | None = None,
+    events: RunEventLog | None = None,
+    profiler: RunProfiler | None = None,
+) -> UnifiedPipelineState:
+    """Run the Langflow-configured graph (default: the current config) as a single workflow."""
+    if profiler is not None and enrich_executor is not None and profiler.wants("enrich"):
+        profiler.notes.append("enrich ran in-process instead of on the enrich process pool")
+        enrich_executor = None
+    graph = graph if graph is not None else build_unified_visual_graph()
+    state = UnifiedPipelineState(
+        hours_filter=hours_filter,
+        metadata={"selection_limit": selection_limit, "max_attempts": max_attempts, "candidates": candidates},
+    )
+    config = {
+        "configurable": {
+            "thread_id": f"{thread_id or state.request_id}-visual",
+            "enrich_executor": enrich_executor,
+        }
+    }
+    with track_run(events, thread_id=thread_id):
+        try:
+            with profiling(profiler):
+                if events is None:
+                    raw = await graph.ainvoke(state, config=config)
+                else:
+                    raw = await stream_graph(graph, state, config, events, graph_name="visual")
+        finally:
+            if profiler is not None and events is not None:
+                events.publish("profile", path=str(profiler.output_dir / "summary.json"))
+        result = raw if isinstance(raw, UnifiedPipelineState) else UnifiedPipelineState.model_validate(raw)
+        if events is not None:
+            events.publish(
+                "run_finish",
+                stories_found=len(result.raw_stories),
+                stories_selected=len(result.selected_stories),
+                script_generated=result.final_script is not None,
+            )
+    return result
+
+
+def __getattr__(name: str) -> Any:
+    # Entry point for LangGraph (``unified_visual_pipeline.py:graph``), built on first access
+    # so importing the state model does not compile the graph.
+    if name == "graph":
+        return build_unified_visual_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,6 +4,7 @@ from .artifact_cleanup import ArtifactCleaner, CleanupConfig, CleanupStrategy
 from .async_helpers import gather_with_concurrency, run_with_retry, to_thread, with_timeout
 from .content_normalizer import canonical_url, content_fingerprint, merge_keywords, normalize_text
 from .errors import FetchTimeout, StageFailure, ValidationFailure
+from .lazy import lazy_import
 
 __all__ = [
     "ArtifactCleaner",
@@ -20,4 +21,5 @@ __all__ = [
     "FetchTimeout",
     "StageFailure",
     "ValidationFailure",
+    "lazy_import",
 ]
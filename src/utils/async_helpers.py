@@ -8,8 +8,13 @@ from typing import Any, Awaitable, Callable, Iterable, List, Sequence, TypeVar
 import anyio
 from tenacity import AsyncRetrying, RetryError, retry_if_exception_type, stop_after_attempt, wait_exponential
 
+from .metrics import counter
+
 T = TypeVar("T")
 
+RETRY_ATTEMPTS = counter("pipeline_retry_attempts_total", "Attempts made by run_with_retry", ("operation", "outcome"))
+RETRY_EXHAUSTED = counter("pipeline_retry_exhausted_total", "run_with_retry calls that gave up", ("operation",))
+
 
 async def gather_with_concurrency(limit: int, coroutines: Iterable[Awaitable[T]]) -> List[T]:
     """Run coroutines with a bounded concurrency limit."""
@@ -44,12 +49,28 @@ async def run_with_retry(
         retry=retry_if_exception_type(tuple(retry_exceptions)),
         reraise=True,
     )
+    operation = getattr(func, "__qualname__", type(func).__name__)
+    retryable = tuple(retry_exceptions)
+    attempt_number = 0
     try:
         async for attempt in retrying:
             with attempt:
-                return await func(*args, **kwargs)
+                attempt_number = attempt.retry_state.attempt_number
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception:
+                    RETRY_ATTEMPTS.inc(operation=operation, outcome="error")
+                    raise
+                RETRY_ATTEMPTS.inc(operation=operation, outcome="ok")
+                return result
     except RetryError as exc:  # pragma: no cover - tenacity wraps final failure
+        RETRY_EXHAUSTED.inc(operation=operation)
         raise exc.last_attempt.exception() from exc
+    except Exception as exc:
+        # Only retryable errors on the last allowed attempt mean we gave up; the rest were never retried
+        if attempt_number >= attempts and isinstance(exc, retryable):
+            RETRY_EXHAUSTED.inc(operation=operation)
+        raise
 
 
 async def to_thread(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
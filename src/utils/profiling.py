@@ -0,0 +1,412 @@
+"""Opt-in per-node CPU and allocation profiling for pipeline runs.
+
+A ``RunProfiler`` activated with ``profiling()`` is picked up by ``open_span``
+for top-level node spans: each selected node runs under cProfile (or a stack
+sampler) between two tracemalloc snapshots. ``write()`` stores the raw
+``.prof`` files plus a JSON/text summary of the top functions, time per
+package and top allocation sites per node.
+
+tracemalloc only runs while a profiled node does, but it is process-wide:
+allocations made by other threads in that window land in the node's diff.
+Nodes that run on the event-loop thread also pick up whatever coroutines ran
+while they awaited. The summary lists both per node and adds a note.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import sysconfig
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set
+
+MODES = ("cprofile", "sample")
+DEFAULT_TOP = 15
+DEFAULT_SAMPLE_INTERVAL = 0.005
+# Frames kept per allocation; enough to attribute pydantic/bs4 allocations to the caller
+TRACEMALLOC_FRAMES = 4
+
+_active: ContextVar[Optional["RunProfiler"]] = ContextVar("pipeline_profiler", default=None)
+# Only one cProfile profiler can be enabled per process (3.12+) or per thread
+# reliably; nodes that find it busy fall back to sampling.
+_cprofile_lock = threading.Lock()
+_SKIP_ALLOCATIONS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+)
+_CWD = os.getcwd() + os.sep
+_STDLIB = sysconfig.get_paths()["stdlib"] + os.sep
+# Profiled nodes that need tracemalloc; tracing stops when the last one that started it ends
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False
+
+
+def _short_path(filename: str) -> str:
+    for marker in ("site-packages" + os.sep, "dist-packages" + os.sep):
+        if marker in filename:
+            return filename.split(marker, 1)[1]
+    if filename.startswith(_CWD):
+        return filename[len(_CWD):]
+    return filename
+
+
+def _package(filename: str) -> str:
+    """Bucket a source file for the per-package breakdown (``pydantic``, ``bs4``, ``src/editorial`` ...)."""
+    if filename.startswith("<") or filename == "~":
+        return "builtins"
+    if filename.startswith(_STDLIB) and "-packages" + os.sep not in filename:
+        return "stdlib"
+    short = _short_path(filename)
+    parts = short.replace(os.sep, "/").split("/")
+    if parts[0] == "src" and len(parts) > 2:
+        return "/".join(parts[:2])
+    return parts[0].removesuffix(".py")
+
+
+class _Sampler:
+    """Background thread counting the stacks of one thread every ``interval`` seconds."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = 0
+        self.self_counts: Counter = Counter()
+        self.total_counts: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="node-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            seen = set()
+            leaf = True
+            while frame is not None:
+                code = frame.f_code
+                key = (code.co_filename, code.co_firstlineno, code.co_name)
+                if leaf:
+                    self.self_counts[key] += 1
+                    leaf = False
+                if key not in seen:
+                    seen.add(key)
+                    self.total_counts[key] += 1
+                frame = frame.f_back
+
+
+class NodeProfile:
+    """Profiling data for one node, accumulated over every call in the run."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.wall_ms = 0.0
+        self.modes: Counter = Counter()
+        self.stats: Optional[pstats.Stats] = None
+        self.samples = 0
+        self.self_counts: Counter = Counter()
+        self.total_counts: Counter = Counter()
+        self.allocations: Dict[str, List[float]] = {}
+        self.overlapped: Set[str] = set()
+        self.event_loop_calls = 0
+
+    def add_cprofile(self, profile: cProfile.Profile) -> None:
+        if self.stats is None:
+            self.stats = pstats.Stats(profile, stream=io.StringIO())
+        else:
+            self.stats.add(profile)
+
+    def add_samples(self, sampler: _Sampler) -> None:
+        self.samples += sampler.samples
+        self.self_counts.update(sampler.self_counts)
+        self.total_counts.update(sampler.total_counts)
+
+    def add_allocations(self, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot) -> None:
+        for diff in after.filter_traces(_SKIP_ALLOCATIONS).compare_to(before.filter_traces(_SKIP_ALLOCATIONS), "lineno"):
+            if diff.size_diff <= 0:
+                continue
+            frame = diff.traceback[0]
+            site = f"{_short_path(frame.filename)}:{frame.lineno}"
+            totals = self.allocations.setdefault(site, [0.0, 0])
+            totals[0] += diff.size_diff
+            totals[1] += diff.count_diff
+
+    def top_functions(self, top: int) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        if self.stats is not None:
+            entries = sorted(self.stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+            for (filename, lineno, func), (_, calls, tottime, cumtime, _) in entries[:top]:
+                rows.append({
+                    "function": f"{_short_path(filename)}:{lineno}({func})",
+                    "calls": calls,
+                    "self_ms": round(tottime * 1000, 3),
+                    "total_ms": round(cumtime * 1000, 3),
+                })
+        elif self.samples:
+            for (filename, lineno, func), count in self.self_counts.most_common(top):
+                rows.append({
+                    "function": f"{_short_path(filename)}:{lineno}({func})",
+                    "self_share": round(count / self.samples, 4),
+                    "total_share": round(self.total_counts[(filename, lineno, func)] / self.samples, 4),
+                })
+        return rows
+
+    def by_package(self) -> Dict[str, float]:
+        """Share of self time (or self samples) per package, largest first."""
+        totals: Counter = Counter()
+        if self.stats is not None:
+            for (filename, _, _), (_, _, tottime, _, _) in self.stats.stats.items():
+                totals[_package(filename)] += tottime
+        else:
+            for (filename, _, _), count in self.self_counts.items():
+                totals[_package(filename)] += count
+        grand = sum(totals.values()) or 1
+        return {name: round(value / grand, 4) for name, value in totals.most_common()}
+
+    def top_allocations(self, top: int) -> List[Dict[str, Any]]:
+        ranked = sorted(self.allocations.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        return [{"site": site, "size_kb": round(size / 1024, 1), "count": int(count)} for site, (size, count) in ranked]
+
+
+class RunProfiler:
+    """Collect per-node profiles for one run and write them to ``output_dir``.
+
+    ``nodes`` limits profiling to those node (span) names; ``None`` profiles
+    every node. ``mode`` is ``"cprofile"`` (deterministic, higher overhead) or
+    ``"sample"`` (stack sampling every ``sample_interval`` seconds).
+    """
+
+    def __init__(
+        self,
+        output_dir: Path | str,
+        *,
+        nodes: Optional[Sequence[str]] = None,
+        mode: str = "cprofile",
+        memory: bool = True,
+        top: int = DEFAULT_TOP,
+        sample_interval: float = DEFAULT_SAMPLE_INTERVAL,
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}; expected one of {MODES}")
+        self.output_dir = Path(output_dir)
+        self.nodes = set(nodes) if nodes else None
+        self.mode = mode
+        self.memory = memory
+        self.top = top
+        self.sample_interval = sample_interval
+        self.profiles: Dict[str, NodeProfile] = {}
+        self.notes: List[str] = []
+        self._lock = threading.Lock()
+        self._running: Dict[int, str] = {}
+
+    def wants(self, name: str) -> bool:
+        return self.nodes is None or name in self.nodes
+
+    def _profile_for(self, name: str) -> NodeProfile:
+        with self._lock:
+            profile = self.profiles.get(name)
+            if profile is None:
+                profile = self.profiles[name] = NodeProfile(name)
+            return profile
+
+    def _enter(self, name: str, token: int) -> NodeProfile:
+        """Register a running node and record which profiled nodes it overlaps."""
+        profile = self._profile_for(name)
+        with self._lock:
+            for other in self._running.values():
+                if other != name:
+                    profile.overlapped.add(other)
+                    self.profiles[other].overlapped.add(name)
+            self._running[token] = name
+            if _on_event_loop():
+                profile.event_loop_calls += 1
+        return profile
+
+    @contextmanager
+    def node(self, name: str) -> Iterator[None]:
+        """Profile the enclosed node call."""
+        token = object()
+        profile = self._enter(name, id(token))
+        before: Optional[tracemalloc.Snapshot] = None
+        if self.memory:
+            _acquire_tracing()
+            before = tracemalloc.take_snapshot()
+        profiler: Optional[cProfile.Profile] = None
+        sampler: Optional[_Sampler] = None
+        if self.mode == "cprofile" and _cprofile_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # another profiling tool (e.g. coverage) owns the hook
+                profiler = None
+                _cprofile_lock.release()
+        if profiler is None:
+            sampler = _Sampler(threading.get_ident(), self.sample_interval)
+            sampler.start()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            if profiler is not None:
+                profiler.disable()
+                _cprofile_lock.release()
+            if sampler is not None:
+                sampler.stop()
+            after = tracemalloc.take_snapshot() if before is not None else None
+            if self.memory:
+                _release_tracing()
+            with self._lock:
+                del self._running[id(token)]
+                profile.calls += 1
+                profile.wall_ms += elapsed
+                if profiler is not None:
+                    profile.modes["cprofile"] += 1
+                    profile.add_cprofile(profiler)
+                else:
+                    profile.modes["sample"] += 1
+                    profile.add_samples(sampler)
+                if after is not None:
+                    profile.add_allocations(before, after)
+
+    def caveats(self) -> List[str]:
+        """Attribution limits that apply to this run's profiles."""
+        notes: List[str] = []
+        overlapped = sorted(profile.name for profile in self.profiles.values() if profile.overlapped)
+        if self.memory:
+            notes.append(
+                "tracemalloc is process-wide: allocation diffs include other threads' allocations made while the node ran"
+                + (f" (overlapping profiled nodes: {', '.join(overlapped)})" if overlapped else "")
+            )
+        on_loop = sorted(profile.name for profile in self.profiles.values() if profile.event_loop_calls)
+        if on_loop:
+            notes.append(
+                f"Ran on the event-loop thread: {', '.join(on_loop)}; their {self.mode} data includes "
+                "other coroutines that ran while they awaited"
+            )
+        return notes
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "memory": self.memory,
+            "notes": self.notes + self.caveats(),
+            "nodes": [
+                {
+                    "node": profile.name,
+                    "calls": profile.calls,
+                    "wall_ms": round(profile.wall_ms, 3),
+                    "modes": dict(profile.modes),
+                    "samples": profile.samples or None,
+                    "overlapped_with": sorted(profile.overlapped),
+                    "event_loop_calls": profile.event_loop_calls,
+                    "profile_file": f"{profile.name}.prof" if profile.stats is not None else None,
+                    "by_package": profile.by_package(),
+                    "top_functions": profile.top_functions(self.top),
+                    "top_allocations": profile.top_allocations(self.top),
+                }
+                for profile in sorted(self.profiles.values(), key=lambda item: item.wall_ms, reverse=True)
+            ],
+        }
+
+    def write(self) -> Path:
+        """Write ``<node>.prof`` files, ``summary.json`` and ``summary.txt``; returns the summary path."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for profile in self.profiles.values():
+            if profile.stats is not None:
+                profile.stats.dump_stats(str(self.output_dir / f"{profile.name}.prof"))
+        summary = self.summary()
+        (self.output_dir / "summary.txt").write_text(format_summary(summary), encoding="utf-8")
+        target = self.output_dir / "summary.json"
+        target.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        return target
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    lines = [f"Profile mode: {summary['mode']}" + (" + tracemalloc" if summary["memory"] else "")]
+    lines.extend(f"Note: {note}" for note in summary["notes"])
+    for node in summary["nodes"]:
+        lines.append("")
+        lines.append(f"== {node['node']}: {node['calls']} call(s), {node['wall_ms']:.1f} ms wall")
+        packages = ", ".join(f"{name} {share:.0%}" for name, share in list(node["by_package"].items())[:6])
+        lines.append(f"   self time by package: {packages or '-'}")
+        if node["top_functions"]:
+            lines.append("   top functions by self time:")
+        for row in node["top_functions"]:
+            if "self_ms" in row:
+                lines.append(f"   {row['self_ms']:>10.2f} ms self {row['total_ms']:>10.2f} ms total {row['calls']:>8}x  {row['function']}")
+            else:
+                lines.append(f"   {row['self_share']:>9.1%} self {row['total_share']:>9.1%} total  {row['function']}")
+        if node["top_allocations"]:
+            lines.append("   top allocation sites (net growth):")
+        for row in node["top_allocations"]:
+            lines.append(f"   {row['size_kb']:>10.1f} KiB {row['count']:>8} blocks  {row['site']}")
+    return "\n".join(lines) + "\n"
+
+
+def active_profiler() -> Optional[RunProfiler]:
+    return _active.get()
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _acquire_tracing() -> None:
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            _tracing_owned = True
+        _tracing_users += 1
+
+
+def _release_tracing() -> None:
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+
+
+@contextmanager
+def profiling(profiler: Optional[RunProfiler]) -> Iterator[Optional[RunProfiler]]:
+    """Activate ``profiler`` for node spans opened in this context and write its results on exit."""
+    if profiler is None:
+        yield None
+        return
+    token = _active.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _active.reset(token)
+        profiler.write()
+
+
+__all__ = ["MODES", "NodeProfile", "RunProfiler", "active_profiler", "format_summary", "profiling"]
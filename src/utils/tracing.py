@@ -0,0 +1,168 @@
+"""Nested timing spans for pipeline nodes, with JSON and Chrome trace export.
+
+``cpu_ms`` is CPU time of the thread that opened the span: exact for sync
+nodes, which LangGraph runs on their own worker thread, but for async nodes
+it includes whatever other coroutines ran on the event loop meanwhile, and
+it never counts work the node hands to other threads or processes.
+``process_max_rss_kb`` is the process-wide RSS high-water mark when the span
+closed, not the span's own peak; use ``peak_alloc_kb`` for that.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import resource
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from .profiling import active_profiler
+
+# Set to trace Python allocations so spans report per-span peak memory.
+TRACE_MEMORY = os.getenv("PIPELINE_TRACE_MEMORY", "").lower() in {"1", "true", "yes"}
+
+_ids = itertools.count(1)
+_active: ContextVar[Optional["Span"]] = ContextVar("pipeline_span", default=None)
+
+
+class Span:
+    """An open span; node code attaches item counts and attributes to it."""
+
+    def __init__(self, name: str, sink: List[Dict[str, Any]], parent: Optional["Span"], attrs: Dict[str, Any]):
+        self.id = next(_ids)
+        self.name = name
+        self.sink = sink
+        self.parent = parent
+        self.attrs = dict(attrs)
+        self.items: Optional[int] = None
+        self._peak = 0
+
+    def set(self, *, items: Optional[int] = None, **attrs: Any) -> None:
+        if items is not None:
+            self.items = items
+        self.attrs.update(attrs)
+
+    def add_items(self, count: int = 1) -> None:
+        self.items = (self.items or 0) + count
+
+
+@contextmanager
+def open_span(sink: List[Dict[str, Any]], name: str, **attrs: Any) -> Iterator[Span]:
+    """Record a span into sink, nested under the span active in this context."""
+    if TRACE_MEMORY and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    parent = _active.get()
+    current = Span(name, sink, parent, attrs)
+    token = _active.set(current)
+    memory_base = 0
+    if tracemalloc.is_tracing():
+        memory_base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    # Top-level spans are graph nodes; an active run profiler may want to profile them
+    profiler = active_profiler() if parent is None else None
+    profile = profiler.node(name) if profiler is not None and profiler.wants(name) else nullcontext()
+
+    started = time.time()
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    error: Optional[str] = None
+    try:
+        with profile:
+            yield current
+    except BaseException as exc:
+        error = type(exc).__name__
+        raise
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.thread_time() - cpu_start
+        _active.reset(token)
+        record: Dict[str, Any] = {
+            "id": current.id,
+            "parent": parent.id if parent is not None and parent.sink is sink else None,
+            "name": name,
+            "start": started,
+            "wall_ms": round(wall * 1000, 3),
+            "cpu_ms": round(cpu * 1000, 3),
+            "items": current.items,
+            "process_max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+        if tracemalloc.is_tracing():
+            # Children reset the peak counter, so fold their peaks back in.
+            peak = max(current._peak, tracemalloc.get_traced_memory()[1])
+            record["peak_alloc_kb"] = round(max(0, peak - memory_base) / 1024, 1)
+            if parent is not None:
+                parent._peak = max(parent._peak, peak)
+        if current.attrs:
+            record["attrs"] = current.attrs
+        if error:
+            record["error"] = error
+        sink.append(record)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Optional[Span]]:
+    """Child span of the active one; a no-op outside any traced node."""
+    parent = _active.get()
+    if parent is None:
+        yield None
+        return
+    with open_span(parent.sink, name, **attrs) as child:
+        yield child
+
+
+def current_span() -> Optional[Span]:
+    return _active.get()
+
+
+def chrome_trace(spans: List[Dict[str, Any]], *, process_name: str = "pipeline") -> Dict[str, Any]:
+    """Spans as Chrome trace 'complete' events (load in chrome://tracing or Perfetto).
+
+    Overlapping siblings (e.g. concurrent per-source fetches) are given their
+    own lanes so nested spans render correctly.
+    """
+    ordered = sorted(spans, key=lambda item: (item["start"], -item["wall_ms"]))
+    origin = ordered[0]["start"] if ordered else 0.0
+    parents = {item["id"]: item.get("parent") for item in spans}
+    lanes: List[List[Dict[str, Any]]] = []
+    events: List[Dict[str, Any]] = [
+        {"name": "process_name", "ph": "M", "pid": 1, "tid": 0, "args": {"name": process_name}}
+    ]
+
+    def _is_ancestor(candidate: int, span_id: Optional[int]) -> bool:
+        while span_id is not None:
+            if span_id == candidate:
+                return True
+            span_id = parents.get(span_id)
+        return False
+
+    for item in ordered:
+        start_us = (item["start"] - origin) * 1e6
+        for lane_idx, stack in enumerate(lanes):
+            while stack and stack[-1]["end_us"] <= start_us:
+                stack.pop()
+            if not stack or _is_ancestor(stack[-1]["id"], item.get("parent")):
+                break
+        else:
+            lanes.append([])
+            lane_idx = len(lanes) - 1
+        lanes[lane_idx].append({"id": item["id"], "end_us": start_us + item["wall_ms"] * 1000})
+
+        args = {key: item[key] for key in ("cpu_ms", "items", "peak_alloc_kb", "process_max_rss_kb", "error") if item.get(key) is not None}
+        args.update(item.get("attrs", {}))
+        events.append({
+            "name": item["name"],
+            "ph": "X",
+            "pid": 1,
+            "tid": lane_idx + 1,
+            "ts": round(start_us, 1),
+            "dur": round(item["wall_ms"] * 1000, 1),
+            "args": args,
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+__all__ = ["Span", "TRACE_MEMORY", "chrome_trace", "current_span", "open_span", "span"]
@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 from pathlib import Path
 from typing import Optional
 
@@ -42,7 +43,10 @@ def _persist_export(flow: dict, export_dir: Path) -> None:
 def sync(flow: dict, config_path: Path = DEFAULT_CONFIG_PATH) -> PipelineConfig:
     config = parse_flow_export(flow)
     config_path.parent.mkdir(parents=True, exist_ok=True)
-    config_path.write_text(config.model_dump_json(indent=2))
+    # Replace the file in one step so services watching it never read a partial config
+    tmp_path = config_path.with_suffix(config_path.suffix + ".tmp")
+    tmp_path.write_text(config.model_dump_json(indent=2))
+    os.replace(tmp_path, config_path)
     print(f"✅ Wrote canonical pipeline config to {config_path}")
     validate_pipeline(config_path)
     print("✅ Configuration validated via LangGraph compile")
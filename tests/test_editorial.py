@@ -8,6 +8,9 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from src.editorial.script_daily import ScriptGenerator
 from src.editorial.story_analyzer import StoryAnalyzer
 from src.editorial.structure_validator import StructureValidator
+from src.editorial.transition_generator import TransitionGenerator
+from src.editorial.cta_generator import CTAGenerator
+from src.editorial.tone_enhancer import ToneEnhancer, ToneRule
 
 
 class EditorialPipelineTest(unittest.TestCase):
@@ -63,6 +66,51 @@ class EditorialPipelineTest(unittest.TestCase):
         result = validator.validate(structure_payload)
         self.assertTrue(result.score >= 0)
 
+    def test_seeded_generators_are_reproducible(self) -> None:
+        tags = ["research", "wow_warm", "segment_0"]
+        first = TransitionGenerator(seed=7)
+        second = TransitionGenerator(seed=7)
+        picks = [first.pick(tags) for _ in range(5)]
+        self.assertEqual(picks, [second.pick(tags) for _ in range(5)])
+
+        used = set()
+        for _ in range(3):
+            phrase = first.pick(["momentum"], used=used)
+            self.assertNotIn(phrase, used)
+            used.add(phrase)
+
+        context = {"risk_level": "threat", "highlight": "", "action": ""}
+        cta_a = CTAGenerator(seed=3).generate("agent rollout", context=context)
+        cta_b = CTAGenerator(seed=3).generate("agent rollout", context=context)
+        self.assertEqual(cta_a, cta_b)
+        self.assertIn(cta_a["id"], {"risk_readiness", "policy_watch", "resilience", "ethics_signal"})
+
+        seeded = ScriptGenerator(seed=11).generate_script(self.sample_stories)
+        repeat = ScriptGenerator(seed=11).generate_script(self.sample_stories)
+        self.assertEqual(seeded["vo_script"], repeat["vo_script"])
+
+    def test_best_of_candidates_reports_runner_ups(self) -> None:
+        generator = ScriptGenerator(seed=5)
+        package = generator.generate_script(self.sample_stories, candidates=3)
+        metadata = package["metadata"]
+        runner_ups = metadata["runner_ups"]
+        self.assertGreaterEqual(len(runner_ups), 2)
+        best = metadata["validator"]
+        for entry in runner_ups:
+            self.assertLessEqual((entry["validator"]["passed"], entry["validator"]["score"]), (best["passed"], best["score"]))
+        self.assertIn(metadata["seed"], {5, 6, 7, None})
+
+    def test_tone_rules_single_pass(self) -> None:
+        enhancer = ToneEnhancer()
+        text = "There is a new model.  It was launched today! Here are the results? They show gains."
+        self.assertEqual(
+            enhancer._apply_rules(text),
+            "drives a new model. It Launched today! fuel the results? They signal gains.",
+        )
+
+        custom = ToneEnhancer(rules=[ToneRule.from_table("jargon", {"leverage": "use"})])
+        self.assertEqual(custom._apply_rules("We leverage agents. It is fine."), "We use agents. It is fine.")
+
 
 if __name__ == "__main__":
     unittest.main()
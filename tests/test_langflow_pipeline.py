@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
+import json
+import os
+import sys
+import time
 from pathlib import Path
 
 import pytest
 
 from langflow_support.builder import build_graph_from_file, build_graph_from_config
+from langflow_support.lock import LOCK_PATH
+from langflow_support.component_registry import COMPONENT_REGISTRY, PipelineComponent
 from langflow_support.parser import parse_flow_export
 from langflow_support.schema import PipelineConfig
+from langflow_support.watcher import PipelineConfigWatcher
+from src.config import settings
 
 
 FIXTURE_DIR = Path("langflow")
@@ -41,3 +49,98 @@ def test_parse_flow_export_generates_config() -> None:
 
     graph = build_graph_from_config(config)
     assert graph is not None
+
+
+def test_graph_cache_follows_config_content(tmp_path: Path) -> None:
+    config_path = tmp_path / "pipeline_config.json"
+    config_path.write_text(CONFIG_PATH.read_text())
+
+    graph = build_graph_from_file(config_path)
+    assert build_graph_from_file(config_path) is graph
+
+    data = json.loads(config_path.read_text())
+    data["pipeline"]["name"] = "edited_pipeline"
+    config_path.write_text(json.dumps(data))
+    rebuilt = build_graph_from_file(config_path)
+    assert rebuilt is not graph
+    assert build_graph_from_file(config_path, use_cache=False) is not rebuilt
+
+
+def test_lazy_nodes_import_on_first_run(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "lazy_demo_nodes.py").write_text(
+        "def tag(state, label='x', config=None):\n"
+        "    return {'metadata': {**state.metadata, 'tag': label}}\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(settings, "LANGGRAPH_CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    monkeypatch.setitem(COMPONENT_REGISTRY, "demo_tag", PipelineComponent("lazy_demo_nodes.tag"))
+    config = PipelineConfig.model_validate(
+        {
+            "pipeline": {"name": "lazy_demo", "state": "UnifiedPipelineState", "entry_point": "tag"},
+            "nodes": [{"id": "tag", "component": "demo_tag", "params": {"label": "lazy"}}],
+            "edges": [],
+            "end_nodes": ["tag"],
+        }
+    )
+
+    graph = build_graph_from_config(config)
+    assert "lazy_demo_nodes" not in sys.modules
+    result = graph.invoke({}, config={"configurable": {"thread_id": "lazy-demo"}})
+    assert "lazy_demo_nodes" in sys.modules
+    assert result["metadata"]["tag"] == "lazy"
+
+
+def test_visual_pipeline_graph_is_built_on_access(monkeypatch: pytest.MonkeyPatch) -> None:
+    import src.unified_visual_pipeline as visual
+
+    assert "graph" not in vars(visual)
+    calls = []
+    monkeypatch.setattr(visual, "build_unified_visual_graph", lambda: calls.append(1) or "compiled")
+    assert visual.graph == "compiled"
+    assert calls == [1]
+
+
+def test_config_watcher_swaps_valid_revisions(tmp_path: Path, monkeypatch) -> None:
+    source = CONFIG_PATH.read_text()
+    monkeypatch.chdir(tmp_path)  # the edit lock lives at LOCK_PATH relative to the working directory
+    config_path = tmp_path / "pipeline_config.json"
+    config_path.write_text(source)
+    watcher = PipelineConfigWatcher(config_path, poll_interval=0.05)
+
+    first = watcher.current()
+    assert first.version == 1
+    assert watcher.check() is False
+
+    config_path.write_text("{not json")
+    assert watcher.check() is False
+    assert watcher.last_error
+    assert watcher.current() is first
+
+    data = json.loads(source)
+    data["pipeline"]["name"] = "edited_pipeline"
+    lock = tmp_path / LOCK_PATH
+    lock.parent.mkdir()
+    lock.write_text("pid=1\n")
+    config_path.write_text(json.dumps(data))
+    assert watcher.check() is False  # sync still holds the edit lock
+    assert watcher.status()["waiting"].startswith("waiting on edit lock since ")
+    assert "stale" not in (watcher.last_error or "")
+
+    os.utime(lock, (time.time() - 3600, time.time() - 3600))  # left behind by a crashed sync
+    assert watcher.check() is False
+    assert "looks stale" in watcher.last_error and str(lock) in watcher.last_error
+    lock.unlink()
+
+    watcher.start()
+    try:
+        deadline = time.monotonic() + 5
+        while watcher.current() is first and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        watcher.stop()
+    second = watcher.current()
+    assert second.version == 2
+    assert second.config.pipeline.name == "edited_pipeline"
+    assert second.graph is not first.graph
+    assert watcher.last_error is None
+    assert watcher.status()["waiting"] is None
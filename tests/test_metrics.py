@@ -0,0 +1,96 @@
+"""Tests for the in-process metrics registry and its instrumentation."""
+
+from pathlib import Path
+import asyncio
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.utils.async_helpers import run_with_retry
+from src.utils.metrics import REGISTRY, MetricsRegistry, track_llm_call
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    fetches = registry.counter("demo_fetch_total", "Fetches", ("source", "outcome"))
+    fetches.inc(source='a "quoted"\nsource', outcome="ok")
+    fetches.inc(2, source="b", outcome="error")
+    depth = registry.gauge("demo_depth", "Queue depth")
+    depth.set(3)
+    depth.dec()
+    latency = registry.histogram("demo_seconds", "Latency", ("source",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 5.0):
+        latency.observe(value, source="a")
+
+    assert registry.counter("demo_fetch_total", "Fetches", ("source", "outcome")) is fetches
+    try:
+        registry.gauge("demo_fetch_total", "Fetches")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("re-registering with another type should fail")
+
+    text = registry.render()
+    assert "# TYPE demo_fetch_total counter" in text
+    assert 'demo_fetch_total{source="a \\"quoted\\"\\nsource",outcome="ok"} 1.0' in text
+    assert 'demo_fetch_total{source="b",outcome="error"} 2.0' in text
+    assert "demo_depth 2.0" in text
+    assert 'demo_seconds_bucket{source="a",le="0.1"} 2' in text  # le is inclusive
+    assert 'demo_seconds_bucket{source="a",le="1.0"} 3' in text
+    assert 'demo_seconds_bucket{source="a",le="+Inf"} 4' in text
+    assert 'demo_seconds_count{source="a"} 4' in text
+    assert latency.stats(source="a") == {"count": 4, "sum": 5.65}
+
+
+def test_fetch_retry_llm_and_checkpoint_metrics(tmp_path):
+    from benchmarks.replay_server import ReplayServer
+    from src.graphs.checkpoints import FileCheckpointSaver
+    from src.ingest.rss_arxiv import fetch_rss_async
+    from src.models import StorySource
+
+    REGISTRY.clear()
+    with ReplayServer(sources=1, items_per_source=4) as server:
+        good = StorySource(name="replay-feed", url=f"{server.url}/feeds/0.xml")
+        bad = StorySource(name="missing-feed", url="http://127.0.0.1:9/feed.xml")
+        stories = asyncio.run(fetch_rss_async([good], max_items=10))
+        try:
+            asyncio.run(fetch_rss_async([bad], timeout=0.5))
+        except Exception:
+            pass
+
+    assert len(stories) == 4
+    assert REGISTRY.get("pipeline_feed_items_total").value(source="replay-feed") == 4
+    assert REGISTRY.get("pipeline_feed_fetch_total").value(source="replay-feed", outcome="ok") == 1
+    assert REGISTRY.get("pipeline_feed_fetch_total").value(source="missing-feed", outcome="error") == 1
+    assert REGISTRY.get("pipeline_feed_fetch_seconds").stats(source="replay-feed")["count"] == 1
+    operation = "_fetch_feed.<locals>._do_request"
+    assert REGISTRY.get("pipeline_retry_attempts_total").value(operation=operation, outcome="ok") == 1
+    assert REGISTRY.get("pipeline_retry_attempts_total").value(operation=operation, outcome="error") == 3
+    assert REGISTRY.get("pipeline_retry_exhausted_total").value(operation=operation) == 1
+
+    async def rejected():
+        raise ValueError("bad request")
+
+    try:
+        asyncio.run(run_with_retry(rejected, attempts=3, wait_initial=0, retry_exceptions=(OSError,)))
+    except ValueError:
+        pass
+    assert REGISTRY.get("pipeline_retry_attempts_total").value(operation=rejected.__qualname__, outcome="error") == 1
+    assert REGISTRY.get("pipeline_retry_exhausted_total").value(operation=rejected.__qualname__) == 0
+
+    with track_llm_call("tone", "gpt-test") as call:
+        call.usage({"prompt_tokens": 12, "completion_tokens": 5})
+    try:
+        with track_llm_call("tone", "gpt-test"):
+            raise RuntimeError("provider down")
+    except RuntimeError:
+        pass
+    assert REGISTRY.get("pipeline_llm_requests_total").value(purpose="tone", model="gpt-test", outcome="error") == 1
+    assert REGISTRY.get("pipeline_llm_tokens_total").value(purpose="tone", model="gpt-test", kind="prompt") == 12
+
+    saver = FileCheckpointSaver(tmp_path / "research")
+    config = {"configurable": {"thread_id": "t1"}}
+    saver.put(config, {"id": "1", "channel_values": {}}, {}, {})
+    assert REGISTRY.get("pipeline_checkpoint_write_seconds").stats(workflow="research", op="put")["count"] == 1
+    assert REGISTRY.get("pipeline_checkpoint_write_bytes_total").value(workflow="research") > 0
+    assert "pipeline_feed_fetch_seconds_bucket" in REGISTRY.render()
@@ -0,0 +1,619 @@
+"""Tests for produce-stage caching helpers."""
+
+from pathlib import Path
+import asyncio
+import hashlib
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.produce.asset_search_cache import AssetSearchCache
+from src.produce.enhanced_broll_research import EnhancedBrollResearch
+from src.produce.media_store import MediaStore
+from src.produce.runway_cache import LocalRunwayCache
+from src.produce.runway_client import RunwayAssetType, RunwayJob
+from src.produce.runway_visual_director import RunwayVisualDirector
+from src.produce.shotstack_dynamic import ShotstackDynamic
+from src.produce.shotstack_timeline import IncrementalRenderer, SegmentRenderCache, Timeline, diff_timelines
+from src.produce.render_queue import RenderQueue, RenderWorker, enqueue_render
+from src.produce.render_poller import ProviderSpec, RenderJobFailed, RenderJobPoller, DEFAULT_PROVIDERS
+from src.produce.voiceover_alignment import align_shot_list, align_voiceover
+from src.tts.engine import LocalTTS, TTSEngine
+from src.models import ScriptDraft, SegmentDraft
+
+
+def _asset(idx):
+    return {"id": str(idx), "url": f"https://cdn.example.com/{idx}.mp4", "source": "pexels", "relevance_score": 40}
+
+
+def test_asset_search_cache_expires_and_evicts_lru(tmp_path):
+    cache = AssetSearchCache(tmp_path / "broll" / "search.sqlite3", max_entries=2)
+    assert cache.get("pexels", "anything", "video", "landscape") is None and len(cache) == 0
+    assert not (tmp_path / "broll").exists()  # created by the first write, not by construction or reads
+    cache.put("pexels", "Brain  Neural Network", "video", "landscape", [_asset(1)])
+    cache.put("pexels", "data streams", "video", "landscape", [_asset(2)])
+
+    hit = cache.get("pexels", "brain neural network", "video", "landscape")
+    assert hit == [{k: v for k, v in _asset(1).items() if k != "relevance_score"}]
+
+    cache.put("pixabay", "robot assembly line", "image", "landscape", [_asset(3)])
+    assert len(cache) == 2
+    assert cache.get("pexels", "data streams", "video", "landscape") is None
+    assert cache.get("pexels", "brain neural network", "video", "landscape") is not None
+
+    cache.ttl_seconds = -1
+    assert cache.get("pixabay", "robot assembly line", "image", "landscape") is None
+    cache.close()
+
+
+def test_broll_search_calls_each_provider_once_per_unique_query(monkeypatch):
+    monkeypatch.setenv("PEXELS_API_KEY", "test")
+    monkeypatch.setenv("PIXABAY_API_KEY", "test")
+    monkeypatch.setenv("BROLL_SEARCH_CACHE_ENABLED", "false")
+    researcher = EnhancedBrollResearch()
+    calls = []
+
+    def fake_provider(source):
+        async def search(session, query, style):
+            calls.append((source, query, style))
+            await asyncio.sleep(0)
+            # Every query returns the same clip, so shots see it repeatedly
+            return [{"id": "shared", "source": source, "url": f"https://{source}.example.com/shared.mp4",
+                     "type": "video", "query": query, "width": 1920},
+                    {"id": query, "source": source, "url": f"https://{source}.example.com/{query}.mp4",
+                     "type": "video", "query": query, "width": 1280}]
+        return search
+
+    researcher._search_pexels_async = fake_provider("pexels")
+    researcher._search_pixabay_async = fake_provider("pixabay")
+
+    shot = {"keywords": ["AI", "chips", "innovation"], "style": "Cinematic"}
+    shots = [dict(shot), dict(shot), dict(shot, keywords=["AI", "chips"]), dict(shot, style="Documentary/Stock")]
+    results = asyncio.run(researcher.search_engine.research(None, shots))
+
+    # One Pexels call per distinct (query, media) across all shots; Cinematic and
+    # Documentary/Stock select different media, so a query shared by both runs twice
+    expected = {(query, item["style"] == "Cinematic") for item in shots
+                for query in researcher._build_layered_queries(item["keywords"], item["style"])}
+    assert sorted((query, style == "Cinematic") for source, query, style in calls if source == "pexels") == sorted(expected)
+    assert len(calls) == len(set(calls))
+    assert researcher.search_engine.stats["provider_calls"] == len(calls)
+    assert researcher.search_engine.stats["planned_calls"] > len(calls)
+
+    for assets in results:
+        ids = [(asset["source"], asset["id"]) for asset in assets]
+        assert len(ids) == len(set(ids)) == 3
+    assert results[0] == results[1] and results[0][0] is not results[1][0]
+
+    # Cache reads and writes run in worker threads, not on the event loop
+    class _ThreadRecordingCache(AssetSearchCache):
+        def get(self, *args):
+            threads.add(threading.get_ident())
+            return super().get(*args)
+
+        def put(self, *args):
+            threads.add(threading.get_ident())
+            return super().put(*args)
+
+    async def research_with_cache():
+        loop_thread.append(threading.get_ident())
+        return await researcher.search_engine.research(None, shots[:1])
+
+    threads, loop_thread = set(), []
+    researcher.search_engine.cache = _ThreadRecordingCache(":memory:")
+    asyncio.run(research_with_cache())
+    assert threads and loop_thread[0] not in threads
+
+
+def test_media_store_resumes_dedupes_and_evicts(tmp_path):
+    bodies = {"/a.mp4": b"clip-a" * 100, "/mirror/a.mp4": b"clip-a" * 100, "/b.mp4": b"clip-b" * 100,
+              "/c.mp4": b"clip-c" * 100}
+    ranges = []
+
+    def handler(request):
+        body = bodies[request.url.path]
+        etag = f'"{hashlib.sha256(body).hexdigest()[:8]}"'
+        range_header = request.headers.get("Range")
+        ranges.append(range_header)
+        if range_header and request.headers.get("If-Range", etag) == etag:
+            start = int(range_header.split("=")[1].rstrip("-"))
+            return httpx.Response(206, content=body[start:], headers={"ETag": etag})
+        return httpx.Response(200, content=body, headers={"ETag": etag})
+
+    store = MediaStore(str(tmp_path / "media"), max_bytes=1000, public_base_url="https://cdn.example.com/media")
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    url_a = "https://assets.example.com/a.mp4"
+    partial = store.partial_dir / (hashlib.sha256(url_a.encode()).hexdigest() + ".part")
+    partial.write_bytes(bodies["/a.mp4"][:250])
+    partial.with_suffix(".validator").write_text(f'"{hashlib.sha256(bodies["/a.mp4"]).hexdigest()[:8]}"')
+    blob = store.fetch(url_a, client)
+    assert ranges == ["bytes=250-"]
+    assert not partial.with_suffix(".validator").exists()
+    assert blob.read_bytes() == bodies["/a.mp4"]
+    assert blob.name == hashlib.sha256(bodies["/a.mp4"]).hexdigest()
+
+    assert store.fetch("https://other.example.com/mirror/a.mp4", client) == blob
+    output = store.materialize(url_a, str(tmp_path / "out" / "final.mp4"), client)
+    assert len(ranges) == 2
+    assert Path(output).stat().st_nlink == 2
+    assert store.public_url(url_a).endswith(f"/{blob.parent.name}/{blob.name}")
+
+    store.fetch("https://assets.example.com/b.mp4", client)
+    assert store.local_path(url_a) is None
+    assert Path(output).read_bytes() == bodies["/a.mp4"]
+    assert store.total_bytes() == 600
+
+    # The remote object changed since the partial was written: If-Range fails and it restarts
+    ranges.clear()
+    url_c = "https://assets.example.com/c.mp4"
+    partial = store.partial_dir / (hashlib.sha256(url_c.encode()).hexdigest() + ".part")
+    partial.write_bytes(b"stale-" * 40)
+    partial.with_suffix(".validator").write_text('"old"')
+    assert store.fetch(url_c, client).read_bytes() == bodies["/c.mp4"]
+    assert ranges == ["bytes=240-"]
+
+    # Blobs named digest + extension by older stores are renamed once when the index is loaded
+    digest = hashlib.sha256(bodies["/c.mp4"]).hexdigest()
+    current = store._blob_path(digest)
+    current.rename(current.with_name(digest + ".mp4"))
+    index = json.loads(store.index_path.read_text())
+    del index["layout"]
+    store.index_path.write_text(json.dumps(index))
+    reopened = MediaStore(str(tmp_path / "media"), max_bytes=1000)
+    assert reopened.local_path(url_c) == current and current.read_bytes() == bodies["/c.mp4"]
+    assert json.loads(store.index_path.read_text())["layout"] == 2
+
+
+def test_media_store_discards_stale_partials_and_serializes_downloads(tmp_path):
+    body = b"fresh-render" * 50
+    requests = []
+    gate = threading.Event()
+
+    def handler(request):
+        range_header = request.headers.get("Range")
+        requests.append(range_header)
+        gate.wait(5)
+        start = int(range_header.split("=")[1].rstrip("-")) if range_header else 0
+        if start >= len(body):
+            return httpx.Response(416, headers={"Content-Range": f"bytes */{len(body)}"})
+        return httpx.Response(206 if start else 200, content=body[start:])
+
+    store = MediaStore(str(tmp_path / "media"))
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    # A leftover partial longer than the current body is not mistaken for a finished download
+    url = "https://renders.example.com/final.mp4"
+    partial = store.partial_dir / (hashlib.sha256(url.encode()).hexdigest() + ".part")
+    partial.write_bytes(b"x" * (len(body) + 10))
+    partial.with_suffix(".validator").write_text('"v1"')
+    gate.set()
+    assert store.fetch(url, client).read_bytes() == body
+    assert requests == [f"bytes={len(body) + 10}-", None]
+
+    # Concurrent fetches of one URL download it once instead of sharing the partial
+    requests.clear()
+    gate.clear()
+    other = "https://renders.example.com/other.mp4"
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(store.fetch, other, client) for _ in range(4)]
+        time.sleep(0.1)
+        gate.set()
+        paths = {future.result() for future in futures}
+    assert requests == [None]
+    assert len(paths) == 1 and paths.pop().read_bytes() == body
+
+
+def test_render_poller_multiplexes_jobs_and_persists_outstanding(tmp_path):
+    polls = {"r1": 0, "r2": 0}
+
+    def handler(request):
+        job_id = request.url.path.rsplit("/", 1)[-1]
+        polls[job_id] += 1
+        if job_id == "r2":
+            return httpx.Response(200, json={"response": {"status": "failed", "error": "bad asset"}})
+        status = "done" if polls[job_id] >= 3 else "rendering"
+        return httpx.Response(200, json={"response": {"status": status, "url": "https://cdn.example.com/r1.mp4"}})
+
+    state_path = tmp_path / "jobs.json"
+    fast = {"shotstack": ProviderSpec(DEFAULT_PROVIDERS["shotstack"].parse, initial_interval=0.01)}
+    poller = RenderJobPoller(str(state_path), providers=fast, transport=httpx.MockTransport(handler))
+    settled = []
+    done = poller.track("shotstack", "r1", "https://api.example.com/render/r1", callback=settled.append)
+    failed = poller.track("shotstack", "r2", "https://api.example.com/render/r2")
+    assert poller.track("shotstack", "r1", "https://api.example.com/render/r1") is done
+
+    assert done.result(timeout=5)["url"].endswith("r1.mp4")
+    try:
+        failed.result(timeout=5)
+    except RenderJobFailed as e:
+        assert e.data["error"] == "bad asset"
+    else:
+        raise AssertionError("failed render should raise")
+    assert settled == [done]
+    assert polls == {"r1": 3, "r2": 1}
+    assert json.loads(state_path.read_text()) == {"jobs": []}
+    poller.shutdown()
+
+    state_path.write_text(json.dumps({"jobs": [{
+        "provider": "shotstack", "job_id": "r1", "status_url": "https://api.example.com/render/r1",
+        "deadline": 4102444800, "metadata": {},
+    }]}))
+    restarted = RenderJobPoller(str(state_path), providers=fast, transport=httpx.MockTransport(handler))
+    resumed = restarted.resume()
+    assert resumed["shotstack:r1"].result(timeout=5)["status"] == "done"
+    restarted.shutdown()
+
+
+class _FakeSelector:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.rendered = []
+
+    def choose_renderer(self, script, segments, prefer_shotstack=True):
+        return "shotstack" if prefer_shotstack else "pictory"
+
+    def fallback_for(self, renderer):
+        return "pictory" if renderer == "shotstack" else None
+
+    def render_with(self, renderer, script, title, segments, voiceover_url, output_path, style="professional"):
+        if (renderer, title) in self.failing:
+            raise RuntimeError(f"{renderer} down")
+        self.rendered.append((renderer, title))
+        return output_path
+
+
+def test_render_queue_orders_by_priority_and_falls_back(tmp_path):
+    queue = RenderQueue(str(tmp_path / "queue.sqlite3"), provider_limits={"shotstack": 1, "pictory": 1}, retry_delay=0)
+    selector = _FakeSelector(failing={("shotstack", "Weekly")})
+    weekly = enqueue_render(queue, selector, "s", "Weekly", [], None, "weekly.mp4", priority="weekly")
+    enqueue_render(queue, selector, "s", "Daily", [], None, "daily.mp4")
+    enqueue_render(queue, selector, "s", "Breaking", [], None, "breaking.mp4", priority="breaking")
+
+    first = queue.claim("w1")
+    assert first["request"]["title"] == "Breaking"
+    assert queue.claim("w2") is None  # shotstack cap reached
+    assert queue.complete(first["id"], "w1", "breaking.mp4")
+
+    RenderWorker(queue, selector, poll_interval=0.05).run(concurrency=2, stop_when_idle=True)
+    assert selector.rendered == [("shotstack", "Daily"), ("pictory", "Weekly")]
+    job = queue.get(weekly)
+    assert (job["status"], job["renderer"], job["attempts"]) == ("done", "pictory", 1)
+    assert [job["status"] for job in queue.jobs()] == ["done"] * 3
+
+
+def test_render_worker_once_waits_for_backoff_and_renews_leases(tmp_path):
+    queue = RenderQueue(str(tmp_path / "queue.sqlite3"), provider_limits={"shotstack": 1, "pictory": 1},
+                        retry_delay=0.3, lease_seconds=0.3)
+
+    class _SlowSelector(_FakeSelector):
+        def render_with(self, renderer, script, title, *args, **kwargs):
+            if title == "Slow":
+                time.sleep(0.8)  # longer than the lease
+                assert queue.claim("intruder") is None
+            return super().render_with(renderer, script, title, *args, **kwargs)
+
+    selector = _SlowSelector(failing={("shotstack", "Retry")})
+    retry = enqueue_render(queue, selector, "s", "Retry", [], None, "retry.mp4")
+    slow = enqueue_render(queue, selector, "s", "Slow", [], None, "slow.mp4", prefer_shotstack=False)
+
+    # The retry sits in backoff while the slow render holds its lease; --once must wait for both
+    RenderWorker(queue, selector, poll_interval=0.05).run(concurrency=2, stop_when_idle=True)
+    assert queue.get(retry)["status"] == "done"
+    assert queue.get(slow)["status"] == "done"
+    assert sorted(selector.rendered) == [("pictory", "Retry"), ("pictory", "Slow")]
+    assert queue.outstanding() == 0
+
+
+def test_render_queue_rejects_outcomes_from_expired_leases(tmp_path):
+    queue = RenderQueue(str(tmp_path / "queue.sqlite3"), provider_limits={"shotstack": 1, "pictory": 1},
+                        lease_seconds=0.1)
+
+    class _StalledSelector(_FakeSelector):
+        def render_with(self, renderer, script, title, *args, **kwargs):
+            time.sleep(0.2)  # the lease runs out and another worker picks the job up
+            assert queue.claim("intruder")["id"] == job_id
+            return super().render_with(renderer, script, title, *args, **kwargs)
+
+    selector = _StalledSelector()
+    job_id = enqueue_render(queue, selector, "s", "Stalled", [], None, "stalled.mp4")
+    worker = RenderWorker(queue, selector, poll_interval=0.05)
+    worker._start_heartbeat = lambda job_id: threading.Event()  # a worker that stopped renewing
+
+    assert worker.run_once()["status"] == "lease_lost"
+    job = queue.get(job_id)
+    assert (job["status"], job["worker"], job["result"]) == ("running", "intruder", None)
+    assert queue.fail(job_id, worker.worker_id, "late error") is None
+    assert queue.complete(job_id, "intruder", "stalled.mp4")
+    assert queue.get(job_id)["status"] == "done"
+
+
+def test_local_runway_cache_keeps_media_and_misses_after_eviction(tmp_path):
+    client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=b"gen3")))
+    store = MediaStore(str(tmp_path / "media"))
+    cache = LocalRunwayCache(str(tmp_path / "runway"), media_store=store, http_client=client)
+    record = {"job_id": "j1", "job_type": "VIDEO_GEN", "result_url": "https://runway.example.com/j1.mp4", "metadata": {}}
+
+    stored_url = asyncio.run(cache.put("key", record))
+    assert stored_url != record["result_url"] and Path(stored_url).read_bytes() == b"gen3"
+    reloaded = LocalRunwayCache(str(tmp_path / "runway"), media_store=store)
+    cached = asyncio.run(reloaded.get("key"))
+    assert cached["result_url"] == stored_url == cached["local_path"]
+
+    store.public_base_url = "https://cdn.example.com/media"
+    assert asyncio.run(reloaded.get("key"))["result_url"].startswith("https://cdn.example.com/media/")
+
+    Path(cached["local_path"]).unlink()
+    assert asyncio.run(reloaded.get("key")) is None
+
+
+def test_runway_client_coalesces_identical_generations(tmp_path, monkeypatch):
+    from src.produce import runway_client
+    from src.produce.runway_client import RunwayMLClient
+
+    submits = []
+
+    async def api(request):
+        if request.method == "POST":
+            submits.append(request.url.path)
+            await asyncio.sleep(0.05)  # both callers arrive while the submit is in flight
+            return httpx.Response(200, json={"id": "job-1"})
+        return httpx.Response(200, json={"status": "completed", "output_url": "https://runway.example.com/job-1.mp4"})
+
+    def media(request):
+        return httpx.Response(200, content=b"gen3-video")
+
+    monkeypatch.setenv("RUNWAY_API_KEY", "test")
+    fast = {"runway": ProviderSpec(DEFAULT_PROVIDERS["runway"].parse, initial_interval=0.01)}
+    poller = RenderJobPoller(str(tmp_path / "jobs.json"), providers=fast, transport=httpx.MockTransport(api))
+    monkeypatch.setattr(runway_client, "get_render_poller", lambda: poller)
+    cache = LocalRunwayCache(
+        str(tmp_path / "runway"),
+        media_store=MediaStore(str(tmp_path / "media")),
+        http_client=httpx.Client(transport=httpx.MockTransport(media)),
+    )
+    client = RunwayMLClient(cache=cache)
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(api), headers=client.client.headers)
+
+    async def scenario():
+        first, second = await asyncio.gather(
+            client.generate_video("robot lab", duration=4), client.generate_video("robot lab", duration=4)
+        )
+        done = await asyncio.gather(client.wait_for_completion(first), client.wait_for_completion(second))
+        replay = await client.generate_video("robot lab", duration=4)
+        await client.close()
+        return first, second, done, replay
+
+    try:
+        first, second, done, replay = asyncio.run(scenario())
+    finally:
+        poller.shutdown()
+
+    assert submits == ["/v1/gen3/turbo"]
+    assert first is second and done[0] is done[1]
+    assert replay.status == "completed" and replay.job_id == "job-1"
+    assert Path(replay.result_url).read_bytes() == b"gen3-video"
+    assert replay.result_url == done[0].result_url
+
+
+def test_visual_director_bounds_runway_jobs_and_keeps_segment_order(tmp_path, monkeypatch):
+    monkeypatch.setenv("RUNWAY_API_KEY", "test")
+    monkeypatch.setenv("RUNWAY_CACHE_BACKEND", "none")
+    director = RunwayVisualDirector(max_runway_jobs=2)
+    active = {"now": 0, "peak": 0}
+
+    class _FakeRunway:
+        async def generate_video(self, prompt, duration, style, seed):
+            return RunwayJob(job_id=f"job-{duration}", status="processing", job_type=RunwayAssetType.VIDEO_GEN)
+
+        async def wait_for_completion(self, job):
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            # Later segments finish first
+            await asyncio.sleep(0.05 / float(job.job_id.split("-")[1]))
+            active["now"] -= 1
+            job.result_url = f"https://runway.example.com/{job.job_id}.mp4"
+            return job
+
+        async def close(self):
+            pass
+
+    director.client = _FakeRunway()
+    segments = [{"id": idx, "keywords": ["AI"], "duration": idx + 1} for idx in range(6)]
+    finished = []
+    plans = asyncio.run(director.direct_all(segments, on_plan=lambda index, plan: finished.append(index)))
+
+    assert active["peak"] == 2
+    assert finished != sorted(finished)
+    assert [plan["segment_id"] for plan in plans] == list(range(6))
+    assert [plan["layers"][0].content for plan in plans] == [
+        f"https://runway.example.com/job-{idx + 1}.mp4" for idx in range(6)
+    ]
+
+    with pytest.raises(ValueError, match="1 timings for 6 segments"):
+        asyncio.run(director.direct_all(segments, [{"duration": 5.0}]))
+
+
+class _RecordingShotstack(ShotstackDynamic):
+    def __init__(self):
+        super().__init__()
+        self.submitted = []
+
+    def render_video(self, timeline, webhook_url=None):
+        self.submitted.append(timeline)
+        return f"render-{len(self.submitted)}"
+
+    def wait_for_render(self, render_id, timeout=120):
+        return f"https://cdn.example.com/{render_id}.mp4"
+
+
+def test_incremental_render_only_rerenders_changed_segment(tmp_path, monkeypatch):
+    monkeypatch.setenv("SHOTSTACK_API_KEY", "test")
+    shot_list = [
+        {
+            "duration": 12,
+            "shots": [
+                {"style": "Cinematic", "text_overlay": f"Story {idx} headline",
+                 "assets": [{"url": f"https://cdn.example.com/{idx}-{shot}.mp4", "type": "video"}]}
+                for shot in range(2)
+            ],
+        }
+        for idx in range(4)
+    ]
+    builder = _RecordingShotstack()
+    first = builder.build_dynamic_timeline(shot_list, "https://cdn.example.com/vo.mp3", 60)
+    assert builder.build_dynamic_timeline(shot_list, "https://cdn.example.com/vo.mp3", 60) == first
+
+    shot_list[2]["shots"][1]["text_overlay"] = "Corrected headline"
+    second = builder.build_dynamic_timeline(shot_list, "https://cdn.example.com/vo.mp3", 60)
+    diff = diff_timelines(first, second)
+    assert (len(diff.added), len(diff.removed)) == (1, 1)
+    assert diff.changed_ranges == [(30.0, 36.0)]
+
+    renderer = IncrementalRenderer(builder, SegmentRenderCache(str(tmp_path / "segments.json")))
+    full = renderer.render(first)
+    assert full["rendered"] == len(full["segments"]) > 1
+
+    builder.submitted.clear()
+    patched = renderer.render(second, first)
+    assert patched["rendered"] == 1
+    assert patched["reused"] == len(patched["segments"]) - 1
+    assert len(builder.submitted) == 2  # one segment plus the stitch
+    assert patched["changed_ranges"] == [(30.0, 36.0)]
+
+
+def test_segment_render_cache_expires_provider_urls_and_serves_mirror(tmp_path, monkeypatch):
+    edit = {"timeline": {
+        "soundtrack": {"src": "https://cdn.example.com/vo.mp3", "effect": "fadeInFadeOut", "volume": 0.8},
+        "tracks": [{"clips": [{"asset": {"type": "video", "src": f"https://cdn.example.com/{idx}.mp4"},
+                               "start": idx * 10, "length": 10} for idx in range(3)]}],
+    }, "output": {"format": "mp4"}}
+    timeline = Timeline.from_shotstack(edit)
+    audio = [
+        timeline.segment_edit(start, end)["timeline"]["tracks"][-1]["clips"][0]["asset"]
+        for start, end in [(0, 10), (10, 20), (20, 30)]
+    ]
+    assert [asset.get("effect") for asset in audio] == ["fadeIn", None, "fadeOut"]
+    assert all(asset["volume"] == 0.8 for asset in audio)
+
+    # Provider URLs are only reused within the TTL
+    clock = [1000.0]
+    monkeypatch.setattr("src.produce.shotstack_timeline.time.time", lambda: clock[0])
+    cache = SegmentRenderCache(str(tmp_path / "segments.json"), media_store=MediaStore(str(tmp_path / "media")), ttl=60)
+    assert cache.put("seg", "https://shotstack.example.com/render-1.mp4") == "https://shotstack.example.com/render-1.mp4"
+    clock[0] += 59
+    assert SegmentRenderCache(str(tmp_path / "segments.json"), ttl=60).get("seg") is not None
+    clock[0] += 2
+    assert cache.get("seg") is None
+
+    # With a public mirror the stored copy outlives the provider URL
+    client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=b"segment")))
+    store = MediaStore(str(tmp_path / "media"), public_base_url="https://media.example.com")
+    mirrored = SegmentRenderCache(str(tmp_path / "mirrored.json"), media_store=store, ttl=60, http_client=client)
+    url = mirrored.put("seg", "https://shotstack.example.com/render-2.mp4")
+    assert url.startswith("https://media.example.com/")
+    clock[0] += 3600
+    assert mirrored.get("seg") == url
+
+
+def test_voiceover_alignment_cuts_on_pauses_and_matches_audio(tmp_path, monkeypatch):
+    monkeypatch.setenv("SHOTSTACK_API_KEY", "test")
+    engine = TTSEngine(LocalTTS(words_per_minute=150, sample_rate=4000, pause=0.4), cache_dir=tmp_path / "tts")
+    units = [(f"part_{idx}", " ".join(["word"] * words)) for idx, words in enumerate([12, 30, 8])]
+    synthesis = engine.synthesize_units(units, str(tmp_path / "vo.wav"))
+    boundaries = [segment.start for segment in synthesis.segments[1:]]
+
+    # Estimated durations drift from the narration; cuts still land in the real pauses
+    shot_list = [
+        {"duration": estimate, "shots": [{"assets": [{"url": f"https://cdn.example.com/{idx}-{n}.mp4", "type": "video"}]} for n in range(2)]}
+        for idx, estimate in enumerate([6, 13, 3])
+    ]
+    alignment = align_voiceover(shot_list, synthesis.path)
+    assert abs(alignment.duration - synthesis.duration) < 1e-2
+    for (_, end), boundary in zip(alignment.segment_bounds, boundaries):
+        assert boundary - 0.4 <= end <= boundary
+
+    # Exact TTS timings are used verbatim when they match the shot list
+    exact = align_shot_list(shot_list, synthesis.duration, [vars(s) for s in synthesis.segments])
+    assert [start for start, _ in exact.segment_bounds[1:]] == boundaries
+
+    timeline = ShotstackDynamic().build_dynamic_timeline(shot_list, "https://cdn.example.com/vo.wav", 0, alignment=exact)
+    clips = timeline["timeline"]["tracks"][0]["clips"]
+    assert clips[0]["start"] == 0
+    for previous, clip in zip(clips, clips[1:]):
+        assert abs(previous["start"] + previous["length"] - clip["start"]) < 1e-3
+    assert abs(clips[-1]["start"] + clips[-1]["length"] - synthesis.duration) < 1e-3
+    assert clips[2]["start"] == boundaries[0]
+
+
+def test_voiceover_alignment_maps_draft_units_onto_shot_list(tmp_path):
+    def segment(words):
+        return SegmentDraft(headline="h", what="", so_what="", now_what="", analogy="", wow_factor="",
+                            transition="", voiceover=" ".join(["word"] * words))
+
+    draft = ScriptDraft(
+        headline_blitz=["Three stories today"],
+        segments=[segment(10), segment(25), segment(6)],
+        acts={"act3": {"closing": "That is the briefing", "sign_off": "See you tomorrow"}},
+    )
+    engine = TTSEngine(LocalTTS(words_per_minute=150, sample_rate=4000, pause=0.4), cache_dir=tmp_path / "tts")
+    synthesis = engine.synthesize_draft(draft, str(tmp_path / "vo.wav"))
+    starts = {s.name: s.start for s in synthesis.segments}
+    assert [s.name for s in synthesis.segments] == ["intro", "segment_0", "segment_1", "segment_2", "outro"]
+
+    # Intro and outro are extra units: segments still map by id, not by count
+    shot_list = [{"duration": 5, "shots": []} for _ in draft.segments]
+    alignment = align_shot_list(shot_list, synthesis.duration, synthesis.segments)
+    assert alignment.segment_bounds == [
+        (0.0, starts["segment_1"]),
+        (starts["segment_1"], starts["segment_2"]),
+        (starts["segment_2"], synthesis.duration),
+    ]
+
+    # Explicit ids and the dict form stored in pipeline artifacts
+    reordered = [{"id": 1, "duration": 5}, {"segment_id": "segment_2", "duration": 5}]
+    stored = [{"name": s.name, "start": s.start, "duration": s.duration} for s in synthesis.segments]
+    assert align_shot_list(reordered, synthesis.duration, stored).segment_bounds == [
+        (0.0, starts["segment_2"]), (starts["segment_2"], synthesis.duration)
+    ]
+
+
+def test_render_poller_survives_cancelled_waiters_and_bad_bodies(tmp_path):
+    polls = {"slow": 0, "cancel": 0, "weird": 0}
+
+    def handler(request):
+        job_id = request.url.path.rsplit("/", 1)[-1]
+        polls[job_id] += 1
+        if job_id == "weird":
+            return httpx.Response(200, json=["not", "a", "dict"])
+        status = "done" if job_id == "slow" and polls[job_id] >= 6 else "rendering"
+        return httpx.Response(200, json={"response": {"status": status, "renderProgress": polls[job_id]}})
+
+    fast = {"shotstack": ProviderSpec(DEFAULT_PROVIDERS["shotstack"].parse, initial_interval=0.01, max_interval=0.02)}
+    poller = RenderJobPoller(str(tmp_path / "jobs.json"), providers=fast, transport=httpx.MockTransport(handler))
+
+    async def waiters():
+        slow = asyncio.ensure_future(poller.wait_async("shotstack", "slow", "https://api.example.com/render/slow"))
+        try:
+            await asyncio.wait_for(poller.wait_async("shotstack", "cancel", "https://api.example.com/render/cancel"), 0.03)
+        except asyncio.TimeoutError:
+            pass
+        return await asyncio.wait_for(slow, 5)
+
+    weird = poller.track("shotstack", "weird", "https://api.example.com/render/weird")
+    assert asyncio.run(waiters())["status"] == "done"
+    try:
+        weird.result(timeout=5)
+    except RuntimeError as e:
+        assert "weird" in str(e)
+    else:
+        raise AssertionError("non-dict status body should fail the job")
+    assert poller.outstanding() == []
+    poller.shutdown()
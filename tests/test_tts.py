@@ -0,0 +1,94 @@
+"""Tests for segment-parallel TTS and the pure-Python audio helpers."""
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.editorial.script_adapter import generate_script_draft
+from src.models.scripts import ScriptDraft, SegmentDraft
+from src.tts.audio import wav_duration
+from src.tts.engine import LocalTTS, TTSEngine, script_units
+
+
+def _segment(idx, voiceover):
+    return SegmentDraft(
+        headline=f"Story {idx}",
+        what="what",
+        so_what="so what",
+        now_what="now what",
+        analogy="analogy",
+        wow_factor="wow",
+        transition="next",
+        voiceover=voiceover,
+    )
+
+
+def _draft(second_voiceover):
+    return ScriptDraft(
+        headline_blitz=["Chips get faster.", "Models get cheaper."],
+        acts={
+            "act1": {"hook": "Three moves reshaped AI this week.", "bridge": "Here is what matters."},
+            "act3": {"closing": "That is the brief.", "cta": {"question": "Which move hits you first?"}, "sign_off": "See you tomorrow."},
+        },
+        segments=[
+            _segment(0, "Nvidia shipped a new accelerator that halves inference cost for large models."),
+            _segment(1, second_voiceover),
+        ],
+    )
+
+
+def test_tts_engine_caches_segments_and_reports_durations(tmp_path):
+    backend = LocalTTS(words_per_minute=300, sample_rate=4000, pause=0.25)
+    engine = TTSEngine(backend, cache_dir=tmp_path / "cache", max_workers=4)
+    calls = []
+    synthesize = backend.synthesize
+    backend.synthesize = lambda text: calls.append(text) or synthesize(text)
+
+    draft = _draft("Regulators agreed on a shared safety standard for frontier labs.")
+    assert [name for name, _ in script_units(draft)] == ["intro", "segment_0", "segment_1", "outro"]
+
+    first = engine.synthesize_draft(draft, str(tmp_path / "vo1.wav"))
+    assert len(calls) == 4
+    assert not any(segment.cached for segment in first.segments)
+
+    # Each segment lasts words/wpm plus the trailing pause, and starts where the previous ended
+    for segment in first.segments:
+        words = len(segment.text.split())
+        assert abs(segment.duration - (int(words / 300 * 60 * 4000) / 4000 + 0.25)) < 1e-3
+    starts = [segment.start for segment in first.segments]
+    ends = [segment.start + segment.duration for segment in first.segments]
+    assert starts[1:] == [round(end, 3) for end in ends[:-1]]
+    assert abs(wav_duration(Path(first.path).read_bytes()) - first.duration) < 1e-2
+
+    # Editing one segment re-synthesizes only that segment
+    calls.clear()
+    edited = _draft("Regulators in three regions agreed on a shared safety standard for frontier labs.")
+    second = engine.synthesize_draft(edited, str(tmp_path / "vo2.wav"))
+    assert calls == [edited.segments[1].voiceover]
+    assert [segment.cached for segment in second.segments] == [True, True, False, True]
+    assert second.segment_durations()["segment_1"] > first.segment_durations()["segment_1"]
+
+
+def test_tts_engine_falls_back_to_final_text_for_unstructured_drafts(tmp_path):
+    engine = TTSEngine(LocalTTS(words_per_minute=300, sample_rate=4000), cache_dir=tmp_path / "cache")
+    draft = ScriptDraft(final_text="Welcome to the brief.\n\nThat is all for today.")
+    synthesis = engine.synthesize_draft(draft, str(tmp_path / "vo.wav"))
+    assert [segment.name for segment in synthesis.segments] == ["part_0", "part_1"]
+
+
+def test_tts_engine_speaks_the_tone_enhanced_final_text(tmp_path):
+    backend = LocalTTS(words_per_minute=300, sample_rate=4000, pause=0.0)
+    engine = TTSEngine(backend, cache_dir=tmp_path / "cache")
+    stories = [
+        {"title": f"Lab {idx} ships agent", "url": f"https://example.com/{idx}", "source": "Test",
+         "summary": f"It was announced that latency was cut by {idx}0%. There is a new model."}
+        for idx in range(4)
+    ]
+    draft = generate_script_draft(stories, seed=3)
+    # Tone rules rewrite the rendered segments, so the raw voiceover differs from the script
+    assert draft.segments[0].voiceover not in draft.final_text
+
+    result = engine.synthesize_draft(draft, str(tmp_path / "vo.wav"))
+    assert [segment.name for segment in result.segments][1:-1] == [f"segment_{idx}" for idx in range(len(draft.segments))]
+    assert "\n\n".join(segment.text for segment in result.segments) == draft.final_text
@@ -290,63 +290,54 @@ class UnifiedPipelineTest:
         print("🎙️ STAGE 4: VOICEOVER GENERATION")
         print("="*80)
         
-        import requests
+        from src.editorial.script_adapter import legacy_to_draft
+        from src.models import ScriptDraft
+        from src.tts.engine import ElevenLabsTTS, TTSEngine
         
         print("\n🔊 Generating voiceover with ElevenLabs...")
         
-        script_text = script.get('vo_script') if isinstance(script, dict) else str(script)
+        draft = legacy_to_draft(script) if isinstance(script, dict) else ScriptDraft(final_text=str(script))
 
         try:
-            headers = {
-                'xi-api-key': os.environ.get('ELEVENLABS_API_KEY'),
-                'Content-Type': 'application/json'
-            }
+            voice_id = '21m00Tcm4TlvDq8ikWAM'  # Rachel voice
+            backend = ElevenLabsTTS(
+                os.environ.get('ELEVENLABS_API_KEY'),
+                voice_id,
+                model='eleven_monolingual_v1',
+                settings={'stability': 0.5, 'similarity_boost': 0.75}
+            )
             
-            payload = {
-                'text': script_text,
-                'model_id': 'eleven_monolingual_v1',
-                'voice_settings': {
-                    'stability': 0.5,
-                    'similarity_boost': 0.75
-                }
-            }
+            # Intro, story segments and outro are synthesized in parallel and cached
+            # individually, so re-runs after a script edit only pay for the edited segments
+            vo_path = self.dirs['04_voiceover'] / f'voiceover_{self.timestamp}.mp3'
+            synthesis = TTSEngine(backend).synthesize_draft(draft, str(vo_path))
+            cached = sum(1 for segment in synthesis.segments if segment.cached)
             
-            voice_id = '21m00Tcm4TlvDq8ikWAM'  # Rachel voice
+            print(f"  ✓ Voiceover generated: {vo_path} ({synthesis.duration:.1f}s, "
+                  f"{len(synthesis.segments)} segments, {cached} cached)")
             
-            response = requests.post(
-                f'https://api.elevenlabs.io/v1/text-to-speech/{voice_id}',
-                json=payload,
-                headers=headers
-            )
+            # Upload to GCS
+            from google.cloud import storage
+            client = storage.Client()
+            bucket = client.bucket('yta-main-assets')
+            blob_name = f'voiceovers/vo_{self.timestamp}.mp3'
+            blob = bucket.blob(blob_name)
+            blob.upload_from_filename(vo_path)
+            blob.make_public()
+            public_url = f'https://storage.googleapis.com/yta-main-assets/{blob_name}'
+            print(f"  ✓ Uploaded to GCS: {public_url}")
             
-            if response.status_code == 200:
-                vo_path = self.dirs['04_voiceover'] / f'voiceover_{self.timestamp}.mp3'
-                with open(vo_path, 'wb') as f:
-                    f.write(response.content)
-                
-                print(f"  ✓ Voiceover generated: {vo_path}")
-                
-                # Upload to GCS
-                from google.cloud import storage
-                client = storage.Client()
-                bucket = client.bucket('yta-main-assets')
-                blob_name = f'voiceovers/vo_{self.timestamp}.mp3'
-                blob = bucket.blob(blob_name)
-                blob.upload_from_filename(vo_path)
-                blob.make_public()
-                public_url = f'https://storage.googleapis.com/yta-main-assets/{blob_name}'
-                print(f"  ✓ Uploaded to GCS: {public_url}")
-                
-                voiceover_data = {
-                    'local_path': str(vo_path),
-                    'public_url': public_url,
-                    'duration_estimate': len(script_text.split()) / 150 * 60,
-                    'voice_id': voice_id,
-                    'generated_at': self.timestamp
-                }
-                
-            else:
-                raise Exception(f"API error: {response.status_code}")
+            voiceover_data = {
+                'local_path': str(vo_path),
+                'public_url': public_url,
+                'duration_estimate': synthesis.duration,
+                'segments': [
+                    {'name': s.name, 'start': s.start, 'duration': s.duration, 'cached': s.cached}
+                    for s in synthesis.segments
+                ],
+                'voice_id': voice_id,
+                'generated_at': self.timestamp
+            }
                 
         except Exception as e:
             print(f"  ⚠ Voiceover failed: {e}, using placeholder")
@@ -422,14 +413,24 @@ class UnifiedPipelineTest:
         print("="*80)
         
         from src.produce.shotstack_dynamic import ShotstackDynamic
+        from src.produce.voiceover_alignment import align_voiceover
         
         builder = ShotstackDynamic()
         
+        # Cut on the real narration rather than word-count estimates
+        alignment = None
+        voiceover = self.artifacts.get('voiceover', {})
+        if voiceover.get('local_path'):
+            alignment = align_voiceover(shot_list, voiceover['local_path'], voiceover.get('segments'))
+            duration = alignment.duration
+            print(f"\n🎚️ Aligned to voiceover: {duration:.1f}s, {len(alignment.pauses)} pauses")
+        
         print("\n⚙️ Building dynamic timeline...")
         timeline = builder.build_dynamic_timeline(
             shot_list=shot_list,
             voiceover_url=voiceover_url,
-            total_duration=duration
+            total_duration=duration,
+            alignment=alignment
         )
         
         # Enhance output settings